@@ -0,0 +1,44 @@
+"""cascade deletes and foreign key indexes
+
+Revision ID: d41f7a2c9e05
+Revises: b3a9c5d7e1f4
+Create Date: 2026-10-18 15:03:18.277410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f7a2c9e05'
+down_revision: Union[str, Sequence[str], None] = 'b3a9c5d7e1f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_catalogs_parent_id'), 'catalogs', ['parent_id'], unique=False)
+    op.create_index(op.f('ix_products_catalog_id'), 'products', ['catalog_id'], unique=False)
+    op.create_index(op.f('ix_product_images_product_id'), 'product_images', ['product_id'], unique=False)
+    op.drop_constraint('catalogs_parent_id_fkey', 'catalogs', type_='foreignkey')
+    op.create_foreign_key('catalogs_parent_id_fkey', 'catalogs', 'catalogs', ['parent_id'], ['id'], ondelete='CASCADE')
+    op.drop_constraint('products_catalog_id_fkey', 'products', type_='foreignkey')
+    op.create_foreign_key('products_catalog_id_fkey', 'products', 'catalogs', ['catalog_id'], ['id'], ondelete='CASCADE')
+    op.drop_constraint('product_images_product_id_fkey', 'product_images', type_='foreignkey')
+    op.create_foreign_key('product_images_product_id_fkey', 'product_images', 'products', ['product_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('product_images_product_id_fkey', 'product_images', type_='foreignkey')
+    op.create_foreign_key('product_images_product_id_fkey', 'product_images', 'products', ['product_id'], ['id'])
+    op.drop_constraint('products_catalog_id_fkey', 'products', type_='foreignkey')
+    op.create_foreign_key('products_catalog_id_fkey', 'products', 'catalogs', ['catalog_id'], ['id'])
+    op.drop_constraint('catalogs_parent_id_fkey', 'catalogs', type_='foreignkey')
+    op.create_foreign_key('catalogs_parent_id_fkey', 'catalogs', 'catalogs', ['parent_id'], ['id'])
+    op.drop_index(op.f('ix_product_images_product_id'), table_name='product_images')
+    op.drop_index(op.f('ix_products_catalog_id'), table_name='products')
+    op.drop_index(op.f('ix_catalogs_parent_id'), table_name='catalogs')
@@ -0,0 +1,180 @@
+"""
+Общие фикстуры бенчмарков.
+
+Все работает без сети: страницы flip.kz отдает локальный stub-сервер из
+записанных снимков ``tests/fixtures``. Бенчмаркам с базой нужен одноразовый
+PostgreSQL: либо сервер из ``BENCHMARK_POSTGRES_DSN`` (в нем создается и
+после удаляется временная база), либо контейнер testcontainers, если пакет
+установлен и доступен Docker. Иначе такие бенчмарки пропускаются.
+"""
+
+import asyncio
+import os
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from sqlalchemy import make_url, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+pytest.importorskip("pytest_benchmark")
+
+SNAPSHOTS = Path(__file__).parent.parent / "tests" / "fixtures"
+
+
+def read_snapshot(name: str) -> str:
+    return (SNAPSHOTS / name).read_text(encoding="utf-8")
+
+
+class StubFlipHandler(BaseHTTPRequestHandler):
+    """
+    Отдает снимок страницы продукта или каталога в зависимости от запроса,
+    а на ссылки страниц на изображения, стили и скрипты - заглушки типичного
+    размера, чтобы браузеру было что загружать.
+    """
+
+    pages = {
+        "prod": read_snapshot("product.html"),
+        "subsection": read_snapshot("catalog.html"),
+    }
+    assets = {
+        ".jpg": ("image/jpeg", 150 * 1024),
+        ".css": ("text/css", 60 * 1024),
+        ".js": ("application/javascript", 80 * 1024),
+    }
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        asset = self.assets.get(Path(url.path).suffix)
+        if asset is not None:
+            content_type, size = asset
+            self.send_body(b" " * size, content_type)
+            return
+        query = parse_qs(url.query)
+        page = next((self.pages[name] for name in self.pages if name in query), None)
+        if page is None:
+            self.send_error(404)
+            return
+        self.send_body(page.encode(), "text/html; charset=utf-8")
+
+    def send_body(self, body: bytes, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="session")
+def snapshot():
+    """Функция, читающая записанную страницу по имени файла."""
+    return read_snapshot
+
+
+@pytest.fixture(scope="session")
+def stub_server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubFlipHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(scope="session")
+def loop():
+    """Один цикл событий на сессию: соединения asyncpg к нему привязаны."""
+    loop = asyncio.new_event_loop()
+    try:
+        yield loop
+    finally:
+        loop.close()
+
+
+def _postgres_server_dsn():
+    dsn = os.environ.get("BENCHMARK_POSTGRES_DSN")
+    if dsn:
+        yield dsn
+        return
+    try:
+        from testcontainers.postgres import PostgresContainer
+    except ImportError:
+        pytest.skip("Set BENCHMARK_POSTGRES_DSN or install testcontainers")
+    try:
+        container = PostgresContainer("postgres:16-alpine", driver="asyncpg")
+        container.start()
+    except Exception as exception:
+        pytest.skip(f"Could not start PostgreSQL container: {exception}")
+    try:
+        yield container.get_connection_url()
+    finally:
+        container.stop()
+
+
+@pytest.fixture(scope="session")
+def postgres_dsn(loop):
+    """DSN временной базы со схемой из моделей; база удаляется в конце сессии."""
+    import src  # noqa: F401 - регистрирует все модели в Base.metadata
+    from src.models import Base
+
+    for server_dsn in _postgres_server_dsn():
+        server_url = make_url(server_dsn).set(drivername="postgresql+asyncpg")
+        database = f"flip_benchmark_{uuid.uuid4().hex[:12]}"
+        admin_engine = create_async_engine(server_url, isolation_level="AUTOCOMMIT")
+
+        async def create_database():
+            async with admin_engine.connect() as connection:
+                await connection.execute(text(f'CREATE DATABASE "{database}"'))
+            engine = create_async_engine(server_url.set(database=database))
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+            await engine.dispose()
+
+        async def drop_database():
+            async with admin_engine.connect() as connection:
+                await connection.execute(
+                    text(f'DROP DATABASE IF EXISTS "{database}" WITH (FORCE)')
+                )
+            await admin_engine.dispose()
+
+        loop.run_until_complete(create_database())
+        try:
+            yield server_url.set(database=database).render_as_string(
+                hide_password=False
+            )
+        finally:
+            loop.run_until_complete(drop_database())
+
+
+@pytest.fixture(scope="session")
+def session_factory(postgres_dsn, loop):
+    engine = create_async_engine(postgres_dsn)
+    try:
+        yield async_sessionmaker(engine, expire_on_commit=True)
+    finally:
+        loop.run_until_complete(engine.dispose())
+
+
+@pytest.fixture
+def truncate(session_factory, loop):
+    """Функция, очищающая таблицы каталогов и продуктов."""
+
+    async def truncate_tables():
+        async with session_factory() as async_session:
+            await async_session.execute(
+                text(
+                    "TRUNCATE catalogs, catalog_closure, products, product_images"
+                    " CASCADE"
+                )
+            )
+            await async_session.commit()
+
+    return lambda: loop.run_until_complete(truncate_tables())
@@ -0,0 +1,160 @@
+"""Задержка эндпоинтов чтения через ``httpx.AsyncClient`` поверх ``src.main.app``."""
+
+import os
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from src.catalogs import service as catalog_service
+from src.catalogs.schemas import CatalogCreate
+from src.products import service as product_service
+from src.products.schemas import ProductCreate, ProductImageCreate
+
+CATALOGS = 10
+PRODUCTS_PER_CATALOG = 100
+
+
+async def seed(session_factory) -> dict[str, int]:
+    async with session_factory() as async_session:
+        [root_id] = (
+            await catalog_service.upsert_catalogs_by_code(
+                async_session, [CatalogCreate(code=1, name="Книги")]
+            )
+        ).values()
+        catalog_ids = await catalog_service.upsert_catalogs_by_code(
+            async_session,
+            [
+                CatalogCreate(code=code, name=f"Раздел {code}", parent_id=root_id)
+                for code in range(2, CATALOGS + 2)
+            ],
+        )
+        product_ids = await product_service.upsert_products_by_code(
+            async_session,
+            [
+                ProductCreate(
+                    code=catalog_code * 10_000 + number,
+                    name=f"Товар {number}",
+                    description="Описание товара " * 10,
+                    price=Decimal(1000 + number),
+                    catalog_id=catalog_id,
+                    images=[
+                        ProductImageCreate(
+                            url=f"https://www.flip.kz/img/{number}/{image}.jpg",
+                            description=f"Изображение {image}",
+                        )
+                        for image in range(3)
+                    ],
+                )
+                for catalog_code, catalog_id in catalog_ids.items()
+                for number in range(PRODUCTS_PER_CATALOG)
+            ],
+        )
+    return {"catalog": root_id, "product": min(product_ids.values())}
+
+
+@pytest.fixture(scope="module")
+def ids(session_factory, loop):
+    return loop.run_until_complete(seed(session_factory))
+
+
+@pytest.fixture(scope="module")
+def client(postgres_dsn, session_factory, loop):
+    os.environ.setdefault("MODE", "benchmark")
+    os.environ.setdefault("POSTGRES_DSN", postgres_dsn)
+    from src.dependencies import get_async_session
+    from src.main import app
+
+    async def get_benchmark_session():
+        async with session_factory() as async_session:
+            yield async_session
+
+    app.dependency_overrides[get_async_session] = get_benchmark_session
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://benchmark/api"
+    )
+    try:
+        yield client
+    finally:
+        loop.run_until_complete(client.aclose())
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def get(client, loop):
+    def get(url: str, **kwargs) -> httpx.Response:
+        return loop.run_until_complete(client.get(url, **kwargs))
+
+    return get
+
+
+@pytest.fixture
+def read_cache():
+    """Включает или выключает локальный кэш чтения на время теста."""
+    from src.cache.service import cache
+
+    def configure(enabled: bool):
+        cache.configure(
+            local_max_size=10_000,
+            local_ttl=60.0 if enabled else 0.0,
+            shared=None,
+            shared_ttl=0.0,
+        )
+
+    yield configure
+    configure(True)
+
+
+@pytest.mark.benchmark(group="api-product-list")
+@pytest.mark.parametrize("limit", [10, 100])
+def test_read_products(benchmark, get, ids, limit):
+    response = benchmark(get, "/products/", params={"limit": limit})
+
+    assert response.status_code == 200
+    assert len(response.json()) == limit
+
+
+@pytest.mark.benchmark(group="api-product-list")
+def test_read_products_not_modified(benchmark, get, ids):
+    etag = get("/products/", params={"limit": 100}).headers["etag"]
+    response = benchmark(
+        get, "/products/", params={"limit": 100}, headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == 304
+
+
+@pytest.mark.benchmark(group="api-product")
+@pytest.mark.parametrize("cached", [False, True], ids=["uncached", "cached"])
+def test_read_product(benchmark, get, ids, read_cache, cached):
+    read_cache(cached)
+    response = benchmark(get, f"/products/{ids['product']}")
+
+    assert response.status_code == 200
+
+
+@pytest.mark.benchmark(group="api-product")
+def test_read_product_not_modified(benchmark, get, ids):
+    url = f"/products/{ids['product']}"
+    etag = get(url).headers["etag"]
+    response = benchmark(get, url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+
+
+@pytest.mark.benchmark(group="api-catalog")
+def test_read_catalog_subtree_counts(benchmark, get, ids):
+    response = benchmark(get, f"/catalogs/{ids['catalog']}/subtree/counts")
+
+    assert response.status_code == 200
+    assert response.json()["productCount"] == CATALOGS * PRODUCTS_PER_CATALOG
+
+
+@pytest.mark.benchmark(group="api-catalog")
+def test_read_catalog_subtree_products(benchmark, get, ids):
+    response = benchmark(
+        get, f"/catalogs/{ids['catalog']}/subtree/products", params={"limit": 100}
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()) == 100
@@ -0,0 +1,88 @@
+"""
+Профили запуска Chrome: время загрузки и разбора страницы и память браузера.
+
+Страницы отдает stub-сервер вместе с заглушками изображений, стилей и
+скриптов. После прогона в ``extra_info.rss_bytes`` записывается суммарный
+RSS процессов браузера (только Linux). Нужен локальный Chrome: без него
+бенчмарки пропускаются.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from src.drivers.pool import create_driver
+from src.drivers.profiles import PROFILES
+from src.parsing import selenium
+
+
+def process_tree_rss(pid: int) -> int | None:
+    """RSS процесса и всех его потомков по /proc, в байтах."""
+    proc = Path("/proc")
+    if not proc.is_dir():
+        return None
+    children: dict[int, list[int]] = {}
+    for stat_path in proc.glob("[0-9]*/stat"):
+        try:
+            # Имя процесса в скобках может содержать пробелы.
+            fields = stat_path.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(stat_path.parent.name))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            resident_pages = int((proc / str(current) / "statm").read_text().split()[1])
+        except OSError:
+            continue
+        total += resident_pages * page_size
+        pending.extend(children.get(current, ()))
+    return total
+
+
+@pytest.fixture(scope="module", params=list(PROFILES))
+def profile_driver(request):
+    profile = PROFILES[request.param]
+    try:
+        driver = create_driver(profile)
+    except Exception as exception:
+        pytest.skip(f"Could not start Chrome: {exception}")
+    try:
+        yield profile, driver
+    finally:
+        driver.quit()
+
+
+def record_rss(benchmark, driver) -> None:
+    pid = getattr(driver, "browser_pid", None)
+    if pid is not None:
+        benchmark.extra_info["rss_bytes"] = process_tree_rss(pid)
+
+
+@pytest.mark.benchmark(group="browser-profile-product")
+def test_profile_product_page(benchmark, profile_driver, stub_server_url):
+    profile, driver = profile_driver
+    benchmark.extra_info["profile"] = profile.name
+    url = f"{stub_server_url}/catalog?prod=1234567"
+
+    parsed = benchmark(selenium.extract_product, driver, url, 1234567)
+    record_rss(benchmark, driver)
+
+    assert parsed.product.code == 1234567
+
+
+@pytest.mark.benchmark(group="browser-profile-catalog-page")
+def test_profile_catalog_page(benchmark, profile_driver, stub_server_url):
+    profile, driver = profile_driver
+    benchmark.extra_info["profile"] = profile.name
+    url = f"{stub_server_url}/catalog?subsection=2649&page=1"
+
+    parsed = benchmark(selenium.extract_catalog_page, driver, url, None)
+    record_rss(benchmark, driver)
+
+    assert parsed.product_codes
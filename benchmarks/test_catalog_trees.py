@@ -0,0 +1,167 @@
+"""
+``ParsedBreadcrumbCatalogs`` и ``CatalogTree`` на больших синтетических
+деревьях. Бенчмарки слияния записывают пиковый объем выделенной памяти
+(tracemalloc) в ``extra_info.peak_bytes``.
+"""
+
+import tracemalloc
+
+import pytest
+
+from src.catalogs.schemas import CatalogCreate
+from src.catalogs.service import ParsedBreadcrumbCatalogs
+from src.catalogs.tree import CatalogTree
+
+
+def synthetic_tree(branching: int, depth: int) -> ParsedBreadcrumbCatalogs:
+    """Полное дерево: у каждого каталога ``branching`` детей до глубины ``depth``."""
+    catalog_map = {1: CatalogCreate(code=1, name="Catalog 1")}
+    catalog_parent_map: dict[int, int | None] = {1: None}
+    level = [1]
+    next_code = 2
+    for _ in range(depth):
+        next_level = []
+        for parent_code in level:
+            for _ in range(branching):
+                catalog_map[next_code] = CatalogCreate(
+                    code=next_code, name=f"Catalog {next_code}"
+                )
+                catalog_parent_map[next_code] = parent_code
+                next_level.append(next_code)
+                next_code += 1
+        level = next_level
+    return ParsedBreadcrumbCatalogs(catalog_map, catalog_parent_map, None)
+
+
+def breadcrumb_trails(tree: ParsedBreadcrumbCatalogs) -> list[ParsedBreadcrumbCatalogs]:
+    """Цепочки от корня до каждого листа - как их дают страницы продуктов."""
+    parents = set(tree.catalog_parent_map.values())
+    trails = []
+    for leaf in tree.catalog_map.keys() - parents:
+        codes = []
+        code = leaf
+        while code is not None:
+            codes.append(code)
+            code = tree.catalog_parent_map[code]
+        trails.append(
+            ParsedBreadcrumbCatalogs(
+                {code: tree.catalog_map[code] for code in codes},
+                {code: tree.catalog_parent_map[code] for code in codes},
+                leaf,
+            )
+        )
+    return trails
+
+
+# 10 * 10 * 10 * 10 = 11111 каталогов
+LARGE_TREE = synthetic_tree(branching=10, depth=4)
+
+
+@pytest.mark.benchmark(group="catalog-tree")
+def test_in_order(benchmark):
+    catalogs = benchmark(LARGE_TREE.in_order)
+
+    assert len(catalogs) == len(LARGE_TREE.catalog_map)
+
+
+@pytest.mark.benchmark(group="catalog-tree")
+def test_in_levels(benchmark):
+    levels = benchmark(LARGE_TREE.in_levels)
+
+    assert len(levels) == 5
+
+
+@pytest.mark.benchmark(group="catalog-tree")
+def test_union_of_breadcrumb_trails(benchmark):
+    trails = breadcrumb_trails(LARGE_TREE)
+
+    def union_all():
+        tree = ParsedBreadcrumbCatalogs({}, {}, None)
+        for trail in trails:
+            tree = tree.union(trail)
+        return tree
+
+    benchmark.extra_info["peak_bytes"] = peak_bytes(union_all)
+    tree = benchmark(union_all)
+
+    assert len(tree.catalog_map) == len(LARGE_TREE.catalog_map)
+
+
+def peak_bytes(function) -> int:
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.fixture(scope="module")
+def huge_tree():
+    # 10 ** 5 листьев, 111111 каталогов
+    return synthetic_tree(branching=10, depth=5)
+
+
+@pytest.fixture(scope="module")
+def huge_trails(huge_tree):
+    return breadcrumb_trails(huge_tree)
+
+
+@pytest.mark.benchmark(group="catalog-tree")
+def test_catalog_tree_merge_of_breadcrumb_trails(benchmark):
+    trails = breadcrumb_trails(LARGE_TREE)
+
+    def merge_all():
+        return CatalogTree.from_breadcrumbs(*trails)
+
+    benchmark.extra_info["peak_bytes"] = peak_bytes(merge_all)
+    tree = benchmark(merge_all)
+
+    assert len(tree) == len(LARGE_TREE.catalog_map)
+
+
+@pytest.mark.benchmark(group="catalog-tree-100k")
+def test_catalog_tree_merge_100k(benchmark, huge_tree, huge_trails):
+    def merge_all():
+        return CatalogTree.from_breadcrumbs(*huge_trails)
+
+    benchmark.extra_info["peak_bytes"] = peak_bytes(merge_all)
+    tree = benchmark.pedantic(merge_all, rounds=5)
+
+    assert len(tree) == len(huge_tree.catalog_map)
+    assert tree.conflicts == []
+
+
+@pytest.mark.benchmark(group="catalog-tree-100k")
+def test_catalog_tree_in_order_cold_100k(benchmark, huge_trails):
+    tree = CatalogTree.from_breadcrumbs(*huge_trails)
+
+    # Сброс кэша перед каждым прогоном: полная сортировка по спискам детей.
+    catalogs = benchmark.pedantic(tree.in_order, setup=tree._invalidate, rounds=10)
+
+    assert len(catalogs) == len(tree)
+
+
+@pytest.mark.benchmark(group="catalog-tree-100k")
+def test_catalog_tree_in_order_cached_100k(benchmark, huge_trails):
+    tree = CatalogTree.from_breadcrumbs(*huge_trails)
+
+    catalogs = benchmark(tree.in_order)
+
+    assert len(catalogs) == len(tree)
+
+
+@pytest.mark.benchmark(group="catalog-tree-100k")
+def test_catalog_tree_in_levels_100k(benchmark, huge_trails):
+    tree = CatalogTree.from_breadcrumbs(*huge_trails)
+
+    levels = benchmark(tree.in_levels)
+
+    assert len(levels) == 6
+
+
+@pytest.mark.benchmark(group="catalog-tree-100k")
+def test_breadcrumb_catalogs_in_order_100k(benchmark, huge_tree):
+    catalogs = benchmark.pedantic(huge_tree.in_order, rounds=10)
+
+    assert len(catalogs) == len(huge_tree.catalog_map)
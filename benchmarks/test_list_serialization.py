@@ -0,0 +1,122 @@
+"""
+Сериализация страницы продуктов: текущий путь FastAPI против быстрого.
+
+Текущий путь: ORM-объекты -> ``response_model`` (валидация
+``from_attributes``) -> ``jsonable``-словари -> ``json.dumps`` в
+``JSONResponse``. Быстрый путь: строки-mapping -> одна валидация
+``TypeAdapter`` -> ``dump_json`` в pydantic-core.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.products import models, schemas, service
+
+pytest.importorskip("pytest_benchmark")
+orjson = pytest.importorskip("orjson")
+
+PRODUCTS = 100
+IMAGES_PER_PRODUCT = 3
+
+
+@pytest.fixture(scope="module")
+def rows():
+    now = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    product_rows = [
+        dict(
+            id=id,
+            code=1_000_000 + id,
+            name=f"Товар {id}",
+            description="Описание товара " * 20,
+            price=Decimal("12345.50"),
+            catalog_id=1,
+            content_hash="0" * 64,
+            last_seen_at=now,
+            last_changed_at=now,
+        )
+        for id in range(PRODUCTS)
+    ]
+    image_rows = [
+        dict(
+            id=id * IMAGES_PER_PRODUCT + number,
+            url=f"https://www.flip.kz/img/{id}/{number}.jpg",
+            description=f"Изображение {number}",
+            product_id=id,
+        )
+        for id in range(PRODUCTS)
+        for number in range(IMAGES_PER_PRODUCT)
+    ]
+    return product_rows, image_rows
+
+
+@pytest.fixture(scope="module")
+def orm_products(rows):
+    product_rows, image_rows = rows
+    products = {row["id"]: models.Product(**row) for row in product_rows}
+    for image_row in image_rows:
+        products[image_row["product_id"]].images.append(
+            models.ProductImage(**image_row)
+        )
+    return list(products.values())
+
+
+def group_rows(product_rows, image_rows):
+    images = {}
+    for image_row in image_rows:
+        images.setdefault(image_row["product_id"], []).append(image_row)
+    return [{**row, "images": images.get(row["id"], [])} for row in product_rows]
+
+
+RESPONSE_FIELD = create_model_field(
+    name="Response", type_=list[schemas.Product], mode="serialization"
+)
+LOOP = asyncio.new_event_loop()
+
+
+def current_path(orm_products) -> bytes:
+    content = LOOP.run_until_complete(
+        serialize_response(field=RESPONSE_FIELD, response_content=orm_products)
+    )
+    return JSONResponse(content).body
+
+
+def fast_path(product_rows, image_rows) -> bytes:
+    products = service.PRODUCT_LIST_ADAPTER.validate_python(
+        group_rows(product_rows, image_rows)
+    )
+    return service.PRODUCT_LIST_ADAPTER.dump_json(products, by_alias=True)
+
+
+def orjson_path(product_rows, image_rows) -> bytes:
+    products = service.PRODUCT_LIST_ADAPTER.validate_python(
+        group_rows(product_rows, image_rows)
+    )
+    return orjson.dumps(
+        service.PRODUCT_LIST_ADAPTER.dump_python(products, mode="json", by_alias=True)
+    )
+
+
+def test_paths_produce_the_same_json(rows, orm_products):
+    assert orjson.loads(fast_path(*rows)) == orjson.loads(current_path(orm_products))
+    assert orjson.loads(orjson_path(*rows)) == orjson.loads(fast_path(*rows))
+
+
+@pytest.mark.benchmark(group="product-list-serialization")
+def test_current_path(benchmark, orm_products):
+    benchmark(current_path, orm_products)
+
+
+@pytest.mark.benchmark(group="product-list-serialization")
+def test_fast_path(benchmark, rows):
+    benchmark(fast_path, *rows)
+
+
+@pytest.mark.benchmark(group="product-list-serialization")
+def test_orjson_path(benchmark, rows):
+    benchmark(orjson_path, *rows)
@@ -0,0 +1,53 @@
+"""Разбор записанных страниц flip.kz: чистый lxml и HttpEngine через stub-сервер."""
+
+import httpx
+import pytest
+
+from src.parsing import html
+from src.parsing.engines import HttpEngine
+
+PRODUCT_URL = "https://www.flip.kz/catalog?prod=1234567"
+CATALOG_URL = "https://www.flip.kz/catalog?subsection=2649&page=1"
+
+
+@pytest.mark.benchmark(group="parse-html")
+def test_parse_product_html(benchmark, snapshot):
+    page = snapshot("product.html")
+    parsed = benchmark(html.parse_product, page, url=PRODUCT_URL, code=1234567)
+
+    assert parsed.product.code == 1234567
+
+
+@pytest.mark.benchmark(group="parse-html")
+def test_parse_catalog_page_html(benchmark, snapshot):
+    page = snapshot("catalog.html")
+    parsed = benchmark(html.parse_catalog_page, page, url=CATALOG_URL, limit=None)
+
+    assert parsed.product_codes
+
+
+@pytest.fixture
+def http_engine(stub_server_url, loop):
+    client = httpx.AsyncClient()
+    try:
+        yield HttpEngine(client, base_url=stub_server_url)
+    finally:
+        loop.run_until_complete(client.aclose())
+
+
+@pytest.mark.benchmark(group="http-engine")
+def test_http_engine_parse_product(benchmark, http_engine, loop):
+    parsed = benchmark(
+        lambda: loop.run_until_complete(http_engine.parse_product(1234567))
+    )
+
+    assert parsed.product.code == 1234567
+
+
+@pytest.mark.benchmark(group="http-engine")
+def test_http_engine_parse_catalog_page(benchmark, http_engine, loop):
+    parsed = benchmark(
+        lambda: loop.run_until_complete(http_engine.parse_catalog_page(2649, 1, None))
+    )
+
+    assert parsed.product_codes
@@ -0,0 +1,83 @@
+"""
+Извлечение данных в браузере: по WebElement на каждое поле против одного
+``execute_script``. Кроме времени в ``extra_info`` записывается число
+запросов к chromedriver на страницу (``round_trips``).
+
+Нужен локальный Chrome: без него бенчмарки пропускаются.
+"""
+
+import pytest
+
+from src.parsing import selenium
+
+EXTRACTIONS = list(selenium.EXTRACTIONS)
+
+
+@pytest.fixture(scope="module")
+def driver():
+    from selenium.webdriver import Chrome, ChromeOptions
+
+    options = ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    try:
+        driver = Chrome(options=options)
+    except Exception as exception:
+        pytest.skip(f"Could not start Chrome: {exception}")
+    try:
+        yield driver
+    finally:
+        driver.quit()
+
+
+@pytest.fixture
+def round_trips(driver):
+    """Счетчик команд WebDriver, отправленных драйвером."""
+    counter = {"commands": 0}
+    execute = driver.execute
+
+    def counting_execute(*args, **kwargs):
+        counter["commands"] += 1
+        return execute(*args, **kwargs)
+
+    driver.execute = counting_execute
+    try:
+        yield counter
+    finally:
+        del driver.execute
+
+
+def count_round_trips(counter, function, *args):
+    counter["commands"] = 0
+    function(*args)
+    return counter["commands"]
+
+
+@pytest.mark.benchmark(group="selenium-extract-product")
+@pytest.mark.parametrize("extraction", EXTRACTIONS)
+def test_extract_product(benchmark, driver, round_trips, stub_server_url, extraction):
+    scrape_product = selenium.EXTRACTIONS[extraction].scrape_product
+    url = f"{stub_server_url}/catalog?prod=1234567"
+
+    benchmark.extra_info["round_trips"] = count_round_trips(
+        round_trips, scrape_product, driver, url, 1234567
+    )
+    parsed = benchmark(scrape_product, driver, url, 1234567)
+
+    assert parsed.product.code == 1234567
+
+
+@pytest.mark.benchmark(group="selenium-extract-catalog-page")
+@pytest.mark.parametrize("extraction", EXTRACTIONS)
+def test_extract_catalog_page(
+    benchmark, driver, round_trips, stub_server_url, extraction
+):
+    scrape_catalog_page = selenium.EXTRACTIONS[extraction].scrape_catalog_page
+    url = f"{stub_server_url}/catalog?subsection=2649&page=1"
+
+    benchmark.extra_info["round_trips"] = count_round_trips(
+        round_trips, scrape_catalog_page, driver, url, None
+    )
+    parsed = benchmark(scrape_catalog_page, driver, url, None)
+
+    assert parsed.product_codes
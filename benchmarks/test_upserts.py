@@ -0,0 +1,100 @@
+"""Пропускная способность upsert продуктов: по одному через ORM против пакета."""
+
+from decimal import Decimal
+
+import pytest
+
+from src.catalogs import service as catalog_service
+from src.catalogs.schemas import CatalogCreate
+from src.products import service as product_service
+from src.products.schemas import ProductCreate, ProductImageCreate
+
+PRODUCTS = 200
+
+
+def make_products(catalog_id: int, *, price: Decimal = Decimal("1000")):
+    return [
+        ProductCreate(
+            code=1_000_000 + number,
+            name=f"Товар {number}",
+            description="Описание товара " * 10,
+            price=price + number,
+            catalog_id=catalog_id,
+            images=[
+                ProductImageCreate(
+                    url=f"https://www.flip.kz/img/{number}/{image}.jpg",
+                    description=f"Изображение {image}",
+                )
+                for image in range(3)
+            ],
+        )
+        for number in range(PRODUCTS)
+    ]
+
+
+async def create_catalog(session_factory) -> int:
+    async with session_factory() as async_session:
+        catalog_ids = await catalog_service.upsert_catalogs_by_code(
+            async_session, [CatalogCreate(code=1, name="Книги")]
+        )
+    return catalog_ids[1]
+
+
+@pytest.fixture
+def catalog_id(session_factory, truncate, loop):
+    truncate()
+    return loop.run_until_complete(create_catalog(session_factory))
+
+
+def run_single(session_factory, loop, products):
+    async def upsert():
+        async with session_factory() as async_session:
+            for product in products:
+                await product_service.upsert_product_by_code(
+                    async_session, product, commit=False
+                )
+            await async_session.commit()
+
+    loop.run_until_complete(upsert())
+
+
+def run_bulk(session_factory, loop, products):
+    async def upsert():
+        async with session_factory() as async_session:
+            await product_service.upsert_products_by_code(async_session, products)
+
+    loop.run_until_complete(upsert())
+
+
+@pytest.mark.parametrize("run", [run_single, run_bulk], ids=["single", "bulk"])
+@pytest.mark.benchmark(group="upsert-new-products")
+def test_upsert_new_products(benchmark, run, session_factory, truncate, loop):
+    def setup():
+        truncate()
+        catalog_id = loop.run_until_complete(create_catalog(session_factory))
+        return (session_factory, loop, make_products(catalog_id)), {}
+
+    benchmark.pedantic(run, setup=setup, rounds=10)
+
+
+@pytest.mark.parametrize("run", [run_single, run_bulk], ids=["single", "bulk"])
+@pytest.mark.benchmark(group="upsert-changed-products")
+def test_upsert_changed_products(benchmark, run, session_factory, catalog_id, loop):
+    prices = iter(range(1, 10_000))
+
+    def setup():
+        price = Decimal(next(prices) * 1000)
+        return (session_factory, loop, make_products(catalog_id, price=price)), {}
+
+    run_bulk(session_factory, loop, make_products(catalog_id))
+    benchmark.pedantic(run, setup=setup, rounds=10)
+
+
+@pytest.mark.parametrize("run", [run_single, run_bulk], ids=["single", "bulk"])
+@pytest.mark.benchmark(group="upsert-unchanged-products")
+def test_upsert_unchanged_products(benchmark, run, session_factory, catalog_id, loop):
+    products = make_products(catalog_id)
+    run_bulk(session_factory, loop, products)
+
+    benchmark.pedantic(run, args=(session_factory, loop, products), rounds=10)
+
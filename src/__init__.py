@@ -1,2 +1,3 @@
 from .catalogs import models
+from .jobs import models
 from .products import models
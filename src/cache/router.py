@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+
+from . import schemas
+from .service import cache
+
+_router = APIRouter(prefix="/cache")
+instance = _router
+
+
+@_router.get("/stats", response_model=schemas.CacheStats)
+async def read_cache_stats():
+    return cache.stats()
@@ -0,0 +1,16 @@
+from ..schemas import BaseSchema
+
+
+class CacheTierStats(BaseSchema):
+    hits: int
+    misses: int
+    hit_ratio: float
+
+
+class CacheStats(BaseSchema):
+    local: CacheTierStats
+    shared: CacheTierStats | None
+    loads: int
+    invalidations: int
+    local_size: int
+    local_evictions: int
@@ -0,0 +1,277 @@
+"""
+Кэш чтения продуктов и каталогов.
+
+Два уровня: локальный в процессе (TTL + LRU) и необязательный общий
+(Redis) для нескольких реплик. Значения - pydantic-схемы ответов: локально
+хранятся как объекты, в общем уровне - как JSON. Функции записи в
+``service`` модулях инвалидируют ключи затронутых строк после фиксации
+транзакции (``invalidate_on_commit`` + ``commit``): иначе параллельный
+читатель успел бы снова закэшировать еще не измененную строку.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any, Protocol, TypeVar
+
+from pydantic import BaseModel
+
+from . import schemas
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+# Ключ ``AsyncSession.info`` с ключами кэша, ждущими фиксации транзакции.
+PENDING_INVALIDATIONS = "cache_pending_invalidations"
+
+
+class SharedBackend(Protocol):
+    """Общий уровень кэша: хранилище байтов с TTL."""
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class RedisBackend:
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        try:
+            import redis.asyncio
+        except ImportError:
+            raise RuntimeError(
+                "CACHE_REDIS_URL is set, but the redis package is not installed"
+            )
+        return cls(redis.asyncio.from_url(url))
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.client.set(key, value, px=int(ttl * 1000))
+
+    async def delete(self, *keys: str) -> None:
+        await self.client.delete(*keys)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class InMemoryBackend:
+    """Общий уровень в памяти процесса; заменяет Redis в тестах и локально."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.values: dict[str, tuple[bytes, float]] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        value, expires_at = self.values.get(key, (None, 0.0))
+        if value is None or expires_at <= self.clock():
+            self.values.pop(key, None)
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.values[key] = (value, self.clock() + ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.values.pop(key, None)
+
+    async def close(self) -> None:
+        self.values.clear()
+
+
+class LocalCache:
+    """Кэш в памяти процесса с ограничением размера (LRU) и временем жизни."""
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.evictions = 0
+        self._values: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, key: str) -> Any | None:
+        item = self._values.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at <= self.clock():
+            del self._values[key]
+            return None
+        self._values.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        self._values[key] = (value, self.clock() + self.ttl)
+        self._values.move_to_end(key)
+        while len(self._values) > self.max_size:
+            self._values.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._values.pop(key, None)
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+def _tier_stats(hits: int, misses: int) -> schemas.CacheTierStats:
+    lookups = hits + misses
+    return schemas.CacheTierStats(
+        hits=hits, misses=misses, hit_ratio=hits / lookups if lookups else 0.0
+    )
+
+
+class ReadThroughCache:
+    """
+    Кэш «читай через себя»: при промахе значение загружается функцией
+    ``load`` и сохраняется в оба уровня.
+
+    Ошибки общего уровня не роняют запрос: кэш просто считается промахом.
+    Локальный уровень не инвалидируется между репликами, поэтому его TTL
+    стоит держать коротким.
+    """
+
+    def __init__(
+        self,
+        *,
+        local_max_size: int = 10_000,
+        local_ttl: float = 5.0,
+        shared: SharedBackend | None = None,
+        shared_ttl: float = 60.0,
+    ):
+        self.local = LocalCache(max_size=local_max_size, ttl=local_ttl)
+        self.shared = shared
+        self.shared_ttl = shared_ttl
+        self.reset_stats()
+
+    def configure(
+        self,
+        *,
+        local_max_size: int,
+        local_ttl: float,
+        shared: SharedBackend | None,
+        shared_ttl: float,
+    ) -> None:
+        self.local = LocalCache(max_size=local_max_size, ttl=local_ttl)
+        self.shared = shared
+        self.shared_ttl = shared_ttl
+
+    async def close(self) -> None:
+        self.local.clear()
+        if self.shared is not None:
+            await self.shared.close()
+            self.shared = None
+
+    def reset_stats(self) -> None:
+        self.local_hits = 0
+        self.local_misses = 0
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self.loads = 0
+        self.invalidations = 0
+
+    async def get_or_load(
+        self, key: str, schema: type[SchemaT], load: Callable[[], Awaitable[SchemaT]]
+    ) -> SchemaT:
+        value = self.local.get(key)
+        if value is not None:
+            self.local_hits += 1
+            return value
+        self.local_misses += 1
+
+        if self.shared is not None:
+            try:
+                data = await self.shared.get(key)
+            except Exception:
+                logger.warning("Shared cache get failed for %s", key, exc_info=True)
+                data = None
+            if data is not None:
+                self.shared_hits += 1
+                value = schema.model_validate_json(data)
+                self.local.set(key, value)
+                return value
+            self.shared_misses += 1
+
+        value = await load()
+        self.loads += 1
+        self.local.set(key, value)
+        if self.shared is not None and self.shared_ttl > 0:
+            try:
+                await self.shared.set(
+                    key, value.model_dump_json().encode(), self.shared_ttl
+                )
+            except Exception:
+                logger.warning("Shared cache set failed for %s", key, exc_info=True)
+        return value
+
+    async def invalidate(self, *keys: str) -> None:
+        if not keys:
+            return
+        self.invalidations += len(keys)
+        self.local.delete(*keys)
+        if self.shared is not None:
+            try:
+                await self.shared.delete(*keys)
+            except Exception:
+                logger.warning("Shared cache delete failed", exc_info=True)
+
+    def invalidate_on_commit(self, async_session: "AsyncSession", *keys: str) -> None:
+        """Откладывает инвалидацию ``keys`` до ``commit`` этой сессии."""
+        async_session.info.setdefault(PENDING_INVALIDATIONS, set()).update(keys)
+
+    async def commit(self, async_session: "AsyncSession") -> None:
+        """Фиксирует транзакцию и инвалидирует отложенные ключи."""
+        await async_session.commit()
+        await self.invalidate(*async_session.info.pop(PENDING_INVALIDATIONS, ()))
+
+    def stats(self) -> schemas.CacheStats:
+        return schemas.CacheStats(
+            local=_tier_stats(self.local_hits, self.local_misses),
+            shared=(
+                _tier_stats(self.shared_hits, self.shared_misses)
+                if self.shared is not None
+                else None
+            ),
+            loads=self.loads,
+            invalidations=self.invalidations,
+            local_size=len(self.local),
+            local_evictions=self.local.evictions,
+        )
+
+
+def product_key(id: int) -> str:
+    return f"product:{id}"
+
+
+def catalog_key(id: int) -> str:
+    return f"catalog:{id}"
+
+
+cache = ReadThroughCache()
@@ -0,0 +1,131 @@
+"""
+Таблица замыкания (closure table) дерева каталогов.
+
+Для каждой пары «предок - потомок» хранится строка с расстоянием между
+ними (``depth``), включая пару каталога с самим собой (``depth = 0``).
+Поддерево, цепочка предков и счетчики по поддереву выбираются одним
+запросом по индексу вместо рекурсивного обхода ``parent_id``.
+
+Таблица поддерживается ``sync_catalog_closure``, которую вызывают все
+пути записи каталогов в ``service``.
+"""
+
+from collections.abc import Collection
+
+from sqlalchemy import and_, delete, literal, or_, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from . import models
+
+Closure = models.CatalogClosure
+
+
+async def sync_catalog_closure(
+    async_session: AsyncSession, catalog_ids: Collection[int]
+) -> None:
+    """
+    Приводит таблицу замыкания в соответствие с ``parent_id`` каталогов.
+
+    Одним запросом находит среди ``catalog_ids`` новые каталоги (без строки
+    на самого себя) и перемещенные (родитель в таблице не совпадает с
+    ``parent_id``). Для неизменившегося дерева больше ничего не делается,
+    поэтому повторный парсинг обходится одним запросом.
+    """
+    if not catalog_ids:
+        return
+
+    own = aliased(Closure)
+    parent = aliased(Closure)
+    result = await async_session.execute(
+        select(models.Catalog.id, models.Catalog.parent_id, own.depth)
+        .outerjoin(
+            own, and_(own.descendant_id == models.Catalog.id, own.depth == 0)
+        )
+        .outerjoin(
+            parent, and_(parent.descendant_id == models.Catalog.id, parent.depth == 1)
+        )
+        .where(
+            models.Catalog.id.in_(catalog_ids),
+            or_(
+                own.depth.is_(None),
+                parent.ancestor_id.is_distinct_from(models.Catalog.parent_id),
+            ),
+        )
+    )
+    new_parent_ids: dict[int, int | None] = {}
+    moved_parent_ids: dict[int, int | None] = {}
+    for id, parent_id, depth in result.all():
+        if depth is None:
+            new_parent_ids[id] = parent_id
+        else:
+            moved_parent_ids[id] = parent_id
+
+    # Новые каталоги добавляются волнами: сначала те, чей родитель уже
+    # есть в таблице, затем их дети. Обычно это одна волна на уровень.
+    while new_parent_ids:
+        wave = [
+            id
+            for id, parent_id in new_parent_ids.items()
+            if parent_id not in new_parent_ids
+        ] or list(new_parent_ids)
+        await _insert_new(async_session, wave)
+        for id in wave:
+            del new_parent_ids[id]
+
+    for id, parent_id in moved_parent_ids.items():
+        await _move(async_session, id, parent_id)
+
+
+async def _insert_new(async_session: AsyncSession, catalog_ids: list[int]) -> None:
+    ancestors = (
+        select(
+            Closure.ancestor_id,
+            models.Catalog.id,
+            Closure.depth + 1,
+        )
+        .join(Closure, Closure.descendant_id == models.Catalog.parent_id)
+        .where(models.Catalog.id.in_(catalog_ids))
+    )
+    selves = select(models.Catalog.id, models.Catalog.id, literal(0)).where(
+        models.Catalog.id.in_(catalog_ids)
+    )
+    await async_session.execute(
+        postgresql_insert(Closure)
+        .from_select(
+            [Closure.ancestor_id, Closure.descendant_id, Closure.depth],
+            selves.union_all(ancestors),
+        )
+        .on_conflict_do_nothing()
+    )
+
+
+async def _move(
+    async_session: AsyncSession, catalog_id: int, parent_id: int | None
+) -> None:
+    """Переносит поддерево каталога под нового родителя."""
+    subtree = select(Closure.descendant_id).where(Closure.ancestor_id == catalog_id)
+    await async_session.execute(
+        delete(Closure).where(
+            Closure.descendant_id.in_(subtree),
+            Closure.ancestor_id.not_in(subtree),
+        )
+    )
+    if parent_id is None:
+        return
+
+    above = aliased(Closure)
+    below = aliased(Closure)
+    await async_session.execute(
+        postgresql_insert(Closure)
+        .from_select(
+            [Closure.ancestor_id, Closure.descendant_id, Closure.depth],
+            select(
+                above.ancestor_id,
+                below.descendant_id,
+                above.depth + below.depth + 1,
+            ).where(above.descendant_id == parent_id, below.ancestor_id == catalog_id),
+        )
+        .on_conflict_do_nothing()
+    )
@@ -0,0 +1,185 @@
+import collections
+import logging
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import pipeline, schemas, service
+from .exceptions import CatalogParserError
+
+if TYPE_CHECKING:
+    from ..jobs.service import JobProgress
+    from ..parsing.engines import Engine
+
+logger = logging.getLogger(__name__)
+
+
+async def iterate_catalog_pages(
+    *,
+    engine: "Engine",
+    code: int,
+    max_depth: int,
+    max_pages: int,
+    progress: "JobProgress",
+) -> AsyncIterator[tuple[int, int, service.ParsedCatalogPage]]:
+    """
+    Страницы списков подраздела и вложенных подразделов в порядке обхода:
+    ``(код подраздела, номер страницы, страница)``. В ``product_codes``
+    страницы остаются только продукты, не встречавшиеся раньше в обходе.
+
+    Подразделы обрабатываются в ширину через очередь (frontier) до глубины
+    ``max_depth``; у каждого читается не больше ``max_pages`` страниц.
+    Ссылка на подраздел может вести и из меню сайта, поэтому подраздел
+    обходится, только если в его хлебных крошках родитель - подраздел,
+    на странице которого нашлась ссылка.
+    """
+    frontier: collections.deque[tuple[int, int, int | None]] = collections.deque(
+        [(code, 0, None)]
+    )
+    queued_subsection_codes = {code}
+    # Подразделы, чьи крошки указали на другого родителя: код -> родитель.
+    foreign_parent_codes: dict[int, int | None] = {}
+    seen_product_codes: set[int] = set()
+
+    while frontier:
+        subsection_code, depth, parent_code = frontier.popleft()
+        previous_codes: set[int] | None = None
+        for page in range(1, max_pages + 1):
+            try:
+                parsed_catalog_page = await engine.parse_catalog_page(
+                    subsection_code, page, None
+                )
+            except CatalogParserError as exception:
+                # Страница без сетки товаров и без хлебных крошек - не страница
+                # раздела; у раздела без сетки она пустая, а не ошибка.
+                if page == 1:
+                    progress.fail(subsection_code, exception)
+                break
+
+            if page == 1 and depth > 0:
+                breadcrumb_parent_code = (
+                    parsed_catalog_page.parsed_breadcrumb_catalogs.catalog_parent_map
+                ).get(subsection_code)
+                if breadcrumb_parent_code != parent_code:
+                    logger.info(
+                        "Skipped subsection %s: its parent is %s, not %s",
+                        subsection_code,
+                        breadcrumb_parent_code,
+                        parent_code,
+                    )
+                    foreign_parent_codes[subsection_code] = breadcrumb_parent_code
+                    queued_subsection_codes.discard(subsection_code)
+                    break
+
+            if page == 1 and depth < max_depth:
+                for child_code in parsed_catalog_page.subsection_codes:
+                    if child_code in queued_subsection_codes:
+                        continue
+                    if child_code in foreign_parent_codes and (
+                        foreign_parent_codes[child_code] != subsection_code
+                    ):
+                        continue
+                    queued_subsection_codes.add(child_code)
+                    frontier.append((child_code, depth + 1, subsection_code))
+
+            # Пустая страница или повтор предыдущей страницы этого подраздела
+            # означает, что страницы подраздела закончились.
+            page_codes = set(parsed_catalog_page.product_codes)
+            if not page_codes or page_codes == previous_codes:
+                break
+            previous_codes = page_codes
+
+            product_codes = [
+                product_code
+                for product_code in parsed_catalog_page.product_codes
+                if product_code not in seen_product_codes
+            ]
+            if not product_codes:
+                # Все продукты уже собраны раньше (например, в родителе), но
+                # следующие страницы подраздела еще могут принести новые.
+                continue
+            seen_product_codes.update(product_codes)
+            progress.total = len(seen_product_codes)
+
+            new_codes = set(product_codes)
+            yield subsection_code, page, parsed_catalog_page._replace(
+                product_codes=product_codes,
+                product_cards=tuple(
+                    card
+                    for card in parsed_catalog_page.product_cards
+                    if card.code in new_codes
+                ),
+            )
+
+
+async def crawl_catalog(
+    *,
+    engine: "Engine",
+    async_session: AsyncSession,
+    code: int,
+    max_depth: int,
+    max_pages: int,
+    concurrency: int,
+    progress: "JobProgress",
+    mode: "schemas.ParseMode" = "full",
+    batch_size: int = pipeline.BATCH_SIZE,
+) -> None:
+    """
+    Обходит подраздел целиком: все страницы списка и вложенные подразделы
+    (см. ``iterate_catalog_pages``). Продукты, уже встреченные в этом обходе,
+    повторно не загружаются.
+
+    Страницы продуктов загружаются потоковым конвейером, пока обход
+    продолжает читать списки, и сохраняются пачками по ``batch_size``:
+    ошибка в конце обхода не теряет уже собранные данные.
+
+    В режиме ``listing`` продукты сохраняются из карточек списка, а страницы
+    загружаются только у новых и изменившихся (``upsert_catalog_listing``).
+    """
+    catalog_pages = iterate_catalog_pages(
+        engine=engine,
+        code=code,
+        max_depth=max_depth,
+        max_pages=max_pages,
+        progress=progress,
+    )
+
+    if mode == "listing":
+        async for subsection_code, page, parsed_catalog_page in catalog_pages:
+            saved_count = await service.upsert_catalog_listing(
+                engine=engine,
+                async_session=async_session,
+                parsed_catalog_page=parsed_catalog_page,
+                concurrency=concurrency,
+                on_error=progress.fail,
+            )
+            progress.succeed(saved_count)
+            logger.info(
+                "Crawled subsection %s page %s from listing: %s products",
+                subsection_code,
+                page,
+                saved_count,
+            )
+        return
+
+    async def product_codes() -> AsyncIterator[int]:
+        async for subsection_code, page, parsed_catalog_page in catalog_pages:
+            logger.info(
+                "Crawled subsection %s page %s: %s products",
+                subsection_code,
+                page,
+                len(parsed_catalog_page.product_codes),
+            )
+            for product_code in parsed_catalog_page.product_codes:
+                yield product_code
+
+    async for count in pipeline.stream_products(
+        engine=engine,
+        async_session=async_session,
+        codes=product_codes(),
+        concurrency=concurrency,
+        batch_size=batch_size,
+        on_error=progress.fail,
+    ):
+        progress.succeed(count)
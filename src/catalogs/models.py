@@ -15,23 +15,45 @@ class Catalog(Base):
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     code: Mapped[int] = mapped_column(unique=True, index=True, nullable=False)
     name: Mapped[str] = mapped_column(String(150), nullable=False)
-    parent_id: Mapped[int | None] = mapped_column(ForeignKey("catalogs.id"))
+    parent_id: Mapped[int | None] = mapped_column(
+        ForeignKey("catalogs.id", ondelete="CASCADE"), index=True
+    )
 
+    # Связи не загружаются неявно: дерево каталогов и списки продуктов
+    # могут быть огромными, поэтому каждый запрос сам указывает, что ему
+    # нужно (selectinload, счетчики и т.п.). Удаление поддерева и продуктов
+    # выполняет база через ON DELETE CASCADE.
     parent: Mapped["Catalog"] = relationship(
-        "Catalog", back_populates="children", remote_side=[id], lazy="selectin"
+        "Catalog", back_populates="children", remote_side=[id], lazy="raise"
     )
     children: Mapped[list["Catalog"]] = relationship(
         "Catalog",
         back_populates="parent",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
     products: Mapped[list["Product"]] = relationship(
         "Product",
         back_populates="catalog",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
         return f"<Catalog(id={self.id}, name='{self.name}')>"
+
+
+class CatalogClosure(Base):
+    """Пара «предок - потомок» дерева каталогов, см. ``closure``."""
+
+    __tablename__ = "catalog_closure"
+
+    ancestor_id: Mapped[int] = mapped_column(
+        ForeignKey("catalogs.id", ondelete="CASCADE"), primary_key=True
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        ForeignKey("catalogs.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    depth: Mapped[int] = mapped_column(nullable=False)
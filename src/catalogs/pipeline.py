@@ -0,0 +1,193 @@
+"""
+Потоковый конвейер парсинга продуктов.
+
+Стадии - асинхронные генераторы: коды продуктов -> загрузка и разбор
+страниц -> пачки -> upsert. Между обнаружением кодов и загрузкой, а также
+между загрузкой и записью стоят очереди ограниченного размера: если запись
+в базу отстает, загрузчики ждут места в очереди, а обнаружение кодов -
+свободных загрузчиков. Поэтому в памяти одновременно не больше двух
+очередей и одной пачки, сколько бы продуктов ни было в обходе. Продукты
+выходят из конвейера в порядке кодов, независимо от порядка загрузки.
+
+Каждая пачка сохраняется в своей транзакции: ошибка на середине не
+отменяет уже записанные пачки.
+"""
+
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from contextlib import aclosing
+from typing import TYPE_CHECKING, NamedTuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import service
+
+if TYPE_CHECKING:
+    from ..parsing.engines import Engine
+    from ..products.service import ParsedProduct
+
+T = TypeVar("T")
+
+BATCH_SIZE = 50
+
+_DONE = object()
+_SKIPPED = object()
+
+
+class _Failure(NamedTuple):
+    exception: BaseException
+
+
+async def parse_products(
+    engine: "Engine",
+    codes: AsyncIterable[int],
+    *,
+    concurrency: int = 1,
+    queue_size: int | None = None,
+    on_error: Callable[[int, Exception], None] | None = None,
+) -> AsyncIterator["ParsedProduct"]:
+    """
+    Загружает и разбирает продукты по мере поступления кодов силами
+    ``concurrency`` загрузчиков и отдает результаты в порядке кодов, как
+    ``parse_products_by_codes``.
+
+    ``on_error`` работает как в ``parse_products_by_codes``; без него ошибка
+    прерывает конвейер, когда до нее доходит очередь. Очереди по умолчанию
+    вмещают по два кода и результата на загрузчика. Результаты, готовые
+    раньше предыдущих, ждут в буфере; вместе с загрузками в работе их не
+    больше ``queue_size + concurrency``, поэтому медленный продукт
+    задерживает обнаружение кодов, а не раздувает буфер.
+    """
+    concurrency = max(concurrency, 1)
+    queue_size = queue_size or 2 * concurrency
+    code_queue: asyncio.Queue = asyncio.Queue(queue_size)
+    result_queue: asyncio.Queue = asyncio.Queue(queue_size)
+    # Коды, взятые в работу, но еще не отданные: окно буфера перестановки.
+    window = asyncio.Semaphore(queue_size + concurrency)
+
+    async def feed() -> None:
+        index = 0
+        try:
+            async for code in codes:
+                await window.acquire()
+                await code_queue.put((index, code))
+                index += 1
+        except Exception as exception:
+            await result_queue.put((index, _Failure(exception)))
+            return
+        for _ in range(concurrency):
+            await code_queue.put(_DONE)
+
+    async def work() -> None:
+        while (item := await code_queue.get()) is not _DONE:
+            index, code = item
+            try:
+                parsed_product = await engine.parse_product(code)
+            except Exception as exception:
+                if on_error is None:
+                    await result_queue.put((index, _Failure(exception)))
+                    return
+                on_error(code, exception)
+                parsed_product = _SKIPPED
+            await result_queue.put((index, parsed_product))
+        await result_queue.put(_DONE)
+
+    tasks = [asyncio.create_task(feed())]
+    tasks.extend(asyncio.create_task(work()) for _ in range(concurrency))
+    try:
+        pending = {}
+        next_index = 0
+        finished = 0
+        while True:
+            while next_index in pending:
+                result = pending.pop(next_index)
+                next_index += 1
+                window.release()
+                if isinstance(result, _Failure):
+                    raise result.exception
+                if result is not _SKIPPED:
+                    yield result
+            # Каждый загрузчик кладет _DONE после своих результатов.
+            if finished == concurrency:
+                break
+            item = await result_queue.get()
+            if item is _DONE:
+                finished += 1
+            else:
+                index, result = item
+                pending[index] = result
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def batched(items: AsyncIterable[T], size: int) -> AsyncIterator[list[T]]:
+    batch: list[T] = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def upsert_batches(
+    async_session: AsyncSession,
+    batches: AsyncIterable[list["ParsedProduct"]],
+    *,
+    parsed_breadcrumb_catalogs: service.ParsedBreadcrumbCatalogs | None = None,
+) -> AsyncIterator[int]:
+    """
+    Сохраняет каждую пачку в отдельной транзакции и отдает число записанных
+    продуктов. Каталоги ``parsed_breadcrumb_catalogs`` (хлебные крошки
+    страницы списка) сохраняются вместе с каждой пачкой.
+    """
+    parsed_breadcrumb_catalogs = (
+        parsed_breadcrumb_catalogs or service.ParsedBreadcrumbCatalogs({}, {}, None)
+    )
+    async for batch in batches:
+        await service.upsert_parsed_catalog_products(
+            async_session=async_session,
+            parsed_catalog_products=service.collect_parsed_catalog_products(
+                parsed_breadcrumb_catalogs, batch
+            ),
+        )
+        yield len(batch)
+
+
+async def stream_products(
+    *,
+    engine: "Engine",
+    async_session: AsyncSession,
+    codes: AsyncIterable[int],
+    parsed_breadcrumb_catalogs: service.ParsedBreadcrumbCatalogs | None = None,
+    concurrency: int = 1,
+    batch_size: int = BATCH_SIZE,
+    queue_size: int | None = None,
+    on_error: Callable[[int, Exception], None] | None = None,
+) -> AsyncIterator[int]:
+    """Весь конвейер; отдает размер каждой сохраненной пачки."""
+    # aclosing останавливает загрузчики, даже если запись упала на середине.
+    async with aclosing(
+        parse_products(
+            engine,
+            codes,
+            concurrency=concurrency,
+            queue_size=queue_size,
+            on_error=on_error,
+        )
+    ) as parsed_products:
+        async for count in upsert_batches(
+            async_session,
+            batched(parsed_products, batch_size),
+            parsed_breadcrumb_catalogs=parsed_breadcrumb_catalogs,
+        ):
+            yield count
+
+
+async def iterate(codes: list[int]) -> AsyncIterator[int]:
+    """Коды из готового списка как источник конвейера."""
+    for code in codes:
+        yield code
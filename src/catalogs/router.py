@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
-from selenium.webdriver import Chrome
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..dependencies import get_async_session, get_driver
+from .. import conditional, pagination
+from ..dependencies import bypass_fetch_cache, get_async_session, get_engine
+from ..parsing.engines import Engine
+from ..products.router import products_json_response
+from ..products.schemas import Product
 from . import schemas, service
 
 _router = APIRouter(prefix="/catalogs")
@@ -21,23 +24,86 @@ async def create_catalog(
 
 @_router.get("/", response_model=list[schemas.Catalog])
 async def read_catalogs(
+    request: Request,
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1),
+    cursor: str | None = None,
+    order_by: str = "id",
     async_session: AsyncSession = Depends(get_async_session),
 ):
-    catalogs = await service.get_all_catalogs(async_session, skip=skip, limit=limit)
-    return catalogs
+    catalogs, next_cursor = await service.get_all_catalogs(
+        async_session, skip=skip, limit=limit, cursor=cursor, order_by=order_by
+    )
+    if next_cursor is not None:
+        response.headers[pagination.NEXT_CURSOR_HEADER] = next_cursor
+    not_modified = conditional.check_not_modified(
+        request,
+        response,
+        etag=conditional.make_etag(
+            [service.catalog_etag(catalog) for catalog in catalogs], next_cursor
+        ),
+    )
+    return not_modified or catalogs
 
 
 @_router.get("/{catalog_id}", response_model=schemas.Catalog)
 async def read_catalog(
     catalog_id: int,
+    request: Request,
+    response: Response,
     async_session: AsyncSession = Depends(get_async_session),
 ):
-    db_catalog = await service.get_catalog_by_id(async_session, id=catalog_id)
+    db_catalog = await service.get_cached_catalog_by_id(async_session, id=catalog_id)
     if db_catalog is None:
         raise HTTPException(status_code=404, detail="Catalog not found")
-    return db_catalog
+    not_modified = conditional.check_not_modified(
+        request, response, etag=service.catalog_etag(db_catalog)
+    )
+    return not_modified or db_catalog
+
+
+@_router.get("/{catalog_id}/children", response_model=schemas.CatalogWithChildren)
+async def read_catalog_with_children(
+    catalog_id: int,
+    async_session: AsyncSession = Depends(get_async_session),
+):
+    return await service.get_catalog_with_children(async_session, id=catalog_id)
+
+
+@_router.get("/{catalog_id}/ancestors", response_model=list[schemas.Catalog])
+async def read_catalog_ancestors(
+    catalog_id: int,
+    async_session: AsyncSession = Depends(get_async_session),
+):
+    return await service.get_catalog_ancestors(async_session, id=catalog_id)
+
+
+@_router.get("/{catalog_id}/subtree/products", response_model=list[Product])
+async def read_catalog_subtree_products(
+    catalog_id: int,
+    response: Response,
+    limit: int = Query(100, ge=1),
+    cursor: str | None = None,
+    order_by: str = "id",
+    async_session: AsyncSession = Depends(get_async_session),
+):
+    products, next_cursor = await service.get_catalog_subtree_products(
+        async_session, id=catalog_id, limit=limit, cursor=cursor, order_by=order_by
+    )
+    if next_cursor is not None:
+        response.headers[pagination.NEXT_CURSOR_HEADER] = next_cursor
+    return products_json_response(products, response)
+
+
+@_router.get(
+    "/{catalog_id}/subtree/counts", response_model=schemas.CatalogWithSubtreeCounts
+)
+async def read_catalog_subtree_counts(
+    catalog_id: int,
+    async_session: AsyncSession = Depends(get_async_session),
+):
+    return await service.get_catalog_with_subtree_counts(async_session, id=catalog_id)
 
 
 @_router.patch("/{catalog_id}", response_model=schemas.Catalog)
@@ -74,57 +140,79 @@ async def delete_catalog(
 #     pass
 
 
-@_router.post("/{catalog_id}/parse-products")
+@_router.post(
+    "/{catalog_id}/parse-products", dependencies=[Depends(bypass_fetch_cache)]
+)
 async def parse_catalog_products_by_id(
     catalog_id: int,
     page: int = 1,
     limit: int = 10,
+    concurrency: int = 1,
+    mode: schemas.ParseMode = "full",
+    batch_size: int | None = None,
     async_session: AsyncSession = Depends(get_async_session),
-    driver: Chrome = Depends(get_driver),
+    engine: Engine = Depends(get_engine),
 ):
     await service.upsert_parsed_catalog_products_by_id(
         async_session=async_session,
-        driver=driver,
+        engine=engine,
         page=page,
         limit=limit,
+        concurrency=concurrency,
+        mode=mode,
+        batch_size=batch_size,
         id=catalog_id,
     )
 
     return {"ok": True}
 
 
-@_router.post("/parse-products/by-code/{code}")
+@_router.post(
+    "/parse-products/by-code/{code}", dependencies=[Depends(bypass_fetch_cache)]
+)
 async def parse_catalog_products_by_code(
     code: int,
     page: int = 1,
     limit: int = 10,
+    concurrency: int = 1,
+    mode: schemas.ParseMode = "full",
+    batch_size: int | None = None,
     async_session: AsyncSession = Depends(get_async_session),
-    driver: Chrome = Depends(get_driver),
+    engine: Engine = Depends(get_engine),
 ):
     await service.upsert_parsed_catalog_products_by_code(
         async_session=async_session,
-        driver=driver,
+        engine=engine,
         page=page,
         limit=limit,
+        concurrency=concurrency,
+        mode=mode,
+        batch_size=batch_size,
         code=code,
     )
 
     return {"ok": True}
 
 
-@_router.post("/parse-products/by-url")
+@_router.post("/parse-products/by-url", dependencies=[Depends(bypass_fetch_cache)])
 async def parse_catalog_products_by_url(
     url: str,
     page: int = 1,
     limit: int = 10,
+    concurrency: int = 1,
+    mode: schemas.ParseMode = "full",
+    batch_size: int | None = None,
     async_session: AsyncSession = Depends(get_async_session),
-    driver: Chrome = Depends(get_driver),
+    engine: Engine = Depends(get_engine),
 ):
     await service.upsert_parsed_catalog_products_by_url(
         async_session=async_session,
-        driver=driver,
+        engine=engine,
         page=page,
         limit=limit,
+        concurrency=concurrency,
+        mode=mode,
+        batch_size=batch_size,
         url=url,
     )
 
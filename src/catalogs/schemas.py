@@ -1,7 +1,13 @@
+from typing import Literal
+
 from pydantic import ConfigDict
 
 from ..schemas import BaseSchema
 
+# full - страница каждого продукта; listing - карточки списка, страницы
+# только новых и изменившихся продуктов.
+ParseMode = Literal["full", "listing"]
+
 
 class CatalogBase(BaseSchema):
     code: int
@@ -22,3 +28,20 @@ class Catalog(CatalogBase):
     model_config = ConfigDict(from_attributes=True)
 
     id: int
+
+
+class CatalogWithProductCount(Catalog):
+    product_count: int
+
+
+class CatalogWithChildren(CatalogWithProductCount):
+    children: list[CatalogWithProductCount]
+
+
+class CatalogSubtreeCounts(Catalog):
+    product_count: int
+    catalog_count: int
+
+
+class CatalogWithSubtreeCounts(CatalogSubtreeCounts):
+    children: list[CatalogSubtreeCounts]
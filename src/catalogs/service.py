@@ -1,23 +1,27 @@
 import collections
+from collections.abc import Callable
+from decimal import Decimal
 from typing import TYPE_CHECKING, NamedTuple
 from urllib.parse import parse_qs, urlparse
 
-from selenium.webdriver import Chrome
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.expected_conditions import visibility_of_element_located
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.common.exceptions import TimeoutException
-from sqlalchemy import select
+from sqlalchemy import distinct, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
-from src.catalogs.exceptions import CatalogParserError
+from src import conditional, pagination, tracing
+from src.cache import service as cache_service
+from src.cache.service import cache
 from src.exceptions import BadRequestError, ConflictError, NotFoundError
+from src.metrics import service as metrics
 
-from . import models, schemas
+from . import closure, models, schemas
+from .tree import CatalogTree
 
 if TYPE_CHECKING:
+    from ..parsing.engines import Engine
     from ..products import schemas as product_schemas
+    from ..products import service as product_service
 
 
 class ParsedBreadcrumbCatalogs(NamedTuple):
@@ -74,7 +78,30 @@ class ParsedBreadcrumbCatalogs(NamedTuple):
 
         return sorted_catalogs
 
+    def in_levels(self) -> list[list[schemas.CatalogCreate]]:
+        """
+        Группирует каталоги по глубине: на нулевом уровне корни,
+        на каждом следующем - дети каталогов предыдущего уровня.
+        """
+        levels: list[list[schemas.CatalogCreate]] = []
+        depths: dict[int, int] = {}
+        for catalog in self.in_order():
+            parent_code = self.catalog_parent_map.get(catalog.code)
+            depth = 0 if parent_code is None else depths[parent_code] + 1
+            depths[catalog.code] = depth
+            if depth == len(levels):
+                levels.append([])
+            levels[depth].append(catalog)
+        return levels
+
+    def parent_code(self, code: int) -> int | None:
+        return self.catalog_parent_map[code]
+
     def union(self, other: "ParsedBreadcrumbCatalogs") -> "ParsedBreadcrumbCatalogs":
+        """
+        Новое дерево из двух; копирует обе карты. Для слияния многих цепочек
+        подряд - ``CatalogTree.merge``.
+        """
         return ParsedBreadcrumbCatalogs(
             self.catalog_map | other.catalog_map,
             self.catalog_parent_map | other.catalog_parent_map,
@@ -82,124 +109,46 @@ class ParsedBreadcrumbCatalogs(NamedTuple):
         )
 
 
-async def parse_breadcrumb_catalogs(driver: Chrome, /) -> ParsedBreadcrumbCatalogs:
-    try:
-        try:
-            breadcrumb_catalogs_container = driver.find_element(By.CLASS_NAME, "krohi")
-        except TimeoutException:
-            raise CatalogParserError("Could not find breadcrumb trail")
-
-        try:
-            breadcrumbs = breadcrumb_catalogs_container.find_elements(By.TAG_NAME, "a")
-        except TimeoutException:
-            raise CatalogParserError("Could not find links in breadcrumb")
-        catalog_map = {}
-        catalog_parent_map = {}
-        previous_code = None
-        for breadcrumb in breadcrumbs:
-            code = int(
-                parse_qs(urlparse(breadcrumb.get_attribute("href")).query)[
-                    "subsection"
-                ][0]
-            )
-            catalog_parent_map[code] = previous_code
-            name = breadcrumb.get_attribute("title")
-            catalog_map[code] = schemas.CatalogCreate(code=code, name=name)
-            previous_code = code
-        return ParsedBreadcrumbCatalogs(catalog_map, catalog_parent_map, previous_code)
-    except Exception as exception:
-        raise CatalogParserError(f"Unexpected error: {exception}")
+class ProductCard(NamedTuple):
+    """Карточка продукта в сетке списка каталога."""
 
+    code: int
+    name: str | None
+    price: Decimal | None
+    thumbnail_url: str | None
 
-class ParsedCatalogProducts(NamedTuple):
+
+class ParsedCatalogPage(NamedTuple):
+    product_codes: list[int]
     parsed_breadcrumb_catalogs: ParsedBreadcrumbCatalogs
+    subsection_codes: list[int]
+    product_cards: tuple[ProductCard, ...] = ()
+
+
+class ParsedCatalogProducts(NamedTuple):
+    parsed_breadcrumb_catalogs: ParsedBreadcrumbCatalogs | CatalogTree
     product_catalog_map: dict[int, int]
     products: list["product_schemas.ProductCreate"]
 
 
-async def parse_catalog_products_by_code(
-    *,
-    driver: Chrome,
-    async_session: AsyncSession,
-    code: int,
-    page: int,
-    limit: int,
+def collect_parsed_catalog_products(
+    parsed_breadcrumb_catalogs: ParsedBreadcrumbCatalogs,
+    parsed_products: list["product_service.ParsedProduct"],
 ) -> ParsedCatalogProducts:
-    from ..products import service as product_service
-
-    driver.get(f"https://www.flip.kz/catalog?subsection={code}&page={page}")
-    product_codes = []
-    wait = WebDriverWait(driver, 5)
-    products_container = wait.until(
-        visibility_of_element_located((By.CLASS_NAME, "good-grid"))
-    )
-    for number, product_element in enumerate(
-        products_container.find_elements(By.CLASS_NAME, "new-product")
-    ):
-        if number > limit:
-            break
-        product_link_element = product_element.find_element(By.TAG_NAME, "a")
-        product_url = product_link_element.get_attribute("href")
-        product_code = parse_qs(urlparse(product_url).query)["prod"][0]
-        product_codes.append(product_code)
-    parsed_breadcrumb_catalogs = await parse_breadcrumb_catalogs(driver)
+    catalog_tree = CatalogTree.from_breadcrumbs(parsed_breadcrumb_catalogs)
     product_catalog_map: dict[int, int] = {}
     products = []
-    for product_code in product_codes:
-        parsed_product = await product_service.parse_product_by_code(
-            driver=driver, async_session=async_session, code=product_code
-        )
+    for parsed_product in parsed_products:
         product_catalog_map[parsed_product.product.code] = (
             parsed_product.parsed_breadcrumb_catalogs.last_catalog_code
         )
-        parsed_breadcrumb_catalogs = parsed_breadcrumb_catalogs.union(
-            parsed_product.parsed_breadcrumb_catalogs
-        )
+        catalog_tree.merge(parsed_product.parsed_breadcrumb_catalogs)
         products.append(parsed_product.product)
-    return ParsedCatalogProducts(
-        parsed_breadcrumb_catalogs, product_catalog_map, products
-    )
-
+    return ParsedCatalogProducts(catalog_tree, product_catalog_map, products)
 
-async def parse_catalog_products_by_id(
-    *,
-    driver: Chrome,
-    async_session: AsyncSession,
-    id: int,
-    page: int,
-    limit: int,
-) -> ParsedCatalogProducts:
 
-    catalog = await get_catalog_by_id(async_session, id)
-    if catalog is None:
-        raise
-    return await parse_catalog_products_by_code(
-        driver=driver,
-        async_session=async_session,
-        code=catalog.code,
-        page=page,
-        limit=limit,
-    )
-
-
-async def parse_catalog_products_by_url(
-    *,
-    driver: Chrome,
-    async_session: AsyncSession,
-    url: str,
-    page: int,
-    limit: int,
-) -> ParsedCatalogProducts:
-    code = parse_qs(urlparse(url).query).get("subsection")
-    if code is None:
-        raise
-    return await parse_catalog_products_by_code(
-        driver=driver,
-        async_session=async_session,
-        code=int(code[0]),
-        page=page,
-        limit=limit,
-    )
+def catalog_etag(catalog: "schemas.Catalog | models.Catalog") -> str:
+    return conditional.make_etag(catalog.code, catalog.name, catalog.parent_id)
 
 
 async def get_catalog_by_id(async_session: AsyncSession, id: int):
@@ -212,6 +161,19 @@ async def get_catalog_by_id(async_session: AsyncSession, id: int):
     return catalog
 
 
+async def get_cached_catalog_by_id(
+    async_session: AsyncSession, id: int
+) -> schemas.Catalog:
+    """``get_catalog_by_id`` через кэш чтения; возвращает схему ответа."""
+
+    async def load() -> schemas.Catalog:
+        return schemas.Catalog.model_validate(
+            await get_catalog_by_id(async_session, id)
+        )
+
+    return await cache.get_or_load(cache_service.catalog_key(id), schemas.Catalog, load)
+
+
 async def get_catalog_by_code(async_session: AsyncSession, code: int):
     result = await async_session.execute(
         select(models.Catalog).where(models.Catalog.code == code)
@@ -222,13 +184,170 @@ async def get_catalog_by_code(async_session: AsyncSession, code: int):
     return catalog
 
 
-async def get_all_catalogs(
-    async_session: AsyncSession, skip: int = 0, limit: int = 100
+async def get_catalog_with_children(
+    async_session: AsyncSession, id: int
+) -> schemas.CatalogWithChildren:
+    """
+    Каталог и его прямые подкаталоги с числом продуктов у каждого.
+
+    Один запрос с ``GROUP BY`` по самому каталогу и его детям: ни
+    поддерево глубже одного уровня, ни строки продуктов не загружаются.
+    """
+    from ..products import models as product_models
+
+    result = await async_session.execute(
+        select(
+            models.Catalog.id,
+            models.Catalog.code,
+            models.Catalog.name,
+            models.Catalog.parent_id,
+            func.count(product_models.Product.id).label("product_count"),
+        )
+        .outerjoin(
+            product_models.Product,
+            product_models.Product.catalog_id == models.Catalog.id,
+        )
+        .where(or_(models.Catalog.id == id, models.Catalog.parent_id == id))
+        .group_by(models.Catalog.id)
+        .order_by(models.Catalog.id)
+    )
+    catalog = None
+    children = []
+    for row in result.all():
+        catalog_with_count = schemas.CatalogWithProductCount.model_validate(row)
+        if row.id == id:
+            catalog = catalog_with_count
+        else:
+            children.append(catalog_with_count)
+    if catalog is None:
+        raise NotFoundError(f"Catalog with id {id} - not found")
+    return schemas.CatalogWithChildren(**catalog.model_dump(), children=children)
+
+
+async def get_catalog_ancestors(async_session: AsyncSession, id: int):
+    """Цепочка каталогов от корня до каталога ``id`` включительно."""
+    result = await async_session.execute(
+        select(models.Catalog)
+        .join(
+            models.CatalogClosure,
+            models.CatalogClosure.ancestor_id == models.Catalog.id,
+        )
+        .where(models.CatalogClosure.descendant_id == id)
+        .order_by(models.CatalogClosure.depth.desc())
+    )
+    catalogs = result.scalars().all()
+    if not catalogs:
+        raise NotFoundError(f"Catalog with id {id} - not found")
+    return catalogs
+
+
+async def get_catalog_subtree_products(
+    async_session: AsyncSession,
+    id: int,
+    *,
+    limit: int = 100,
+    cursor: str | None = None,
+    order_by: str = "id",
 ):
+    """Страница продуктов каталога ``id`` и всех его потомков."""
+    from ..products import models as product_models
+    from ..products import service as product_service
+
+    columns, descending = pagination.order_columns(
+        product_service.ORDER_COLUMNS, product_models.Product.id, order_by
+    )
+    statement = pagination.paginate(
+        select(*product_models.Product.__table__.columns)
+        .join(
+            models.CatalogClosure,
+            models.CatalogClosure.descendant_id == product_models.Product.catalog_id,
+        )
+        .where(models.CatalogClosure.ancestor_id == id),
+        columns,
+        descending=descending,
+        order_by=order_by,
+        cursor=cursor,
+        limit=limit,
+    )
+    products = await product_service.load_products(async_session, statement)
+    return products, pagination.next_cursor(
+        products, columns, order_by=order_by, limit=limit
+    )
+
+
+async def get_catalog_with_subtree_counts(
+    async_session: AsyncSession, id: int
+) -> schemas.CatalogWithSubtreeCounts:
+    """
+    Каталог и его прямые подкаталоги с числом продуктов и подкаталогов
+    во всем поддереве каждого.
+    """
+    from ..products import models as product_models
+
     result = await async_session.execute(
-        select(models.Catalog).offset(skip).limit(limit)
+        select(
+            models.Catalog.id,
+            models.Catalog.code,
+            models.Catalog.name,
+            models.Catalog.parent_id,
+            func.count(product_models.Product.id).label("product_count"),
+            (
+                func.count(distinct(models.CatalogClosure.descendant_id)) - 1
+            ).label("catalog_count"),
+        )
+        .join(
+            models.CatalogClosure,
+            models.CatalogClosure.ancestor_id == models.Catalog.id,
+        )
+        .outerjoin(
+            product_models.Product,
+            product_models.Product.catalog_id == models.CatalogClosure.descendant_id,
+        )
+        .where(or_(models.Catalog.id == id, models.Catalog.parent_id == id))
+        .group_by(models.Catalog.id)
+        .order_by(models.Catalog.id)
+    )
+    catalog = None
+    children = []
+    for row in result.all():
+        catalog_with_counts = schemas.CatalogSubtreeCounts.model_validate(row)
+        if row.id == id:
+            catalog = catalog_with_counts
+        else:
+            children.append(catalog_with_counts)
+    if catalog is None:
+        raise NotFoundError(f"Catalog with id {id} - not found")
+    return schemas.CatalogWithSubtreeCounts(**catalog.model_dump(), children=children)
+
+
+ORDER_COLUMNS = {"id": models.Catalog.id, "code": models.Catalog.code}
+
+
+async def get_all_catalogs(
+    async_session: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    *,
+    cursor: str | None = None,
+    order_by: str = "id",
+) -> tuple[list[models.Catalog], str | None]:
+    columns, descending = pagination.order_columns(
+        ORDER_COLUMNS, models.Catalog.id, order_by
+    )
+    statement = pagination.paginate(
+        select(models.Catalog),
+        columns,
+        descending=descending,
+        order_by=order_by,
+        cursor=cursor,
+        limit=limit,
+    )
+    if skip:
+        statement = statement.offset(skip)
+    catalogs = list((await async_session.execute(statement)).scalars().all())
+    return catalogs, pagination.next_cursor(
+        catalogs, columns, order_by=order_by, limit=limit
     )
-    return result.scalars().all()
 
 
 async def create_catalog(
@@ -237,6 +356,8 @@ async def create_catalog(
     db_catalog = models.Catalog(**catalog_in.model_dump())
     async_session.add(db_catalog)
     try:
+        await async_session.flush([db_catalog])
+        await closure.sync_catalog_closure(async_session, [db_catalog.id])
         await async_session.commit()
     except IntegrityError as integrity_error:
         if integrity_error.code == "1063":
@@ -258,16 +379,39 @@ async def update_catalog_by_id(
     for key, value in update_data.items():
         setattr(db_catalog, key, value)
     async_session.add(db_catalog)
+    await async_session.flush([db_catalog])
+    await closure.sync_catalog_closure(async_session, [id])
     await async_session.commit()
+    await cache.invalidate(cache_service.catalog_key(id))
     return await get_catalog_by_id(async_session, id)
 
 
 async def delete_catalog_by_id(async_session: AsyncSession, id: int):
+    from ..products import models as product_models
+
     db_catalog = await get_catalog_by_id(async_session, id)
     if not db_catalog:
         return None
+    # База удалит поддерево и его продукты каскадом; их ключи в кэше
+    # собираем заранее.
+    subtree = select(models.CatalogClosure.descendant_id).where(
+        models.CatalogClosure.ancestor_id == id
+    )
+    catalog_ids = (await async_session.execute(subtree)).scalars().all()
+    product_ids = (
+        await async_session.execute(
+            select(product_models.Product.id).where(
+                product_models.Product.catalog_id.in_(subtree)
+            )
+        )
+    ).scalars().all()
     await async_session.delete(db_catalog)
     await async_session.commit()
+    await cache.invalidate(
+        cache_service.catalog_key(id),
+        *map(cache_service.catalog_key, catalog_ids),
+        *map(cache_service.product_key, product_ids),
+    )
     return db_catalog
 
 
@@ -287,92 +431,182 @@ async def upsert_catalog_by_code(
             setattr(db_catalog, key, value)
 
     async_session.add(db_catalog)
+    await async_session.flush([db_catalog])
+    await closure.sync_catalog_closure(async_session, [db_catalog.id])
+    cache.invalidate_on_commit(async_session, cache_service.catalog_key(db_catalog.id))
     if commit:
-        await async_session.commit()
+        await cache.commit(async_session)
         await async_session.refresh(db_catalog)
-    else:
-        await async_session.flush([db_catalog])
     return db_catalog
 
 
+async def upsert_catalogs_by_code(
+    async_session: AsyncSession,
+    catalogs_in: list[schemas.CatalogCreate],
+    *,
+    commit: bool = True,
+) -> dict[int, int]:
+    """
+    Пакетный upsert каталогов одним ``INSERT ... ON CONFLICT (code) DO UPDATE``
+    и синхронизация таблицы замыкания для затронутых каталогов.
+    ``parent_id=None`` не стирает уже сохраненного родителя: так приходит
+    корень любой, в том числе неполной, цепочки хлебных крошек.
+    Возвращает словарь ``{code: id}``.
+    """
+    unique_catalogs = {catalog_in.code: catalog_in for catalog_in in catalogs_in}
+    if not unique_catalogs:
+        return {}
+
+    statement = postgresql_insert(models.Catalog).values(
+        [catalog_in.model_dump() for catalog_in in unique_catalogs.values()]
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[models.Catalog.code],
+        set_={
+            "name": statement.excluded.name,
+            "parent_id": func.coalesce(
+                statement.excluded.parent_id, models.Catalog.parent_id
+            ),
+        },
+    ).returning(models.Catalog.code, models.Catalog.id)
+    catalog_ids: dict[int, int] = dict((await async_session.execute(statement)).all())
+    await closure.sync_catalog_closure(async_session, catalog_ids.values())
+
+    cache.invalidate_on_commit(
+        async_session, *map(cache_service.catalog_key, catalog_ids.values())
+    )
+    if commit:
+        await cache.commit(async_session)
+    return catalog_ids
+
+
 async def upsert_parsed_breadcrumb_catalogs(
     async_session: AsyncSession,
-    parsed_breadcrumb_catalogs: ParsedBreadcrumbCatalogs,
+    parsed_breadcrumb_catalogs: ParsedBreadcrumbCatalogs | CatalogTree,
     commit: bool = True,
-) -> dict[int, schemas.Catalog]:
-    saved = {}
-    for catalog in parsed_breadcrumb_catalogs.in_order():
-        parent = saved.get(parsed_breadcrumb_catalogs.catalog_parent_map[catalog.code])
-        if parent is not None:
-            catalog.parent_id = parent.id
-        saved[catalog.code] = await upsert_catalog_by_code(
-            async_session, catalog, commit=False
+) -> dict[int, int]:
+    """
+    Сохраняет дерево каталогов по уровням: один запрос на уровень глубины,
+    ``parent_id`` берется из результатов предыдущего уровня.
+    Возвращает словарь ``{code: id}``.
+    """
+    catalog_ids: dict[int, int] = {}
+    for level in parsed_breadcrumb_catalogs.in_levels():
+        catalog_ids |= await upsert_catalogs_by_code(
+            async_session,
+            [
+                catalog.model_copy(
+                    update={
+                        "parent_id": catalog_ids.get(
+                            parsed_breadcrumb_catalogs.parent_code(catalog.code)
+                        )
+                    }
+                )
+                for catalog in level
+            ],
+            commit=False,
         )
     if commit:
-        await async_session.commit()
-        for catalog in saved.values():
-            await async_session.refresh(catalog)
-    return saved
+        await cache.commit(async_session)
+    return catalog_ids
 
 
 async def upsert_parsed_catalog_products_by_id(
     *,
-    driver: Chrome,
+    engine: "Engine",
     async_session: AsyncSession,
     id: int,
     page: int,
     limit: int,
+    concurrency: int = 1,
+    mode: schemas.ParseMode = "full",
+    batch_size: int | None = None,
 ):
-    return await upsert_parsed_catalog_products(
+    catalog = await get_catalog_by_id(async_session, id)
+    return await upsert_parsed_catalog_products_by_code(
+        engine=engine,
         async_session=async_session,
-        parsed_catalog_products=await parse_catalog_products_by_id(
-            driver=driver,
-            async_session=async_session,
-            id=id,
-            page=page,
-            limit=limit,
-        ),
+        code=catalog.code,
+        page=page,
+        limit=limit,
+        concurrency=concurrency,
+        mode=mode,
+        batch_size=batch_size,
     )
 
 
 async def upsert_parsed_catalog_products_by_url(
     *,
-    driver: Chrome,
+    engine: "Engine",
     async_session: AsyncSession,
     url: str,
     page: int,
     limit: int,
+    concurrency: int = 1,
+    mode: schemas.ParseMode = "full",
+    batch_size: int | None = None,
 ):
-    return await upsert_parsed_catalog_products(
+    code = parse_qs(urlparse(url).query).get("subsection")
+    if code is None:
+        raise BadRequestError("There is no 'subsection' in query parameters")
+    return await upsert_parsed_catalog_products_by_code(
+        engine=engine,
         async_session=async_session,
-        parsed_catalog_products=await parse_catalog_products_by_url(
-            driver=driver,
-            async_session=async_session,
-            url=url,
-            page=page,
-            limit=limit,
-        ),
+        code=int(code[0]),
+        page=page,
+        limit=limit,
+        concurrency=concurrency,
+        mode=mode,
+        batch_size=batch_size,
     )
 
 
 async def upsert_parsed_catalog_products_by_code(
     *,
-    driver: Chrome,
+    engine: "Engine",
     async_session: AsyncSession,
     code: int,
     page: int,
     limit: int,
-):
-    return await upsert_parsed_catalog_products(
-        async_session=async_session,
-        parsed_catalog_products=await parse_catalog_products_by_code(
-            driver=driver,
+    concurrency: int = 1,
+    mode: schemas.ParseMode = "full",
+    batch_size: int | None = None,
+) -> int:
+    """
+    Парсит страницу списка и сохраняет ее продукты; возвращает их число.
+
+    В режиме ``full`` страницы продуктов загружаются потоковым конвейером
+    (``pipeline.stream_products``) и сохраняются пачками по ``batch_size``:
+    при ошибке уже сохраненные пачки остаются в базе.
+    """
+    from . import pipeline
+
+    with tracing.span(
+        "upsert_parsed_catalog_products_by_code",
+        code=code,
+        page=page,
+        limit=limit,
+        mode=mode,
+    ):
+        parsed_catalog_page = await engine.parse_catalog_page(code, page, limit)
+        if mode == "listing":
+            return await upsert_catalog_listing(
+                engine=engine,
+                async_session=async_session,
+                parsed_catalog_page=parsed_catalog_page,
+                concurrency=concurrency,
+            )
+        saved_count = 0
+        async for count in pipeline.stream_products(
+            engine=engine,
             async_session=async_session,
-            code=code,
-            page=page,
-            limit=limit,
-        ),
-    )
+            codes=pipeline.iterate(parsed_catalog_page.product_codes),
+            parsed_breadcrumb_catalogs=parsed_catalog_page.parsed_breadcrumb_catalogs,
+            concurrency=concurrency,
+            batch_size=batch_size or pipeline.BATCH_SIZE,
+        ):
+            saved_count += count
+        return saved_count
 
 
 async def upsert_parsed_catalog_products(
@@ -380,16 +614,79 @@ async def upsert_parsed_catalog_products(
 ) -> None:
     from ..products import service as product_service
 
-    catalogs = await upsert_parsed_breadcrumb_catalogs(
+    with metrics.stage("upsert"):
+        catalog_ids = await upsert_parsed_breadcrumb_catalogs(
+            async_session=async_session,
+            parsed_breadcrumb_catalogs=(
+                parsed_catalog_products.parsed_breadcrumb_catalogs
+            ),
+            commit=False,
+        )
+        for product in parsed_catalog_products.products:
+            product.catalog_id = catalog_ids[
+                parsed_catalog_products.product_catalog_map[product.code]
+            ]
+        await product_service.upsert_products_by_code(
+            async_session, parsed_catalog_products.products, commit=False
+        )
+    with metrics.stage("commit"):
+        await cache.commit(async_session)
+
+
+async def upsert_catalog_listing(
+    *,
+    engine: "Engine",
+    async_session: AsyncSession,
+    parsed_catalog_page: ParsedCatalogPage,
+    concurrency: int = 1,
+    on_error: Callable[[int, Exception], None] | None = None,
+) -> int:
+    """
+    Режим «только список»: продукты сохраняются из карточек страницы списка
+    в каталог из ее хлебных крошек, а страницы продуктов загружаются только
+    для новых и изменившихся (см. ``upsert_product_cards``). Обновление цен
+    неизменного каталога стоит одного запроса на страницу списка.
+
+    ``on_error`` работает как в ``parse_products_by_codes``. Возвращает
+    число продуктов страницы, сохраненных без ошибок.
+    """
+    from ..products import service as product_service
+
+    parsed_breadcrumb_catalogs = parsed_catalog_page.parsed_breadcrumb_catalogs
+    with metrics.stage("upsert"):
+        catalog_ids = await upsert_parsed_breadcrumb_catalogs(
+            async_session=async_session,
+            parsed_breadcrumb_catalogs=parsed_breadcrumb_catalogs,
+            commit=False,
+        )
+        detail_codes = await product_service.upsert_product_cards(
+            async_session,
+            parsed_catalog_page.product_cards,
+            catalog_id=catalog_ids[parsed_breadcrumb_catalogs.last_catalog_code],
+            commit=False,
+        )
+    with metrics.stage("commit"):
+        await cache.commit(async_session)
+
+    # Продукты без карточки (ее не удалось разобрать) загружаются целиком.
+    card_codes = {card.code for card in parsed_catalog_page.product_cards}
+    detail_codes += [
+        code for code in parsed_catalog_page.product_codes if code not in card_codes
+    ]
+    parsed_products = await product_service.parse_products_by_codes(
+        engine=engine,
         async_session=async_session,
-        parsed_breadcrumb_catalogs=parsed_catalog_products.parsed_breadcrumb_catalogs,
-        commit=False,
+        codes=detail_codes,
+        concurrency=concurrency,
+        on_error=on_error,
     )
-    for product in parsed_catalog_products.products:
-        product.catalog_id = catalogs[
-            parsed_catalog_products.product_catalog_map[product.code]
-        ].id
-        await product_service.upsert_product_by_code(
-            async_session, product, commit=False
+    if parsed_products:
+        await upsert_parsed_catalog_products(
+            async_session=async_session,
+            parsed_catalog_products=collect_parsed_catalog_products(
+                parsed_breadcrumb_catalogs, parsed_products
+            ),
         )
-    await async_session.commit()
+    return len(parsed_catalog_page.product_codes) - (
+        len(detail_codes) - len(parsed_products)
+    )
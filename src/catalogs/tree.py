@@ -0,0 +1,195 @@
+"""
+Накопитель дерева каталогов из хлебных крошек.
+
+При обходе каталога хлебные крошки каждой страницы продукта сливаются в
+одно дерево. ``ParsedBreadcrumbCatalogs.union`` на каждом шаге копирует
+обе карты, а ``in_order`` заново строит карты детей и входящих степеней,
+поэтому на большом обходе стоимость растет квадратично.
+
+``CatalogTree`` меняется на месте: слияние цепочки стоит O(длины цепочки),
+узлы компактны (``__slots__``), а повторно встреченный каталог с тем же
+названием хранится одним экземпляром ``CatalogCreate``. Топологический
+порядок кэшируется и, пока родители приходят раньше детей, дополняется без
+пересчета.
+"""
+
+import collections
+import logging
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, NamedTuple
+
+from . import schemas
+
+if TYPE_CHECKING:
+    from .service import ParsedBreadcrumbCatalogs
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogConflict(NamedTuple):
+    """Каталог встретился с другим родителем; побеждает последний."""
+
+    code: int
+    parent_code: int | None
+    new_parent_code: int | None
+
+
+class _CatalogNode:
+    __slots__ = ("catalog", "parent_code", "children")
+
+    def __init__(self, catalog: schemas.CatalogCreate, parent_code: int | None):
+        self.catalog = catalog
+        self.parent_code = parent_code
+        # Список детей создается только у внутренних узлов.
+        self.children: list[int] | None = None
+
+
+class CatalogTree:
+    def __init__(self):
+        self._nodes: dict[int, _CatalogNode] = {}
+        # Дети, пришедшие раньше своего родителя.
+        self._pending_children: dict[int, list[int]] = {}
+        self._order: list[schemas.CatalogCreate] | None = []
+        self._levels: list[list[schemas.CatalogCreate]] | None = None
+        self.conflicts: list[CatalogConflict] = []
+
+    @classmethod
+    def from_breadcrumbs(cls, *trails: "ParsedBreadcrumbCatalogs") -> "CatalogTree":
+        tree = cls()
+        for trail in trails:
+            tree.merge(trail)
+        return tree
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, code: int) -> bool:
+        return code in self._nodes
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._nodes)
+
+    def catalog(self, code: int) -> schemas.CatalogCreate:
+        return self._nodes[code].catalog
+
+    def parent_code(self, code: int) -> int | None:
+        return self._nodes[code].parent_code
+
+    def merge(self, trail: "ParsedBreadcrumbCatalogs") -> "CatalogTree":
+        """Сливает хлебные крошки в дерево на месте."""
+        for code, catalog in trail.catalog_map.items():
+            self.add(catalog, trail.catalog_parent_map.get(code))
+        return self
+
+    def add(self, catalog: schemas.CatalogCreate, parent_code: int | None) -> None:
+        code = catalog.code
+        node = self._nodes.get(code)
+        if node is None:
+            self._insert(catalog, parent_code)
+            return
+
+        if node.catalog is not catalog and node.catalog != catalog:
+            node.catalog = catalog
+            self._invalidate()
+        # Без родителя каталог приходит, когда цепочка крошек с него
+        # начинается: это не перенос, известный родитель остается.
+        if parent_code is not None and node.parent_code != parent_code:
+            if node.parent_code is not None:
+                self.conflicts.append(
+                    CatalogConflict(code, node.parent_code, parent_code)
+                )
+                logger.warning(
+                    "Catalog %s moved from parent %s to %s",
+                    code,
+                    node.parent_code,
+                    parent_code,
+                )
+            self._detach(code, node.parent_code)
+            node.parent_code = parent_code
+            self._attach(code, parent_code)
+            self._invalidate()
+
+    def in_order(self) -> list[schemas.CatalogCreate]:
+        """
+        Каталоги в топологическом порядке (родители перед детьми).
+        Каталог, чьего родителя нет в дереве, считается корнем.
+        """
+        if self._order is None:
+            self._order = self._sort()
+        return list(self._order)
+
+    def in_levels(self) -> list[list[schemas.CatalogCreate]]:
+        """Каталоги по уровням глубины, как ``ParsedBreadcrumbCatalogs.in_levels``."""
+        if self._levels is None:
+            levels: list[list[schemas.CatalogCreate]] = []
+            depths: dict[int, int] = {}
+            for catalog in self.in_order():
+                parent_code = self._nodes[catalog.code].parent_code
+                depth = depths[parent_code] + 1 if parent_code in depths else 0
+                depths[catalog.code] = depth
+                if depth == len(levels):
+                    levels.append([])
+                levels[depth].append(catalog)
+            self._levels = levels
+        return [list(level) for level in self._levels]
+
+    def _insert(self, catalog: schemas.CatalogCreate, parent_code: int | None) -> None:
+        code = catalog.code
+        node = _CatalogNode(catalog, parent_code)
+        node.children = self._pending_children.pop(code, None)
+        self._nodes[code] = node
+        self._attach(code, parent_code)
+        self._levels = None
+        if node.children is not None:
+            # Дети уже стоят в порядке раньше родителя.
+            self._order = None
+        elif self._order is not None:
+            self._order.append(catalog)
+
+    def _attach(self, code: int, parent_code: int | None) -> None:
+        if parent_code is None:
+            return
+        parent = self._nodes.get(parent_code)
+        if parent is None:
+            self._pending_children.setdefault(parent_code, []).append(code)
+        elif parent.children is None:
+            parent.children = [code]
+        else:
+            parent.children.append(code)
+
+    def _detach(self, code: int, parent_code: int | None) -> None:
+        if parent_code is None:
+            return
+        parent = self._nodes.get(parent_code)
+        children = (
+            parent.children
+            if parent is not None
+            else self._pending_children.get(parent_code)
+        )
+        if children is not None:
+            children.remove(code)
+
+    def _invalidate(self) -> None:
+        self._order = None
+        self._levels = None
+
+    def _sort(self) -> list[schemas.CatalogCreate]:
+        # Алгоритм Кана по спискам детей, которые уже хранятся в узлах.
+        in_degrees = {
+            code: int(node.parent_code in self._nodes)
+            for code, node in self._nodes.items()
+        }
+        queue = collections.deque(
+            code for code, degree in in_degrees.items() if degree == 0
+        )
+        order = []
+        while queue:
+            node = self._nodes[queue.popleft()]
+            order.append(node.catalog)
+            for child_code in node.children or ():
+                in_degrees[child_code] -= 1
+                if in_degrees[child_code] == 0:
+                    queue.append(child_code)
+        if len(order) != len(self._nodes):
+            raise ValueError("Обнаружен цикл в зависимостях каталогов.")
+        return order
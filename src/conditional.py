@@ -0,0 +1,77 @@
+"""
+Условные HTTP-запросы (RFC 9110): ``ETag`` / ``Last-Modified`` в ответах
+и ``304 Not Modified`` на ``If-None-Match`` / ``If-Modified-Since``.
+
+ETag строится из версии строк (отпечатка содержимого и т.п.), поэтому для
+ответа 304 не нужно сериализовать модель ответа.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """Слабый ETag по значениям, определяющим версию ресурса."""
+    digest = hashlib.sha256(
+        json.dumps(parts, default=str, separators=(",", ":")).encode()
+    ).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Для If-None-Match используется слабое сравнение: префикс W/ не важен.
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def check_not_modified(
+    request: Request,
+    response: Response,
+    *,
+    etag: str,
+    last_modified: datetime | None = None,
+) -> Response | None:
+    """
+    Проставляет валидаторы в ``response`` и возвращает готовый ответ 304,
+    если у клиента уже актуальная версия, иначе ``None``.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        last_modified = last_modified.astimezone(timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    else:
+        # If-Modified-Since учитывается, только если нет If-None-Match.
+        if_modified_since = request.headers.get("if-modified-since")
+        not_modified = (
+            if_modified_since is not None
+            and last_modified is not None
+            and _not_modified_since(if_modified_since, last_modified)
+        )
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
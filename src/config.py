@@ -5,6 +5,46 @@ class Settings(BaseSettings):
     mode: str
     postgres_dsn: str
 
+    parser_engine: str = "fallback"
+    flip_base_url: str = "https://www.flip.kz"
+    http_timeout: float = 15.0
+    selenium_extraction: str = "script"
+
+    browser_profile: str = "lean"
+    browser_blocked_resource_types: list[str] | None = None
+    browser_blocked_domains: list[str] | None = None
+
+    driver_pool_size: int = 2
+    driver_pool_warm_up: bool = True
+    driver_pool_max_pages: int = 200
+    driver_pool_lease_timeout: float = 120.0
+    driver_pool_health_check_interval: float = 60.0
+
+    job_workers: int = 2
+    job_poll_interval: float = 2.0
+    job_heartbeat_interval: float = 10.0
+    job_stale_after: float = 120.0
+    job_retry_backoff: float = 30.0
+
+    cache_local_max_size: int = 10_000
+    cache_local_ttl: float = 5.0
+    cache_redis_url: str | None = None
+    cache_shared_ttl: float = 60.0
+
+    fetch_cache_dir: str | None = None
+    fetch_cache_max_bytes: int = 512 * 1024 * 1024
+    fetch_cache_product_ttl: float = 600.0
+    fetch_cache_catalog_ttl: float = 120.0
+
+    snapshot_dir: str | None = None
+    snapshot_compression_level: int = 3
+
+    tracing_exporter: str | None = None
+    tracing_service_name: str = "flip-catalog-parser"
+    tracing_sample_ratio: float = 1.0
+    tracing_otlp_endpoint: str | None = None
+    tracing_file_path: str = "traces.jsonl"
+
     model_config = SettingsConfigDict()
 
 
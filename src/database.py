@@ -1,8 +1,10 @@
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from .config import settings
+from .metrics import service as metrics
 
 async_engine = create_async_engine(
     settings.postgres_dsn, echo=settings.mode == "development"
 )
 AsyncSession = async_sessionmaker(async_engine, expire_on_commit=True)
+metrics.instrument_engine(async_engine.sync_engine)
@@ -1,10 +1,16 @@
 from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
 
-import undetected_chromedriver
-from selenium.webdriver import Chrome
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from . import database
+from .drivers.async_driver import AsyncDriver
+from .parsing import fetch_cache
+
+if TYPE_CHECKING:
+    from .drivers.pool import DriverPool
+    from .parsing.engines import Engine
 
 
 async def get_async_session() -> AsyncIterator[AsyncSession]:
@@ -12,12 +18,20 @@ async def get_async_session() -> AsyncIterator[AsyncSession]:
         yield session
 
 
-async def get_driver() -> AsyncIterator[Chrome]:
-    options = undetected_chromedriver.ChromeOptions()
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    driver = undetected_chromedriver.Chrome(options)
-    try:
+def get_driver_pool(request: Request) -> "DriverPool":
+    return request.app.state.driver_pool
+
+
+async def get_driver(request: Request) -> AsyncIterator[AsyncDriver]:
+    async with get_driver_pool(request).lease() as driver:
         yield driver
-    finally:
-        driver.quit()
+
+
+def get_engine(request: Request) -> "Engine":
+    return request.app.state.engine
+
+
+async def bypass_fetch_cache(bypass_cache: bool = False) -> AsyncIterator[None]:
+    """Параметр ``bypass_cache`` эндпоинтов парсинга: загрузка мимо кэша страниц."""
+    with fetch_cache.bypass(bypass_cache):
+        yield
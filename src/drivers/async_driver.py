@@ -0,0 +1,76 @@
+import asyncio
+import contextvars
+import functools
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Concatenate, ParamSpec, TypeVar
+
+from selenium.webdriver import Chrome
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class AsyncDriver:
+    """
+    Асинхронный фасад над драйвером.
+
+    Selenium блокирует поток на каждом вызове, поэтому у каждого драйвера
+    есть собственный поток, и все обращения к нему выполняются там,
+    не занимая event loop. Вызов выполняется в копии контекста вызывающей
+    задачи, чтобы спаны трассировки внутри него попадали в ее трассу.
+    """
+
+    def __init__(self, driver: Chrome, executor: ThreadPoolExecutor):
+        self.driver = driver
+        self._executor = executor
+
+    @classmethod
+    async def start(cls, factory: Callable[[], Chrome]) -> "AsyncDriver":
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="driver")
+        try:
+            driver = await asyncio.get_running_loop().run_in_executor(executor, factory)
+        except BaseException:
+            executor.shutdown(wait=False)
+            raise
+        return cls(driver, executor)
+
+    @property
+    def pages(self) -> int:
+        return getattr(self.driver, "pages", 0)
+
+    async def run(
+        self,
+        function: Callable[Concatenate[Chrome, P], T],
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> T:
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            functools.partial(context.run, function, self.driver, *args, **kwargs),
+        )
+
+    async def get(self, url: str) -> None:
+        await self.run(lambda driver: driver.get(url))
+
+    async def is_alive(self) -> bool:
+        return await self.run(_is_alive)
+
+    async def quit(self) -> None:
+        try:
+            await self.run(_quit)
+        finally:
+            self._executor.shutdown(wait=False)
+
+
+def _is_alive(driver: Chrome) -> bool:
+    try:
+        driver.execute_script("return 1")
+    except Exception:
+        return False
+    return True
+
+
+def _quit(driver: Chrome) -> None:
+    driver.quit()
@@ -0,0 +1,6 @@
+from ..exceptions import ServiceUnavailableError
+
+
+class DriverPoolExhaustedError(ServiceUnavailableError):
+    def __init__(self, detail: str):
+        super().__init__(f"Driver pool exhausted: {detail}")
@@ -0,0 +1,232 @@
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+import undetected_chromedriver
+from selenium.webdriver import Chrome
+
+from . import schemas
+from .async_driver import AsyncDriver
+from .exceptions import DriverPoolExhaustedError
+from .profiles import PROFILES, BrowserProfile
+
+logger = logging.getLogger(__name__)
+
+
+class PooledChrome(undetected_chromedriver.Chrome):
+    """Chrome, который считает открытые страницы, чтобы пул знал, когда его пересоздать."""
+
+    pages = 0
+
+    def get(self, url: str) -> None:
+        self.pages += 1
+        return super().get(url)
+
+
+def create_driver(profile: BrowserProfile = PROFILES["full"]) -> Chrome:
+    options = undetected_chromedriver.ChromeOptions()
+    for argument in profile.arguments():
+        options.add_argument(argument)
+    options.page_load_strategy = profile.page_load_strategy
+    driver = PooledChrome(options, headless=profile.headless)
+    blocked_urls = profile.blocked_urls()
+    if blocked_urls:
+        # Блокировка действует до закрытия браузера, на все вкладки.
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_urls})
+    return driver
+
+
+async def _quit_driver(driver: AsyncDriver) -> None:
+    try:
+        await driver.quit()
+    except Exception:
+        logger.warning("Failed to quit driver", exc_info=True)
+
+
+@dataclass
+class _PoolEntry:
+    driver: AsyncDriver
+    last_used_at: float = field(default_factory=time.monotonic)
+
+
+class DriverPool:
+    """
+    Пул переиспользуемых браузеров.
+
+    Драйверы создаются заранее (warm-up) или лениво при первой аренде,
+    возвращаются в пул после запроса и пересоздаются после ``max_pages``
+    открытых страниц или если браузер перестал отвечать. ``close`` закрывает
+    все созданные драйверы, в том числе арендованные незавершенными
+    запросами.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Chrome] = create_driver,
+        *,
+        size: int,
+        max_pages: int,
+        lease_timeout: float,
+        health_check_interval: float,
+    ):
+        self.size = size
+        self.max_pages = max_pages
+        self.lease_timeout = lease_timeout
+        self.health_check_interval = health_check_interval
+        self._factory = factory
+        self._idle: asyncio.LifoQueue[_PoolEntry] = asyncio.LifoQueue()
+        self._slots = asyncio.Semaphore(size)
+        self._tasks: set[asyncio.Task] = set()
+        # Все живые драйверы пула: свободные и арендованные.
+        self._drivers: set[AsyncDriver] = set()
+        self._closed = False
+
+        self._in_use = 0
+        self._leases = 0
+        self._recycled = 0
+        self._crashed = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._busy_seconds = 0.0
+        self._started_at = time.monotonic()
+        self._busy_changed_at = self._started_at
+
+    async def warm_up(self) -> None:
+        results = await asyncio.gather(
+            *(self._start_driver() for _ in range(self.size - self._idle.qsize())),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error("Failed to warm up driver", exc_info=result)
+            else:
+                self._idle.put_nowait(_PoolEntry(result))
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        while not self._idle.empty():
+            entry = self._idle.get_nowait()
+            await self._quit(entry.driver)
+        # Драйверы запросов, не завершившихся к остановке: иначе процессы
+        # Chrome переживут приложение. Такой запрос получит ошибку драйвера.
+        for driver in list(self._drivers):
+            await self._quit(driver)
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[AsyncDriver]:
+        started_at = time.monotonic()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.lease_timeout)
+        except TimeoutError:
+            raise DriverPoolExhaustedError(
+                f"no driver became free in {self.lease_timeout} seconds"
+            )
+        self._record_wait(time.monotonic() - started_at)
+
+        try:
+            entry = await self._checkout()
+        except BaseException:
+            self._slots.release()
+            raise
+
+        self._change_busy(+1)
+        failed = False
+        try:
+            yield entry.driver
+        except Exception:
+            # Ошибки парсера оборачивают WebDriverException, поэтому после
+            # любой ошибки проверяем, жив ли браузер.
+            failed = True
+            raise
+        finally:
+            self._change_busy(-1)
+            await self._checkin(entry, failed)
+
+    def stats(self) -> schemas.DriverPoolStats:
+        now = time.monotonic()
+        busy_seconds = self._busy_seconds + self._in_use * (now - self._busy_changed_at)
+        capacity_seconds = self.size * (now - self._started_at)
+        return schemas.DriverPoolStats(
+            size=self.size,
+            idle=self._idle.qsize(),
+            in_use=self._in_use,
+            leases=self._leases,
+            recycled=self._recycled,
+            crashed=self._crashed,
+            wait_seconds_total=self._wait_seconds_total,
+            wait_seconds_max=self._wait_seconds_max,
+            wait_seconds_avg=(
+                self._wait_seconds_total / self._leases if self._leases else 0.0
+            ),
+            utilization=busy_seconds / capacity_seconds if capacity_seconds else 0.0,
+        )
+
+    async def _checkout(self) -> _PoolEntry:
+        while not self._idle.empty():
+            entry = self._idle.get_nowait()
+            if time.monotonic() - entry.last_used_at < self.health_check_interval:
+                return entry
+            if await entry.driver.is_alive():
+                return entry
+            self._crashed += 1
+            await self._quit(entry.driver)
+        return _PoolEntry(await self._start_driver())
+
+    async def _checkin(self, entry: _PoolEntry, failed: bool) -> None:
+        if self._closed:
+            await self._quit(entry.driver)
+            self._slots.release()
+            return
+        if failed and not await entry.driver.is_alive():
+            self._crashed += 1
+        elif entry.driver.pages < self.max_pages:
+            entry.last_used_at = time.monotonic()
+            self._idle.put_nowait(entry)
+            self._slots.release()
+            return
+        else:
+            self._recycled += 1
+
+        # Пересоздание занимает секунды, поэтому не задерживаем ответ:
+        # слот освобождается, когда новый драйвер уже в пуле.
+        task = asyncio.create_task(self._replace(entry))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _replace(self, entry: _PoolEntry) -> None:
+        try:
+            await self._quit(entry.driver)
+            if not self._closed:
+                self._idle.put_nowait(_PoolEntry(await self._start_driver()))
+        except Exception:
+            logger.exception("Failed to replace driver")
+        finally:
+            self._slots.release()
+
+    async def _start_driver(self) -> AsyncDriver:
+        driver = await AsyncDriver.start(self._factory)
+        self._drivers.add(driver)
+        return driver
+
+    async def _quit(self, driver: AsyncDriver) -> None:
+        # Драйвер, уже закрытый в close, повторно не закрываем.
+        if driver in self._drivers:
+            self._drivers.discard(driver)
+            await _quit_driver(driver)
+
+    def _record_wait(self, seconds: float) -> None:
+        self._leases += 1
+        self._wait_seconds_total += seconds
+        self._wait_seconds_max = max(self._wait_seconds_max, seconds)
+
+    def _change_busy(self, delta: int) -> None:
+        now = time.monotonic()
+        self._busy_seconds += self._in_use * (now - self._busy_changed_at)
+        self._busy_changed_at = now
+        self._in_use += delta
@@ -0,0 +1,113 @@
+"""
+Профили запуска Chrome.
+
+Парсерам нужен только DOM, поэтому профиль ``lean`` не загружает
+изображения, шрифты, стили и медиа, блокирует счетчики и рекламу, ждет
+только ``DOMContentLoaded`` (``pageLoadStrategy=eager``) и запускает браузер
+без окна, GPU и расширений. ``full`` - обычный браузер, как у пользователя.
+
+Блокировка идет через CDP ``Network.setBlockedURLs``: команда принимает
+шаблоны URL, поэтому типы ресурсов задаются расширениями файлов.
+"""
+
+from dataclasses import dataclass, replace
+
+# Шаблоны URL для типов ресурсов, которые можно не загружать.
+RESOURCE_TYPE_PATTERNS: dict[str, tuple[str, ...]] = {
+    "image": (
+        "*.jpg*",
+        "*.jpeg*",
+        "*.png*",
+        "*.gif*",
+        "*.webp*",
+        "*.svg*",
+        "*.ico*",
+    ),
+    "font": ("*.woff*", "*.ttf*", "*.otf*", "*.eot*"),
+    "stylesheet": ("*.css*",),
+    "media": ("*.mp4*", "*.webm*", "*.mp3*", "*.ogg*"),
+}
+
+# Счетчики и реклама на страницах flip.kz.
+TRACKER_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "mc.yandex.ru",
+    "top-fwz1.mail.ru",
+    "connect.facebook.net",
+)
+
+
+@dataclass(frozen=True)
+class BrowserProfile:
+    name: str
+    headless: bool = False
+    page_load_strategy: str = "normal"
+    disable_gpu: bool = False
+    disable_extensions: bool = False
+    blocked_resource_types: tuple[str, ...] = ()
+    blocked_domains: tuple[str, ...] = ()
+
+    def arguments(self) -> list[str]:
+        arguments = ["--no-sandbox", "--disable-dev-shm-usage"]
+        if self.disable_gpu:
+            arguments.append("--disable-gpu")
+        if self.disable_extensions:
+            arguments.append("--disable-extensions")
+        return arguments
+
+    def blocked_urls(self) -> list[str]:
+        """Шаблоны для ``Network.setBlockedURLs``."""
+        patterns = []
+        for resource_type in self.blocked_resource_types:
+            try:
+                patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+            except KeyError:
+                raise ValueError(
+                    f"Unknown resource type: {resource_type}, "
+                    f"expected one of: {', '.join(RESOURCE_TYPE_PATTERNS)}"
+                )
+        patterns.extend(f"*{domain}*" for domain in self.blocked_domains)
+        return patterns
+
+
+PROFILES: dict[str, BrowserProfile] = {
+    "full": BrowserProfile("full"),
+    "lean": BrowserProfile(
+        "lean",
+        headless=True,
+        page_load_strategy="eager",
+        disable_gpu=True,
+        disable_extensions=True,
+        blocked_resource_types=tuple(RESOURCE_TYPE_PATTERNS),
+        blocked_domains=TRACKER_DOMAINS,
+    ),
+}
+
+
+def get_profile(
+    name: str,
+    *,
+    blocked_resource_types: list[str] | None = None,
+    blocked_domains: list[str] | None = None,
+) -> BrowserProfile:
+    """Профиль по имени; списки блокировки, если заданы, заменяют профильные."""
+    try:
+        profile = PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown browser profile: {name}, "
+            f"expected one of: {', '.join(PROFILES)}"
+        )
+    overrides = {}
+    if blocked_resource_types is not None:
+        overrides["blocked_resource_types"] = tuple(blocked_resource_types)
+    if blocked_domains is not None:
+        overrides["blocked_domains"] = tuple(blocked_domains)
+    if not overrides:
+        return profile
+    profile = replace(profile, **overrides)
+    # Неизвестный тип ресурса - ошибка настройки, ее видно при старте.
+    profile.blocked_urls()
+    return profile
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends
+
+from ..dependencies import get_driver_pool
+from .pool import DriverPool
+from . import schemas
+
+_router = APIRouter(prefix="/drivers")
+instance = _router
+
+
+@_router.get("/stats", response_model=schemas.DriverPoolStats)
+async def read_driver_pool_stats(driver_pool: DriverPool = Depends(get_driver_pool)):
+    return driver_pool.stats()
@@ -0,0 +1,14 @@
+from ..schemas import BaseSchema
+
+
+class DriverPoolStats(BaseSchema):
+    size: int
+    idle: int
+    in_use: int
+    leases: int
+    recycled: int
+    crashed: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    wait_seconds_avg: float
+    utilization: float
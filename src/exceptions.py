@@ -20,3 +20,8 @@ class ConflictError(AppBaseException):
 class BadRequestError(AppBaseException):
     def __init__(self, detail: str = "Bad request"):
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+class ServiceUnavailableError(AppBaseException):
+    def __init__(self, detail: str = "Service unavailable"):
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail)
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..dependencies import get_async_session
+from . import schemas, service
+
+_router = APIRouter(prefix="/jobs")
+instance = _router
+
+
+@_router.post("/", response_model=schemas.Job, status_code=202)
+async def create_job(
+    job_in: schemas.JobCreate,
+    async_session: AsyncSession = Depends(get_async_session),
+):
+    return await service.create_job(async_session=async_session, job_in=job_in)
+
+
+@_router.get("/", response_model=list[schemas.Job])
+async def read_jobs(
+    skip: int = 0,
+    limit: int = 100,
+    async_session: AsyncSession = Depends(get_async_session),
+):
+    return await service.get_all_jobs(async_session, skip=skip, limit=limit)
+
+
+@_router.get("/{job_id}", response_model=schemas.Job)
+async def read_job(
+    job_id: int,
+    async_session: AsyncSession = Depends(get_async_session),
+):
+    return await service.get_job_by_id(async_session, id=job_id)
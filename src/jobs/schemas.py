@@ -0,0 +1,108 @@
+from datetime import datetime
+from enum import StrEnum
+from typing import Annotated, Any, Literal
+
+from pydantic import ConfigDict, Field
+
+from ..catalogs.schemas import ParseMode
+from ..schemas import BaseSchema
+
+
+class JobStatus(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class CatalogProductsJobParams(BaseSchema):
+    code: int
+    page: int = 1
+    limit: int = 10
+    concurrency: int = 1
+    mode: ParseMode = "full"
+    batch_size: int = 50
+
+
+class CrawlJobParams(BaseSchema):
+    code: int
+    max_depth: int = 1
+    max_pages: int = 100
+    concurrency: int = 1
+    request_interval: float = 1.0
+    mode: ParseMode = "full"
+    batch_size: int = 50
+
+
+class ProductJobParams(BaseSchema):
+    code: int
+
+
+class ReparseSnapshotsJobParams(BaseSchema):
+    limit: int | None = None
+    batch_size: int = 500
+
+
+class StaleProductsJobParams(BaseSchema):
+    older_than_hours: float = 24
+    limit: int = 100
+    concurrency: int = 1
+    request_interval: float = 1.0
+
+
+class CatalogProductsJobCreate(BaseSchema):
+    kind: Literal["catalog_products"]
+    params: CatalogProductsJobParams
+
+
+class CrawlJobCreate(BaseSchema):
+    kind: Literal["crawl"]
+    params: CrawlJobParams
+
+
+class ProductJobCreate(BaseSchema):
+    kind: Literal["product"]
+    params: ProductJobParams
+
+
+class ReparseSnapshotsJobCreate(BaseSchema):
+    kind: Literal["reparse_snapshots"]
+    params: ReparseSnapshotsJobParams = ReparseSnapshotsJobParams()
+
+
+class StaleProductsJobCreate(BaseSchema):
+    kind: Literal["stale_products"]
+    params: StaleProductsJobParams
+
+
+JobCreate = Annotated[
+    CatalogProductsJobCreate
+    | CrawlJobCreate
+    | ProductJobCreate
+    | ReparseSnapshotsJobCreate
+    | StaleProductsJobCreate,
+    Field(discriminator="kind"),
+]
+
+
+class JobError(BaseSchema):
+    code: int | None = None
+    detail: str
+
+
+class Job(BaseSchema):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    kind: str
+    params: dict[str, Any]
+    status: JobStatus
+    total: int | None
+    processed: int
+    succeeded: int
+    failed: int
+    errors: list[JobError]
+    attempts: int
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
@@ -0,0 +1,148 @@
+from datetime import timedelta
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.exceptions import NotFoundError
+
+from . import models, schemas
+
+MAX_STORED_ERRORS = 100
+
+
+class JobProgress:
+    """Счетчики выполняемой задачи; периодически сохраняются в строку задачи."""
+
+    def __init__(self):
+        self.total: int | None = None
+        self.processed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.errors: list[schemas.JobError] = []
+
+    def succeed(self, count: int = 1) -> None:
+        self.processed += count
+        self.succeeded += count
+
+    def fail(self, code: int | None, exception: BaseException) -> None:
+        self.processed += 1
+        self.failed += 1
+        if len(self.errors) < MAX_STORED_ERRORS:
+            detail = getattr(exception, "detail", None) or repr(exception)
+            self.errors.append(schemas.JobError(code=code, detail=detail))
+
+
+async def create_job(async_session: AsyncSession, job_in: schemas.JobCreate):
+    db_job = models.Job(
+        kind=job_in.kind,
+        params=job_in.params.model_dump(),
+        status=schemas.JobStatus.QUEUED,
+    )
+    async_session.add(db_job)
+    await async_session.commit()
+    await async_session.refresh(db_job)
+    return db_job
+
+
+async def get_job_by_id(async_session: AsyncSession, id: int):
+    result = await async_session.execute(select(models.Job).where(models.Job.id == id))
+    job = result.scalars().first()
+    if job is None:
+        raise NotFoundError(f"Job with id {id} - not found")
+    return job
+
+
+async def get_all_jobs(async_session: AsyncSession, skip: int = 0, limit: int = 100):
+    result = await async_session.execute(
+        select(models.Job).order_by(models.Job.id.desc()).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
+
+
+async def claim_job(async_session: AsyncSession, *, stale_after: float):
+    """
+    Забирает следующую задачу из очереди.
+
+    Подходят задачи в очереди, у которых наступил ``run_after``, и зависшие
+    задачи, чей воркер перестал обновлять ``heartbeat_at`` (например, реплика
+    упала). ``FOR UPDATE SKIP LOCKED`` позволяет нескольким репликам
+    забирать задачи без конфликтов.
+    """
+    while True:
+        result = await async_session.execute(
+            select(models.Job)
+            .where(
+                or_(
+                    and_(
+                        models.Job.status == schemas.JobStatus.QUEUED,
+                        or_(
+                            models.Job.run_after.is_(None),
+                            models.Job.run_after <= func.now(),
+                        ),
+                    ),
+                    and_(
+                        models.Job.status == schemas.JobStatus.RUNNING,
+                        models.Job.heartbeat_at
+                        < func.now() - timedelta(seconds=stale_after),
+                    ),
+                )
+            )
+            .order_by(models.Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        db_job = result.scalars().first()
+        if db_job is None:
+            await async_session.commit()
+            return None
+
+        if db_job.attempts >= db_job.max_attempts:
+            db_job.status = schemas.JobStatus.FAILED
+            db_job.finished_at = func.now()
+            await async_session.commit()
+            continue
+
+        db_job.status = schemas.JobStatus.RUNNING
+        db_job.attempts += 1
+        db_job.started_at = func.now()
+        db_job.heartbeat_at = func.now()
+        db_job.finished_at = None
+        await async_session.commit()
+        await async_session.refresh(db_job)
+        return db_job
+
+
+async def save_job_progress(
+    async_session: AsyncSession,
+    id: int,
+    progress: JobProgress,
+    *,
+    status: schemas.JobStatus | None = None,
+    retry_after: float | None = None,
+    count_attempt: bool = True,
+) -> None:
+    """
+    Сохраняет счетчики и обновляет ``heartbeat_at``. ``retry_after`` -
+    через сколько секунд задачу можно забрать снова; без ``count_attempt``
+    текущая попытка не засчитывается.
+    """
+    values = dict(
+        total=progress.total,
+        processed=progress.processed,
+        succeeded=progress.succeeded,
+        failed=progress.failed,
+        errors=[error.model_dump() for error in progress.errors],
+        heartbeat_at=func.now(),
+    )
+    if status is not None:
+        values["status"] = status
+        if status in (schemas.JobStatus.SUCCEEDED, schemas.JobStatus.FAILED):
+            values["finished_at"] = func.now()
+    if retry_after is not None:
+        values["run_after"] = func.now() + timedelta(seconds=retry_after)
+    if not count_attempt:
+        values["attempts"] = models.Job.attempts - 1
+    await async_session.execute(
+        update(models.Job).where(models.Job.id == id).values(**values)
+    )
+    await async_session.commit()
@@ -0,0 +1,290 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from .. import database, tracing
+from ..catalogs import crawler, pipeline
+from ..catalogs import service as catalog_service
+from ..metrics import service as metrics
+from ..parsing.engines import Engine, RateLimitedEngine, SnapshotEngine
+from ..products import service as product_service
+from ..snapshots.service import SnapshotStore
+from . import schemas, service
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JobContext:
+    engine: Engine
+    progress: service.JobProgress
+    snapshots: SnapshotStore | None = None
+
+
+async def run_product_job(context: JobContext, params: dict[str, Any]) -> None:
+    job_params = schemas.ProductJobParams.model_validate(params)
+    context.progress.total = 1
+    parsed_product = await context.engine.parse_product(job_params.code)
+    async with database.AsyncSession() as async_session:
+        await product_service.upsert_parsed_product(
+            async_session=async_session, parsed_product=parsed_product
+        )
+    context.progress.succeed()
+
+
+async def run_catalog_products_job(context: JobContext, params: dict[str, Any]) -> None:
+    job_params = schemas.CatalogProductsJobParams.model_validate(params)
+    progress = context.progress
+    parsed_catalog_page = await context.engine.parse_catalog_page(
+        job_params.code, job_params.page, job_params.limit
+    )
+    progress.total = len(parsed_catalog_page.product_codes)
+
+    if job_params.mode == "listing":
+        async with database.AsyncSession() as async_session:
+            progress.succeed(
+                await catalog_service.upsert_catalog_listing(
+                    engine=context.engine,
+                    async_session=async_session,
+                    parsed_catalog_page=parsed_catalog_page,
+                    concurrency=job_params.concurrency,
+                    on_error=progress.fail,
+                )
+            )
+        return
+
+    # В отличие от синхронного эндпоинта, ошибка одного продукта
+    # не отменяет всю задачу: она попадает в errors, остальные сохраняются.
+    async with database.AsyncSession() as async_session:
+        async for count in pipeline.stream_products(
+            engine=context.engine,
+            async_session=async_session,
+            codes=pipeline.iterate(parsed_catalog_page.product_codes),
+            parsed_breadcrumb_catalogs=parsed_catalog_page.parsed_breadcrumb_catalogs,
+            concurrency=job_params.concurrency,
+            batch_size=job_params.batch_size,
+            on_error=progress.fail,
+        ):
+            progress.succeed(count)
+
+
+async def run_crawl_job(context: JobContext, params: dict[str, Any]) -> None:
+    job_params = schemas.CrawlJobParams.model_validate(params)
+    engine = context.engine
+    if job_params.request_interval > 0:
+        engine = RateLimitedEngine(engine, interval=job_params.request_interval)
+    async with database.AsyncSession() as async_session:
+        await crawler.crawl_catalog(
+            engine=engine,
+            async_session=async_session,
+            code=job_params.code,
+            max_depth=job_params.max_depth,
+            max_pages=job_params.max_pages,
+            concurrency=job_params.concurrency,
+            progress=context.progress,
+            mode=job_params.mode,
+            batch_size=job_params.batch_size,
+        )
+
+
+async def run_stale_products_job(context: JobContext, params: dict[str, Any]) -> None:
+    job_params = schemas.StaleProductsJobParams.model_validate(params)
+    progress = context.progress
+    engine = context.engine
+    if job_params.request_interval > 0:
+        engine = RateLimitedEngine(engine, interval=job_params.request_interval)
+    async with database.AsyncSession() as async_session:
+        stale_products = await product_service.get_stale_products(
+            async_session,
+            older_than=timedelta(hours=job_params.older_than_hours),
+            limit=job_params.limit,
+        )
+        progress.total = len(stale_products)
+
+        parsed_products = await product_service.parse_products_by_codes(
+            engine=engine,
+            async_session=None,
+            codes=[product.code for product in stale_products],
+            concurrency=job_params.concurrency,
+            on_error=progress.fail,
+        )
+        # Неизменившиеся продукты только отметят last_seen_at.
+        await catalog_service.upsert_parsed_catalog_products(
+            async_session=async_session,
+            parsed_catalog_products=catalog_service.collect_parsed_catalog_products(
+                catalog_service.ParsedBreadcrumbCatalogs({}, {}, None),
+                parsed_products,
+            ),
+        )
+    progress.succeed(len(parsed_products))
+
+
+async def run_reparse_snapshots_job(
+    context: JobContext, params: dict[str, Any]
+) -> None:
+    job_params = schemas.ReparseSnapshotsJobParams.model_validate(params)
+    progress = context.progress
+    if context.snapshots is None:
+        raise RuntimeError("Page snapshots are disabled, set SNAPSHOT_DIR")
+    engine = SnapshotEngine(context.snapshots)
+
+    codes = []
+    async for snapshot in context.snapshots.iter_latest():
+        code = parse_qs(urlparse(snapshot.url).query).get("prod")
+        if code is not None:
+            codes.append(int(code[0]))
+    codes = codes[: job_params.limit]
+    progress.total = len(codes)
+
+    # Страницы разбираются без сети, поэтому продукты сохраняются пачками,
+    # а не по одному.
+    async with database.AsyncSession() as async_session:
+        for start in range(0, len(codes), job_params.batch_size):
+            parsed_products = await product_service.parse_products_by_codes(
+                engine=engine,
+                async_session=None,
+                codes=codes[start : start + job_params.batch_size],
+                on_error=progress.fail,
+            )
+            await catalog_service.upsert_parsed_catalog_products(
+                async_session=async_session,
+                parsed_catalog_products=catalog_service.collect_parsed_catalog_products(
+                    catalog_service.ParsedBreadcrumbCatalogs({}, {}, None),
+                    parsed_products,
+                ),
+            )
+            progress.succeed(len(parsed_products))
+
+
+HANDLERS: dict[str, Callable[[JobContext, dict[str, Any]], Awaitable[None]]] = {
+    "catalog_products": run_catalog_products_job,
+    "crawl": run_crawl_job,
+    "product": run_product_job,
+    "reparse_snapshots": run_reparse_snapshots_job,
+    "stale_products": run_stale_products_job,
+}
+
+
+class JobWorkers:
+    """Ограниченный набор воркеров, забирающих задачи из таблицы ``jobs``."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        snapshots: SnapshotStore | None = None,
+        size: int,
+        poll_interval: float,
+        heartbeat_interval: float,
+        stale_after: float,
+        retry_backoff: float = 30.0,
+    ):
+        self.engine = engine
+        self.snapshots = snapshots
+        self.size = size
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.retry_backoff = retry_backoff
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._run_worker(), name=f"job-worker-{number}")
+            for number in range(self.size)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run_worker(self) -> None:
+        while True:
+            try:
+                async with database.AsyncSession() as async_session:
+                    job = await service.claim_job(
+                        async_session, stale_after=self.stale_after
+                    )
+            except Exception:
+                logger.exception("Failed to claim job")
+                job = None
+            if job is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+            await self._run_job(job)
+
+    async def _run_job(self, job) -> None:
+        progress = service.JobProgress()
+        heartbeat = asyncio.create_task(self._heartbeat(job.id, progress))
+        status = schemas.JobStatus.SUCCEEDED
+        retry_after = None
+        count_attempt = True
+        try:
+            with tracing.span(
+                f"job {job.kind}", job_id=job.id, attempt=job.attempts
+            ):
+                await HANDLERS[job.kind](
+                    JobContext(self.engine, progress, self.snapshots), job.params
+                )
+        except asyncio.CancelledError:
+            # Приложение останавливается: возвращаем задачу в очередь,
+            # чтобы ее подхватил другой воркер или следующий запуск. Задача
+            # не виновата в остановке, поэтому попытка не засчитывается.
+            status = schemas.JobStatus.QUEUED
+            count_attempt = False
+            raise
+        except Exception as exception:
+            logger.exception("Job %s failed", job.id)
+            progress.fail(None, exception)
+            if job.attempts < job.max_attempts:
+                status = schemas.JobStatus.QUEUED
+                # Экспоненциальная пауза, чтобы упавшая задача не забиралась
+                # снова в плотном цикле.
+                retry_after = self.retry_backoff * 2 ** (job.attempts - 1)
+                metrics.RETRIES.labels("job").inc()
+            else:
+                status = schemas.JobStatus.FAILED
+        finally:
+            heartbeat.cancel()
+            await asyncio.shield(
+                self._save(
+                    job.id,
+                    progress,
+                    status,
+                    retry_after=retry_after,
+                    count_attempt=count_attempt,
+                )
+            )
+
+    async def _heartbeat(self, id: int, progress: service.JobProgress) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self._save(id, progress)
+            except Exception:
+                logger.exception("Failed to save progress of job %s", id)
+
+    async def _save(
+        self,
+        id: int,
+        progress: service.JobProgress,
+        status: schemas.JobStatus | None = None,
+        *,
+        retry_after: float | None = None,
+        count_attempt: bool = True,
+    ) -> None:
+        async with database.AsyncSession() as async_session:
+            await service.save_job_progress(
+                async_session,
+                id,
+                progress,
+                status=status,
+                retry_after=retry_after,
+                count_attempt=count_attempt,
+            )
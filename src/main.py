@@ -1,11 +1,129 @@
+from contextlib import asynccontextmanager
+from functools import partial
+
+import httpx
 from fastapi import APIRouter, FastAPI, Request
 from fastapi.responses import JSONResponse
 
+import src.cache.router
 import src.catalogs.router
+import src.drivers.router
 import src.exceptions
+import src.jobs.router
+import src.metrics.router
 import src.products.router
+from src import database, tracing
+from src.cache.service import RedisBackend, cache
+from src.config import settings
+from src.drivers.pool import DriverPool, create_driver
+from src.drivers.profiles import get_profile
+from src.jobs.worker import JobWorkers
+from src.metrics import service as metrics
+from src.parsing.engines import create_engine
+from src.parsing.fetch_cache import FetchCache
+from src.snapshots.service import DirectoryBackend, SnapshotStore
+
+HTTP_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "ru-RU,ru;q=0.9",
+}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tracing.configure(
+        app,
+        database.async_engine.sync_engine,
+        exporter=settings.tracing_exporter,
+        service_name=settings.tracing_service_name,
+        sample_ratio=settings.tracing_sample_ratio,
+        otlp_endpoint=settings.tracing_otlp_endpoint,
+        file_path=settings.tracing_file_path,
+    )
+    browser_profile = get_profile(
+        settings.browser_profile,
+        blocked_resource_types=settings.browser_blocked_resource_types,
+        blocked_domains=settings.browser_blocked_domains,
+    )
+    driver_pool = DriverPool(
+        partial(create_driver, browser_profile),
+        size=settings.driver_pool_size,
+        max_pages=settings.driver_pool_max_pages,
+        lease_timeout=settings.driver_pool_lease_timeout,
+        health_check_interval=settings.driver_pool_health_check_interval,
+    )
+    http_client = httpx.AsyncClient(
+        headers=HTTP_HEADERS, timeout=settings.http_timeout, follow_redirects=True
+    )
+    cache.configure(
+        local_max_size=settings.cache_local_max_size,
+        local_ttl=settings.cache_local_ttl,
+        shared=(
+            RedisBackend.from_url(settings.cache_redis_url)
+            if settings.cache_redis_url
+            else None
+        ),
+        shared_ttl=settings.cache_shared_ttl,
+    )
+    snapshots = (
+        SnapshotStore(
+            DirectoryBackend(settings.snapshot_dir),
+            compression_level=settings.snapshot_compression_level,
+        )
+        if settings.snapshot_dir
+        else None
+    )
+    if settings.driver_pool_warm_up and settings.parser_engine in (
+        "selenium",
+        "fallback",
+    ):
+        await driver_pool.warm_up()
+    app.state.driver_pool = driver_pool
+    app.state.http_client = http_client
+    app.state.engine = create_engine(
+        settings.parser_engine,
+        http_client=http_client,
+        driver_pool=driver_pool,
+        base_url=settings.flip_base_url,
+        snapshots=snapshots,
+        selenium_extraction=settings.selenium_extraction,
+        cache=(
+            FetchCache(
+                settings.fetch_cache_dir,
+                max_bytes=settings.fetch_cache_max_bytes,
+                product_ttl=settings.fetch_cache_product_ttl,
+                catalog_ttl=settings.fetch_cache_catalog_ttl,
+            )
+            if settings.fetch_cache_dir
+            else None
+        ),
+    )
+    job_workers = JobWorkers(
+        app.state.engine,
+        snapshots=snapshots,
+        size=settings.job_workers,
+        poll_interval=settings.job_poll_interval,
+        heartbeat_interval=settings.job_heartbeat_interval,
+        stale_after=settings.job_stale_after,
+        retry_backoff=settings.job_retry_backoff,
+    )
+    job_workers.start()
+    try:
+        with metrics.registered_driver_pool(driver_pool):
+            yield
+    finally:
+        await job_workers.stop()
+        await http_client.aclose()
+        await driver_pool.close()
+        await cache.close()
+        tracing.shutdown()
+
 
-app = FastAPI(title="Flip Catalog Parser")
+app = FastAPI(title="Flip Catalog Parser", lifespan=lifespan)
+app.add_middleware(metrics.MetricsMiddleware)
 
 
 @app.exception_handler(src.exceptions.AppBaseException)
@@ -16,6 +134,10 @@ async def app_exception_handler(request: Request, exception: src.exceptions.AppB
     )
 
 api = APIRouter(prefix="/api")
+api.include_router(src.cache.router.instance)
 api.include_router(src.catalogs.router.instance)
+api.include_router(src.drivers.router.instance)
+api.include_router(src.jobs.router.instance)
 api.include_router(src.products.router.instance)
 app.include_router(api)
+app.include_router(src.metrics.router.instance)
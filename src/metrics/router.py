@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+_router = APIRouter()
+instance = _router
+
+
+@_router.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,222 @@
+"""
+Метрики Prometheus.
+
+Этапы конвейера парсинга (``fetch``, ``wait``, ``extract``, ``breadcrumb``,
+``upsert``, ``commit``) замеряются гистограммой ``flip_stage_duration_seconds``
+с меткой движка; для этапов базы метка движка пустая. Этапы и загрузки
+страниц заодно становятся спанами трассировки, если она включена. Запросы SQLAlchemy
+считаются событиями движка и, если выполняются внутри HTTP-запроса,
+суммируются по маршруту в ``MetricsMiddleware``. Состояние пула браузеров
+читается из ``DriverPool.stats()`` в момент сбора.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy import Engine, event
+
+from .. import tracing
+
+if TYPE_CHECKING:
+    from ..drivers.pool import DriverPool
+
+STAGE_DURATION = Histogram(
+    "flip_stage_duration_seconds",
+    "Duration of scrape pipeline stages",
+    ["stage", "engine"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+PAGES = Counter(
+    "flip_pages_total", "Pages loaded and parsed successfully", ["kind", "engine"]
+)
+ERRORS = Counter(
+    "flip_errors_total", "Pages that failed to load or parse", ["kind", "engine"]
+)
+RETRIES = Counter(
+    "flip_retries_total",
+    "Retries: fallback to another engine or a failed job put back in the queue",
+    ["reason"],
+)
+FETCH_CACHE = Counter(
+    "flip_fetch_cache_total",
+    "HTTP fetches by cache outcome: hit, revalidated (304) or miss",
+    ["result"],
+)
+PRODUCTS = Counter(
+    "flip_products_total",
+    "Upserted products by outcome: written (new or changed) or unchanged",
+    ["outcome"],
+)
+
+QUERY_DURATION = Histogram(
+    "flip_db_query_duration_seconds",
+    "Duration of SQL statements",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1, 5),
+)
+REQUEST_QUERIES = Histogram(
+    "flip_db_queries_per_request",
+    "Number of SQL statements per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+REQUEST_QUERY_SECONDS = Histogram(
+    "flip_db_query_seconds_per_request",
+    "Total SQL time per HTTP request",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 10),
+)
+REQUEST_DURATION = Histogram(
+    "flip_http_request_duration_seconds",
+    "Duration of HTTP requests",
+    ["method", "route", "status"],
+)
+
+
+@contextmanager
+def stage(name: str, engine: str = "") -> Iterator[None]:
+    """Замер этапа конвейера: ``with metrics.stage("fetch", "http"): ...``."""
+    with (
+        tracing.span(f"stage {name}", engine=engine or None),
+        STAGE_DURATION.labels(name, engine).time(),
+    ):
+        yield
+
+
+@contextmanager
+def page(kind: str, engine: str, url: str) -> Iterator[None]:
+    """Считает загрузку страницы ``product`` или ``catalog`` успешной или ошибкой."""
+    with tracing.span(f"page {kind}", engine=engine, url=url):
+        try:
+            yield
+        except Exception:
+            ERRORS.labels(kind, engine).inc()
+            raise
+        PAGES.labels(kind, engine).inc()
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+
+
+_request_queries: ContextVar[QueryStats | None] = ContextVar(
+    "request_queries", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Время начала живет в контексте выполнения, а не в соединении из пула:
+    # у упавшего запроса after_cursor_execute не вызывается, и запись в
+    # conn.info так и осталась бы в соединении.
+    context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - context._query_started_at
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+    QUERY_DURATION.labels(operation).observe(seconds)
+    # Асинхронный движок выполняет запрос в greenlet с контекстом задачи,
+    # поэтому счетчики текущего HTTP-запроса здесь доступны.
+    request_queries = _request_queries.get()
+    if request_queries is not None:
+        request_queries.count += 1
+        request_queries.seconds += seconds
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Подписывает движок на замер запросов; для async - ``engine.sync_engine``."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _route_path(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware: длительность HTTP-запросов и число и время SQL-запросов
+    в каждом из них. Замер заканчивается после отправки всего тела, поэтому
+    потоковые ответы учитываются целиком.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        request_queries = QueryStats()
+        token = _request_queries.set(request_queries)
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_queries.reset(token)
+            route = _route_path(scope)
+            REQUEST_DURATION.labels(scope["method"], route, str(status_code)).observe(
+                time.perf_counter() - started_at
+            )
+            REQUEST_QUERIES.labels(route).observe(request_queries.count)
+            REQUEST_QUERY_SECONDS.labels(route).observe(request_queries.seconds)
+
+
+class DriverPoolCollector(Collector):
+    """Показатели пула браузеров, снятые с ``DriverPool.stats()`` при сборе."""
+
+    def __init__(self, driver_pool: "DriverPool"):
+        self.driver_pool = driver_pool
+
+    def collect(self):
+        stats = self.driver_pool.stats()
+        for name, documentation, value in (
+            ("size", "Configured number of drivers", stats.size),
+            ("idle", "Drivers waiting in the pool", stats.idle),
+            ("in_use", "Leased drivers", stats.in_use),
+            ("utilization", "Share of pool capacity spent leased", stats.utilization),
+            ("wait_seconds_max", "Longest lease wait", stats.wait_seconds_max),
+        ):
+            yield GaugeMetricFamily(
+                f"flip_driver_pool_{name}", documentation, value=value
+            )
+        for name, documentation, value in (
+            ("leases", "Driver leases", stats.leases),
+            ("recycled", "Drivers recreated after max_pages", stats.recycled),
+            ("crashed", "Drivers found dead and replaced", stats.crashed),
+            ("wait_seconds", "Time spent waiting for leases", stats.wait_seconds_total),
+        ):
+            yield CounterMetricFamily(
+                f"flip_driver_pool_{name}", documentation, value=value
+            )
+
+
+@contextmanager
+def registered_driver_pool(driver_pool: "DriverPool") -> Iterator[None]:
+    """Публикует показатели пула, пока открыт контекст (на время lifespan)."""
+    collector = DriverPoolCollector(driver_pool)
+    REGISTRY.register(collector)
+    try:
+        yield
+    finally:
+        REGISTRY.unregister(collector)
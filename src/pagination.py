@@ -0,0 +1,103 @@
+"""
+Keyset-пагинация списков.
+
+Вместо ``OFFSET`` следующая страница начинается строго после последней
+строки предыдущей: ``WHERE (price, id) > (:price, :id) ORDER BY price, id``.
+Такой запрос идет по индексу и не замедляется по мере удаления от начала
+таблицы. Позиция передается клиенту непрозрачным курсором.
+"""
+
+import base64
+import json
+from typing import Any
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from .exceptions import BadRequestError
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(order_by: str, values: list[Any]) -> str:
+    payload = json.dumps([order_by, values], default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str) -> list[Any]:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_order_by, values = json.loads(payload)
+    except (TypeError, ValueError):
+        raise BadRequestError("Invalid cursor")
+    if not isinstance(values, list):
+        raise BadRequestError("Invalid cursor")
+    if cursor_order_by != order_by:
+        raise BadRequestError(f"Cursor was issued for order_by={cursor_order_by}")
+    return values
+
+
+def order_columns(
+    columns: dict[str, InstrumentedAttribute],
+    id_column: InstrumentedAttribute,
+    order_by: str,
+) -> tuple[list[InstrumentedAttribute], bool]:
+    """
+    Колонки ключа сортировки для ``order_by`` вида ``price`` или ``-price``.
+
+    К неуникальной колонке добавляется ``id``, чтобы порядок был строгим.
+    """
+    descending = order_by.startswith("-")
+    name = order_by.removeprefix("-")
+    if name not in columns:
+        raise BadRequestError(
+            f"Unknown order_by {name!r}, expected one of: {', '.join(columns)}"
+        )
+    column = columns[name]
+    if column is id_column:
+        return [column], descending
+    return [column, id_column], descending
+
+
+def paginate(
+    statement: Select,
+    columns: list[InstrumentedAttribute],
+    *,
+    descending: bool,
+    order_by: str,
+    cursor: str | None,
+    limit: int,
+) -> Select:
+    """Добавляет к запросу сортировку, условие после курсора и лимит."""
+    if cursor is not None:
+        values = decode_cursor(cursor, order_by)
+        if len(values) != len(columns):
+            raise BadRequestError("Invalid cursor")
+        try:
+            values = [
+                None if value is None else column.type.python_type(value)
+                for column, value in zip(columns, values)
+            ]
+        except (TypeError, ValueError, ArithmeticError):
+            raise BadRequestError("Invalid cursor")
+        key = tuple_(*columns)
+        statement = statement.where(
+            key < tuple(values) if descending else key > tuple(values)
+        )
+    return statement.order_by(
+        *(column.desc() if descending else column.asc() for column in columns)
+    ).limit(limit)
+
+
+def next_cursor(
+    items: list[Any],
+    columns: list[InstrumentedAttribute],
+    *,
+    order_by: str,
+    limit: int,
+) -> str | None:
+    """Курсор следующей страницы или ``None``, если страница последняя."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(order_by, [getattr(last, column.key) for column in columns])
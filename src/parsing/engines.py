@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import time
+from typing import Protocol
+
+import httpx
+
+from ..catalogs.exceptions import CatalogParserError
+from ..catalogs.service import ParsedCatalogPage
+from ..drivers.async_driver import AsyncDriver
+from ..drivers.pool import DriverPool
+from ..metrics import service as metrics
+from ..products.exceptions import ProductParserError
+from ..products.service import ParsedProduct
+from ..snapshots.service import SnapshotStore
+from . import fetch_cache, html, selenium
+from .urls import FLIP_BASE_URL, catalog_url, product_url
+
+logger = logging.getLogger(__name__)
+
+
+class Engine(Protocol):
+    """Способ загрузить страницу flip.kz и извлечь из неё данные."""
+
+    async def parse_product(self, code: int) -> ParsedProduct: ...
+
+    async def parse_catalog_page(
+        self, code: int, page: int, limit: int | None
+    ) -> ParsedCatalogPage: ...
+
+
+class HttpEngine:
+    """
+    Загружает страницы обычным HTTP-запросом и разбирает разметку через lxml.
+
+    Если передано хранилище ``snapshots``, каждая загруженная страница
+    сохраняется в него до разбора. С ``cache`` недавно загруженные страницы
+    берутся из кэша, а устаревшие перепроверяются условным запросом.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        *,
+        base_url: str = FLIP_BASE_URL,
+        snapshots: SnapshotStore | None = None,
+        cache: fetch_cache.FetchCache | None = None,
+    ):
+        self.client = client
+        self.base_url = base_url
+        self.snapshots = snapshots
+        self.cache = cache
+
+    async def fetch(self, url: str) -> str:
+        cached = None
+        if self.cache is not None and not fetch_cache.bypassed():
+            cached = await self.cache.get(url)
+            if cached is not None and self.cache.is_fresh(cached):
+                metrics.FETCH_CACHE.labels("hit").inc()
+                return cached.body
+
+        with metrics.stage("fetch", "http"):
+            response = await self.client.get(
+                url, headers=cached.validators() if cached is not None else None
+            )
+        if cached is not None and response.status_code == 304:
+            metrics.FETCH_CACHE.labels("revalidated").inc()
+            await self.cache.touch(cached)
+            return cached.body
+        response.raise_for_status()
+
+        if self.snapshots is not None:
+            with metrics.stage("snapshot", "http"):
+                await self.snapshots.put(url, response.text)
+        if self.cache is not None:
+            metrics.FETCH_CACHE.labels("miss").inc()
+            await self.cache.put(
+                url,
+                response.text,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+            )
+        return response.text
+
+    async def parse_product(self, code: int) -> ParsedProduct:
+        url = product_url(self.base_url, code)
+        with metrics.page("product", "http", url):
+            try:
+                page_html = await self.fetch(url)
+            except httpx.HTTPError as exception:
+                raise ProductParserError(f"Could not fetch {url}: {exception}")
+            return html.parse_product(page_html, url=url, code=code)
+
+    async def parse_catalog_page(
+        self, code: int, page: int, limit: int | None
+    ) -> ParsedCatalogPage:
+        url = catalog_url(self.base_url, code, page)
+        with metrics.page("catalog", "http", url):
+            try:
+                page_html = await self.fetch(url)
+            except httpx.HTTPError as exception:
+                raise CatalogParserError(f"Could not fetch {url}: {exception}")
+            return html.parse_catalog_page(page_html, url=url, limit=limit)
+
+
+class SeleniumEngine:
+    """Рендерит страницы в Chrome из пула; нужен для страниц, которым требуется JavaScript."""
+
+    def __init__(
+        self,
+        driver_pool: DriverPool,
+        *,
+        base_url: str = FLIP_BASE_URL,
+        snapshots: SnapshotStore | None = None,
+        extraction: str = "script",
+    ):
+        self.driver_pool = driver_pool
+        self.base_url = base_url
+        self.snapshots = snapshots
+        if extraction not in selenium.EXTRACTIONS:
+            raise ValueError(f"Unknown Selenium extraction: {extraction}")
+        self.extraction = selenium.EXTRACTIONS[extraction]
+
+    async def snapshot(self, driver: AsyncDriver, url: str) -> None:
+        # Сохраняется отрисованный DOM: его разбирают парсеры lxml.
+        if self.snapshots is not None:
+            with metrics.stage("snapshot", "selenium"):
+                page_source = await driver.run(selenium.page_source)
+                await self.snapshots.put(url, page_source)
+
+    async def parse_product(self, code: int) -> ParsedProduct:
+        url = product_url(self.base_url, code)
+        with metrics.page("product", "selenium", url):
+            async with self.driver_pool.lease() as driver:
+                parsed_product = await driver.run(
+                    self.extraction.scrape_product, url, code
+                )
+                await self.snapshot(driver, url)
+                return parsed_product
+
+    async def parse_catalog_page(
+        self, code: int, page: int, limit: int | None
+    ) -> ParsedCatalogPage:
+        url = catalog_url(self.base_url, code, page)
+        with metrics.page("catalog", "selenium", url):
+            async with self.driver_pool.lease() as driver:
+                parsed_catalog_page = await driver.run(
+                    self.extraction.scrape_catalog_page, url, limit
+                )
+                await self.snapshot(driver, url)
+                return parsed_catalog_page
+
+
+class SnapshotEngine:
+    """
+    Разбирает последние сохраненные снимки страниц вместо загрузки:
+    повторный разбор без сети, например после исправления селектора.
+    """
+
+    def __init__(self, snapshots: SnapshotStore, *, base_url: str = FLIP_BASE_URL):
+        self.snapshots = snapshots
+        self.base_url = base_url
+
+    async def read(self, url: str) -> str | None:
+        snapshot = await self.snapshots.latest(url)
+        if snapshot is None:
+            return None
+        return await self.snapshots.read(snapshot)
+
+    async def parse_product(self, code: int) -> ParsedProduct:
+        url = product_url(self.base_url, code)
+        with metrics.page("product", "snapshot", url):
+            page_html = await self.read(url)
+            if page_html is None:
+                raise ProductParserError(f"There is no snapshot of {url}")
+            return html.parse_product(page_html, url=url, code=code)
+
+    async def parse_catalog_page(
+        self, code: int, page: int, limit: int | None
+    ) -> ParsedCatalogPage:
+        url = catalog_url(self.base_url, code, page)
+        with metrics.page("catalog", "snapshot", url):
+            page_html = await self.read(url)
+            if page_html is None:
+                raise CatalogParserError(f"There is no snapshot of {url}")
+            return html.parse_catalog_page(page_html, url=url, limit=limit)
+
+
+class RateLimitedEngine:
+    """Ограничивает частоту загрузки страниц: не чаще одной за ``interval`` секунд."""
+
+    def __init__(self, engine: Engine, *, interval: float):
+        self.engine = engine
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+
+    async def wait(self) -> None:
+        async with self._lock:
+            delay = self._next_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_at = time.monotonic() + self.interval
+
+    async def parse_product(self, code: int) -> ParsedProduct:
+        await self.wait()
+        return await self.engine.parse_product(code)
+
+    async def parse_catalog_page(
+        self, code: int, page: int, limit: int | None
+    ) -> ParsedCatalogPage:
+        await self.wait()
+        return await self.engine.parse_catalog_page(code, page, limit)
+
+
+class FallbackEngine:
+    """Пробует основной движок и при ошибке разбора повторяет запрос запасным."""
+
+    def __init__(self, primary: Engine, fallback: Engine):
+        self.primary = primary
+        self.fallback = fallback
+
+    async def parse_product(self, code: int) -> ParsedProduct:
+        try:
+            return await self.primary.parse_product(code)
+        except ProductParserError as exception:
+            logger.info("Falling back for product %s: %s", code, exception.detail)
+        metrics.RETRIES.labels("fallback").inc()
+        return await self.fallback.parse_product(code)
+
+    async def parse_catalog_page(
+        self, code: int, page: int, limit: int | None
+    ) -> ParsedCatalogPage:
+        try:
+            return await self.primary.parse_catalog_page(code, page, limit)
+        except CatalogParserError as exception:
+            logger.info(
+                "Falling back for catalog %s page %s: %s", code, page, exception.detail
+            )
+        metrics.RETRIES.labels("fallback").inc()
+        return await self.fallback.parse_catalog_page(code, page, limit)
+
+
+def create_engine(
+    name: str,
+    *,
+    http_client: httpx.AsyncClient,
+    driver_pool: DriverPool,
+    base_url: str = FLIP_BASE_URL,
+    snapshots: SnapshotStore | None = None,
+    cache: fetch_cache.FetchCache | None = None,
+    selenium_extraction: str = "script",
+) -> Engine:
+    def selenium_engine() -> SeleniumEngine:
+        return SeleniumEngine(
+            driver_pool,
+            base_url=base_url,
+            snapshots=snapshots,
+            extraction=selenium_extraction,
+        )
+
+    if name == "http":
+        return HttpEngine(
+            http_client, base_url=base_url, snapshots=snapshots, cache=cache
+        )
+    if name == "selenium":
+        return selenium_engine()
+    if name == "fallback":
+        return FallbackEngine(
+            HttpEngine(
+                http_client, base_url=base_url, snapshots=snapshots, cache=cache
+            ),
+            selenium_engine(),
+        )
+    if name == "snapshot":
+        if snapshots is None:
+            raise ValueError("Parser engine snapshot requires SNAPSHOT_DIR")
+        return SnapshotEngine(snapshots, base_url=base_url)
+    raise ValueError(f"Unknown parser engine: {name}")
@@ -0,0 +1,179 @@
+"""
+Кэш HTTP-ответов flip.kz на диске.
+
+Страница, загруженная меньше TTL назад, отдается из кэша без запроса к
+сайту; TTL задается отдельно для страниц продуктов и списков каталога.
+Устаревшая запись перепроверяется условным запросом (``If-None-Match`` /
+``If-Modified-Since``): на ``304 Not Modified`` тело берется из кэша.
+
+Каждая запись - JSON-файл с телом и валидаторами ответа. Суммарный размер
+файлов ограничен: при превышении удаляются давно не читавшиеся записи
+(LRU, порядок переживает перезапуск через время изменения файла).
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .urls import query_code
+
+_bypass: ContextVar[bool] = ContextVar("fetch_cache_bypass", default=False)
+
+
+@contextlib.contextmanager
+def bypass(enabled: bool = True) -> Iterator[None]:
+    """Загрузки внутри контекста идут мимо кэша; ответы в него все равно пишутся."""
+    token = _bypass.set(enabled)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def bypassed() -> bool:
+    return _bypass.get()
+
+
+@dataclass
+class CachedPage:
+    url: str
+    body: str
+    etag: str | None
+    last_modified: str | None
+    stored_at: float
+
+    def validators(self) -> dict[str, str]:
+        """Заголовки условного запроса для перепроверки записи."""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class FetchCache:
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        max_bytes: int,
+        product_ttl: float,
+        catalog_ttl: float,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.product_ttl = product_ttl
+        self.catalog_ttl = catalog_ttl
+        self.clock = clock
+        self.evictions = 0
+        self.size = 0
+        # Файлы читаются и пишутся в потоках to_thread, индекс общий.
+        self._lock = threading.Lock()
+        self._sizes: OrderedDict[str, int] = OrderedDict()
+        self._load_index()
+
+    def ttl(self, url: str) -> float:
+        """TTL по классу URL; остальные страницы не кэшируются."""
+        if query_code(url, "prod") is not None:
+            return self.product_ttl
+        if query_code(url, "subsection") is not None:
+            return self.catalog_ttl
+        return 0.0
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        return self.clock() - page.stored_at < self.ttl(page.url)
+
+    async def get(self, url: str) -> CachedPage | None:
+        if self.ttl(url) <= 0:
+            return None
+        return await asyncio.to_thread(self._get, _key(url))
+
+    async def put(
+        self,
+        url: str,
+        body: str,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        if self.ttl(url) <= 0:
+            return
+        page = CachedPage(url, body, etag, last_modified, self.clock())
+        await asyncio.to_thread(self._put, _key(url), page)
+
+    async def touch(self, page: CachedPage) -> None:
+        """Продлевает запись после ответа 304."""
+        page.stored_at = self.clock()
+        await asyncio.to_thread(self._put, _key(page.url), page)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _load_index(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for path in self.directory.glob("*.json"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+            self.size += size
+        self._evict()
+
+    def _get(self, key: str) -> CachedPage | None:
+        path = self._path(key)
+        try:
+            page = CachedPage(**json.loads(path.read_bytes()))
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.size -= self._sizes.pop(key, 0)
+            return None
+        except (TypeError, ValueError):
+            with self._lock:
+                self.size -= self._sizes.pop(key, 0)
+            path.unlink(missing_ok=True)
+            return None
+        with self._lock:
+            if key in self._sizes:
+                self._sizes.move_to_end(key)
+        return page
+
+    def _put(self, key: str, page: CachedPage) -> None:
+        data = json.dumps(asdict(page), ensure_ascii=False).encode()
+        path = self._path(key)
+        temporary_path = path.with_name(
+            f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        temporary_path.write_bytes(data)
+        temporary_path.replace(path)
+        with self._lock:
+            self.size += len(data) - self._sizes.get(key, 0)
+            self._sizes[key] = len(data)
+            self._sizes.move_to_end(key)
+        self._evict()
+
+    def _evict(self) -> None:
+        while True:
+            with self._lock:
+                if self.size <= self.max_bytes or not self._sizes:
+                    return
+                key, size = self._sizes.popitem(last=False)
+                self.size -= size
+                self.evictions += 1
+            self._path(key).unlink(missing_ok=True)
+
+
+def _key(url: str) -> str:
+    return hashlib.sha256(url.encode()).hexdigest()
@@ -0,0 +1,195 @@
+"""
+Разбор статической разметки flip.kz без браузера.
+
+Повторяет логику ``src.parsing.selenium`` на дереве lxml: те же элементы
+(``#prod``, ``.prod_img``, ``h1``, ``.text_att``, ``.krohi a``,
+``.good-grid .new-product``) и те же схемы на выходе.
+"""
+
+from decimal import Decimal
+from urllib.parse import parse_qs, urljoin, urlparse
+
+import lxml.html
+from lxml.etree import ParserError
+
+from ..catalogs import schemas as catalog_schemas
+from ..catalogs.exceptions import CatalogParserError
+from ..catalogs.service import (
+    ParsedBreadcrumbCatalogs,
+    ParsedCatalogPage,
+    ProductCard,
+)
+from ..metrics import service as metrics
+from ..products import schemas as product_schemas
+from ..products.exceptions import ProductParserError
+from ..products.service import ParsedProduct
+from . import urls
+
+
+def _class_xpath(class_name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+def _find(element: lxml.html.HtmlElement, xpath: str) -> lxml.html.HtmlElement:
+    found = element.xpath(xpath)
+    if not found:
+        raise LookupError(f"Could not find element {xpath!r}")
+    return found[0]
+
+
+def _text(element: lxml.html.HtmlElement) -> str:
+    # Как и WebElement.text, схлопываем пробелы и переводы строк.
+    return " ".join(" ".join(element.itertext()).split())
+
+
+def _query_value(url: str, name: str) -> int:
+    return int(parse_qs(urlparse(url).query)[name][0])
+
+
+def _document(html: str, base_url: str) -> lxml.html.HtmlElement:
+    try:
+        return lxml.html.document_fromstring(html, base_url=base_url)
+    except ParserError as exception:
+        raise LookupError(f"Could not parse document: {exception}")
+
+
+def _product_card(
+    product_element: lxml.html.HtmlElement,
+    link_element: lxml.html.HtmlElement,
+    url: str,
+    code: int,
+) -> ProductCard:
+    """
+    Данные карточки в сетке каталога; поля, которых в карточке нет, - ``None``.
+    """
+    name = link_element.get("title") or _text(link_element) or None
+    price_elements = product_element.xpath(f".//*[{_class_xpath('price')}]")
+    price_digits = (
+        "".join(filter(str.isdigit, _text(price_elements[0]))) if price_elements else ""
+    )
+    thumbnails = product_element.xpath(".//img/@src")
+    return ProductCard(
+        code,
+        name,
+        Decimal(price_digits) if price_digits else None,
+        urljoin(url, thumbnails[0]) if thumbnails else None,
+    )
+
+
+def parse_breadcrumb_catalogs(
+    document: lxml.html.HtmlElement, /
+) -> ParsedBreadcrumbCatalogs:
+    try:
+        try:
+            breadcrumb_catalogs_container = _find(
+                document, f"//*[{_class_xpath('krohi')}]"
+            )
+        except LookupError:
+            raise CatalogParserError("Could not find breadcrumb trail")
+
+        catalog_map = {}
+        catalog_parent_map = {}
+        previous_code = None
+        for breadcrumb in breadcrumb_catalogs_container.iter("a"):
+            code = _query_value(breadcrumb.get("href"), "subsection")
+            catalog_parent_map[code] = previous_code
+            catalog_map[code] = catalog_schemas.CatalogCreate(
+                code=code, name=breadcrumb.get("title")
+            )
+            previous_code = code
+        return ParsedBreadcrumbCatalogs(catalog_map, catalog_parent_map, previous_code)
+    except CatalogParserError:
+        raise
+    except Exception as exception:
+        raise CatalogParserError(f"Unexpected error: {exception}")
+
+
+def parse_product(html: str, *, url: str, code: int) -> ParsedProduct:
+    try:
+        with metrics.stage("extract", "http"):
+            document = _document(html, url)
+            info_container = _find(document, "//*[@id='prod']")
+            images_container = _find(
+                info_container, f".//*[{_class_xpath('prod_img')}]"
+            )
+            data_container = _find(images_container, "following-sibling::*[1]")
+            name = _text(_find(data_container, ".//h1"))
+            description = _text(_find(data_container, ".//p")) or None
+            price_element = _find(data_container, f".//*[{_class_xpath('text_att')}]")
+            price = Decimal("".join(filter(str.isdigit, _text(price_element))))
+            product = product_schemas.ProductCreate(
+                code=code,
+                name=name,
+                description=description,
+                price=price,
+                catalog_id=0,
+            )
+            for image_element in images_container.iter("img"):
+                product.images.append(
+                    product_schemas.ProductImageCreate(
+                        url=urljoin(url, image_element.get("src")),
+                        description=image_element.get("alt", ""),
+                    )
+                )
+        with metrics.stage("breadcrumb", "http"):
+            parsed_breadcrumb_catalogs = parse_breadcrumb_catalogs(document)
+        return ParsedProduct(parsed_breadcrumb_catalogs, product)
+    except Exception as exception:
+        raise ProductParserError(f"Unexpected error: {exception}")
+
+
+def parse_catalog_page(
+    html: str, *, url: str, limit: int | None
+) -> ParsedCatalogPage:
+    with metrics.stage("extract", "http"):
+        try:
+            document = _document(html, url)
+        except LookupError:
+            raise CatalogParserError("Could not find product grid")
+        # В разделе верхнего уровня бывают только ссылки на подразделы, без
+        # сетки товаров: такая страница с хлебными крошками - пустой список.
+        products_containers = document.xpath(f"//*[{_class_xpath('good-grid')}]")
+        if not products_containers and not document.xpath(
+            f"//*[{_class_xpath('krohi')}]"
+        ):
+            raise CatalogParserError("Could not find product grid")
+        product_elements = [
+            product_element
+            for products_container in products_containers[:1]
+            for product_element in products_container.xpath(
+                f".//*[{_class_xpath('new-product')}]"
+            )
+        ]
+
+        product_codes = []
+        product_cards = []
+        try:
+            for number, product_element in enumerate(product_elements):
+                if limit is not None and number >= limit:
+                    break
+                product_link_element = _find(product_element, ".//a")
+                product_url = urljoin(url, product_link_element.get("href"))
+                product_code = _query_value(product_url, "prod")
+                product_codes.append(product_code)
+                product_cards.append(
+                    _product_card(
+                        product_element, product_link_element, url, product_code
+                    )
+                )
+        except Exception as exception:
+            raise CatalogParserError(f"Unexpected error: {exception}")
+        subsection_links = document.xpath(
+            "//a[contains(@href, 'subsection=')]"
+            f"[not(ancestor::*[{_class_xpath('krohi')}])]"
+        )
+    with metrics.stage("breadcrumb", "http"):
+        parsed_breadcrumb_catalogs = parse_breadcrumb_catalogs(document)
+    return ParsedCatalogPage(
+        product_codes,
+        parsed_breadcrumb_catalogs,
+        urls.subsection_codes(
+            (urljoin(url, link.get("href")) for link in subsection_links),
+            exclude=set(parsed_breadcrumb_catalogs.catalog_map),
+        ),
+        tuple(product_cards),
+    )
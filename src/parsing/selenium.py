@@ -0,0 +1,353 @@
+from collections.abc import Callable
+from decimal import Decimal
+from typing import NamedTuple
+from urllib.parse import parse_qs, urlparse
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver import Chrome
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.expected_conditions import visibility_of_element_located
+from selenium.webdriver.support.ui import WebDriverWait
+
+from ..catalogs import schemas as catalog_schemas
+from ..catalogs.exceptions import CatalogParserError
+from ..catalogs.service import (
+    ParsedBreadcrumbCatalogs,
+    ParsedCatalogPage,
+    ProductCard,
+)
+from ..metrics import service as metrics
+from ..products import schemas as product_schemas
+from ..products.exceptions import ProductParserError
+from ..products.service import ParsedProduct
+from . import urls
+
+# Ссылки на подразделы вне хлебных крошек одним запросом к браузеру,
+# вместо get_attribute на каждую ссылку.
+SUBSECTION_LINKS_SCRIPT = """
+return Array.from(
+    document.querySelectorAll("a[href*='subsection=']"),
+    link => link.closest(".krohi") ? null : link.href
+).filter(Boolean);
+"""
+
+# Извлечение одним вызовом execute_script: скрипт собирает все поля страницы
+# и возвращает их одним JSON-ответом вместо отдельного запроса к chromedriver
+# на каждый find_element, get_attribute и .text.
+_BREADCRUMBS_JS = """
+const trail = document.querySelector(".krohi");
+const breadcrumbs = trail && Array.from(
+    trail.querySelectorAll("a"),
+    link => [link.href, link.getAttribute("title")]
+);
+const text = element => element && element.innerText.trim();
+"""
+
+PRODUCT_SCRIPT = (
+    _BREADCRUMBS_JS
+    + """
+const images = arguments[0].querySelector(".prod_img");
+const data = images && images.nextElementSibling;
+return {
+    breadcrumbs: breadcrumbs,
+    name: data && text(data.querySelector("h1")),
+    description: data && text(data.querySelector("p")),
+    price: data && text(data.querySelector(".text_att")),
+    images: images && Array.from(
+        images.querySelectorAll("img"),
+        image => [image.src, image.getAttribute("alt") || ""]
+    ),
+};
+"""
+)
+
+CATALOG_PAGE_SCRIPT = (
+    _BREADCRUMBS_JS
+    + """
+return {
+    breadcrumbs: breadcrumbs,
+    products: Array.from(
+        arguments[0] ? arguments[0].querySelectorAll(".new-product") : [],
+        card => {
+            const link = card.querySelector("a");
+            const image = card.querySelector("img");
+            return link && [
+                link.href,
+                link.getAttribute("title") || text(link),
+                text(card.querySelector(".price")),
+                image && image.src,
+            ];
+        }
+    ),
+    subsections: Array.from(
+        document.querySelectorAll("a[href*='subsection=']"),
+        link => link.closest(".krohi") ? null : link.href
+    ).filter(Boolean),
+};
+"""
+)
+
+
+def page_source(driver: Chrome, /) -> str:
+    return driver.page_source
+
+
+def scrape_breadcrumb_catalogs(driver: Chrome, /) -> ParsedBreadcrumbCatalogs:
+    try:
+        try:
+            breadcrumb_catalogs_container = driver.find_element(By.CLASS_NAME, "krohi")
+        except TimeoutException:
+            raise CatalogParserError("Could not find breadcrumb trail")
+
+        try:
+            breadcrumbs = breadcrumb_catalogs_container.find_elements(By.TAG_NAME, "a")
+        except TimeoutException:
+            raise CatalogParserError("Could not find links in breadcrumb")
+        catalog_map = {}
+        catalog_parent_map = {}
+        previous_code = None
+        for breadcrumb in breadcrumbs:
+            code = int(
+                parse_qs(urlparse(breadcrumb.get_attribute("href")).query)[
+                    "subsection"
+                ][0]
+            )
+            catalog_parent_map[code] = previous_code
+            name = breadcrumb.get_attribute("title")
+            catalog_map[code] = catalog_schemas.CatalogCreate(code=code, name=name)
+            previous_code = code
+        return ParsedBreadcrumbCatalogs(catalog_map, catalog_parent_map, previous_code)
+    except Exception as exception:
+        raise CatalogParserError(f"Unexpected error: {exception}")
+
+
+def product_card(
+    code: int, name: str | None, price_text: str | None, thumbnail_url: str | None
+) -> ProductCard:
+    price_digits = "".join(filter(str.isdigit, price_text or ""))
+    return ProductCard(
+        code,
+        name or None,
+        Decimal(price_digits) if price_digits else None,
+        thumbnail_url or None,
+    )
+
+
+def scrape_product(driver: Chrome, url: str, code: int) -> ParsedProduct:
+    try:
+        with metrics.stage("fetch", "selenium"):
+            driver.get(url)
+        with metrics.stage("wait", "selenium"):
+            wait = WebDriverWait(driver, 5)
+            info_container = wait.until(
+                visibility_of_element_located((By.ID, "prod"))
+            )
+        with metrics.stage("extract", "selenium"):
+            images_container = info_container.find_element(By.CLASS_NAME, "prod_img")
+            data_container = images_container.find_element(
+                By.XPATH, "following-sibling::*[1]"
+            )
+            name = data_container.find_element(By.TAG_NAME, "h1").text
+            description = data_container.find_element(By.TAG_NAME, "p").text or None
+            price_text = data_container.find_element(By.CLASS_NAME, "text_att").text
+            price = Decimal("".join(filter(str.isdigit, "".join(price_text.split()))))
+            product = product_schemas.ProductCreate(
+                code=code,
+                name=name,
+                description=description,
+                price=price,
+                catalog_id=0,
+            )
+            for image_element in images_container.find_elements(By.TAG_NAME, "img"):
+                url = image_element.get_attribute("src")
+                description = image_element.get_attribute("alt")
+                product.images.append(
+                    product_schemas.ProductImageCreate(url=url, description=description)
+                )
+        with metrics.stage("breadcrumb", "selenium"):
+            parsed_breadcrumb_catalogs = scrape_breadcrumb_catalogs(driver)
+        return ParsedProduct(parsed_breadcrumb_catalogs, product)
+    except Exception as exception:
+        raise ProductParserError(f"Unexpected error: {exception}")
+
+
+def wait_for_product_grid(driver: Chrome, wait: WebDriverWait) -> WebElement | None:
+    """
+    Сетка товаров страницы списка. У раздела, где есть только ссылки на
+    подразделы, сетки нет: при хлебных крошках на странице это ``None``.
+    """
+    try:
+        return wait.until(visibility_of_element_located((By.CLASS_NAME, "good-grid")))
+    except TimeoutException:
+        if driver.find_elements(By.CLASS_NAME, "krohi"):
+            return None
+        raise CatalogParserError("Could not find product grid")
+
+
+def scrape_catalog_page(
+    driver: Chrome, url: str, limit: int | None
+) -> ParsedCatalogPage:
+    with metrics.stage("fetch", "selenium"):
+        driver.get(url)
+    product_cards = []
+    with metrics.stage("wait", "selenium"):
+        wait = WebDriverWait(driver, 5)
+        products_container = wait_for_product_grid(driver, wait)
+    with metrics.stage("extract", "selenium"):
+        product_elements = (
+            products_container.find_elements(By.CLASS_NAME, "new-product")
+            if products_container is not None
+            else []
+        )
+        try:
+            for number, product_element in enumerate(product_elements):
+                if limit is not None and number >= limit:
+                    break
+                product_link_element = product_element.find_element(By.TAG_NAME, "a")
+                product_url = product_link_element.get_attribute("href")
+                product_code = int(parse_qs(urlparse(product_url).query)["prod"][0])
+                price_elements = product_element.find_elements(By.CLASS_NAME, "price")
+                image_elements = product_element.find_elements(By.TAG_NAME, "img")
+                product_cards.append(
+                    product_card(
+                        product_code,
+                        product_link_element.get_attribute("title")
+                        or product_link_element.text,
+                        price_elements[0].text if price_elements else None,
+                        image_elements[0].get_attribute("src")
+                        if image_elements
+                        else None,
+                    )
+                )
+        except Exception as exception:
+            raise CatalogParserError(f"Unexpected error: {exception}")
+        subsection_links = driver.execute_script(SUBSECTION_LINKS_SCRIPT)
+    with metrics.stage("breadcrumb", "selenium"):
+        parsed_breadcrumb_catalogs = scrape_breadcrumb_catalogs(driver)
+    return ParsedCatalogPage(
+        [card.code for card in product_cards],
+        parsed_breadcrumb_catalogs,
+        urls.subsection_codes(
+            subsection_links, exclude=set(parsed_breadcrumb_catalogs.catalog_map)
+        ),
+        tuple(product_cards),
+    )
+
+
+def breadcrumb_catalogs_from_links(
+    links: list[list[str]] | None,
+) -> ParsedBreadcrumbCatalogs:
+    """Хлебные крошки из пар ``[href, title]``, собранных скриптом."""
+    if links is None:
+        raise CatalogParserError("Could not find breadcrumb trail")
+    try:
+        catalog_map = {}
+        catalog_parent_map = {}
+        previous_code = None
+        for href, title in links:
+            code = int(parse_qs(urlparse(href).query)["subsection"][0])
+            catalog_parent_map[code] = previous_code
+            catalog_map[code] = catalog_schemas.CatalogCreate(code=code, name=title)
+            previous_code = code
+        return ParsedBreadcrumbCatalogs(catalog_map, catalog_parent_map, previous_code)
+    except Exception as exception:
+        raise CatalogParserError(f"Unexpected error: {exception}")
+
+
+def extract_product(driver: Chrome, url: str, code: int) -> ParsedProduct:
+    """
+    То же, что ``scrape_product``, но все поля страницы читаются одним
+    ``execute_script``: загрузка, ожидание и извлечение - три запроса к
+    chromedriver независимо от числа изображений и хлебных крошек.
+    """
+    try:
+        with metrics.stage("fetch", "selenium"):
+            driver.get(url)
+        with metrics.stage("wait", "selenium"):
+            wait = WebDriverWait(driver, 5)
+            info_container = wait.until(
+                visibility_of_element_located((By.ID, "prod"))
+            )
+        with metrics.stage("extract", "selenium"):
+            payload = driver.execute_script(PRODUCT_SCRIPT, info_container)
+            if payload["images"] is None:
+                raise ProductParserError("Could not find product images")
+            if None in (payload["name"], payload["description"], payload["price"]):
+                raise ProductParserError("Could not find product data")
+            product = product_schemas.ProductCreate(
+                code=code,
+                name=payload["name"],
+                description=payload["description"] or None,
+                price=Decimal("".join(filter(str.isdigit, payload["price"]))),
+                catalog_id=0,
+                images=[
+                    product_schemas.ProductImageCreate(
+                        url=image_url, description=description
+                    )
+                    for image_url, description in payload["images"]
+                ],
+            )
+        with metrics.stage("breadcrumb", "selenium"):
+            parsed_breadcrumb_catalogs = breadcrumb_catalogs_from_links(
+                payload["breadcrumbs"]
+            )
+        return ParsedProduct(parsed_breadcrumb_catalogs, product)
+    except ProductParserError:
+        raise
+    except Exception as exception:
+        raise ProductParserError(f"Unexpected error: {exception}")
+
+
+def extract_catalog_page(
+    driver: Chrome, url: str, limit: int | None
+) -> ParsedCatalogPage:
+    """То же, что ``scrape_catalog_page``, одним ``execute_script`` на страницу."""
+    with metrics.stage("fetch", "selenium"):
+        driver.get(url)
+    with metrics.stage("wait", "selenium"):
+        wait = WebDriverWait(driver, 5)
+        products_container = wait_for_product_grid(driver, wait)
+    with metrics.stage("extract", "selenium"):
+        payload = driver.execute_script(CATALOG_PAGE_SCRIPT, products_container)
+        products = payload["products"][:limit]
+        if None in products:
+            raise CatalogParserError("Could not find product link")
+        try:
+            product_cards = [
+                product_card(
+                    int(parse_qs(urlparse(product_url).query)["prod"][0]),
+                    name,
+                    price_text,
+                    thumbnail_url,
+                )
+                for product_url, name, price_text, thumbnail_url in products
+            ]
+        except (KeyError, ValueError) as exception:
+            raise CatalogParserError(f"Unexpected error: {exception}")
+    with metrics.stage("breadcrumb", "selenium"):
+        parsed_breadcrumb_catalogs = breadcrumb_catalogs_from_links(
+            payload["breadcrumbs"]
+        )
+    return ParsedCatalogPage(
+        [card.code for card in product_cards],
+        parsed_breadcrumb_catalogs,
+        urls.subsection_codes(
+            payload["subsections"],
+            exclude=set(parsed_breadcrumb_catalogs.catalog_map),
+        ),
+        tuple(product_cards),
+    )
+
+
+class Extraction(NamedTuple):
+    scrape_product: Callable[[Chrome, str, int], ParsedProduct]
+    scrape_catalog_page: Callable[[Chrome, str, int | None], ParsedCatalogPage]
+
+
+# Способы извлечения данных в браузере: ``elements`` - через WebElement,
+# по запросу к chromedriver на каждое поле; ``script`` - одним скриптом.
+EXTRACTIONS: dict[str, Extraction] = {
+    "elements": Extraction(scrape_product, scrape_catalog_page),
+    "script": Extraction(extract_product, extract_catalog_page),
+}
@@ -0,0 +1,31 @@
+from collections.abc import Iterable
+from urllib.parse import parse_qs, urlparse
+
+FLIP_BASE_URL = "https://www.flip.kz"
+
+
+def product_url(base_url: str, code: int) -> str:
+    return f"{base_url}/catalog?prod={code}"
+
+
+def catalog_url(base_url: str, code: int, page: int) -> str:
+    return f"{base_url}/catalog?subsection={code}&page={page}"
+
+
+def query_code(url: str, name: str) -> int | None:
+    values = parse_qs(urlparse(url).query).get(name)
+    if not values or not values[0].isdigit():
+        return None
+    return int(values[0])
+
+
+def subsection_codes(urls: Iterable[str], *, exclude: set[int]) -> list[int]:
+    """Коды подразделов из ссылок страницы в порядке появления, без повторов."""
+    codes: list[int] = []
+    seen = set(exclude)
+    for url in urls:
+        code = query_code(url, "subsection")
+        if code is not None and code not in seen:
+            seen.add(code)
+            codes.append(code)
+    return codes
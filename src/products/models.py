@@ -1,7 +1,8 @@
+from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Numeric, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Numeric, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..models import Base
@@ -12,17 +13,33 @@ if TYPE_CHECKING:
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (Index("ix_products_price_id", "price", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     code: Mapped[int] = mapped_column(unique=True, index=True, nullable=False)
     name: Mapped[str] = mapped_column(String(300), nullable=False)
     description: Mapped[str | None] = mapped_column(Text)
     price: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
-    catalog_id: Mapped[int] = mapped_column(ForeignKey("catalogs.id"), nullable=False)
+    catalog_id: Mapped[int] = mapped_column(
+        ForeignKey("catalogs.id", ondelete="CASCADE"), index=True, nullable=False
+    )
+    content_hash: Mapped[str | None] = mapped_column(String(64))
+    last_seen_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), index=True, nullable=False, server_default=func.now()
+    )
+    last_changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
 
-    catalog: Mapped["Catalog"] = relationship("Catalog", back_populates="products")
+    catalog: Mapped["Catalog"] = relationship(
+        "Catalog", back_populates="products", lazy="raise"
+    )
     images: Mapped[list["ProductImage"]] = relationship(
-        "ProductImage", back_populates="product", cascade="all, delete-orphan"
+        "ProductImage",
+        back_populates="product",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
@@ -35,9 +52,13 @@ class ProductImage(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     url: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[str | None] = mapped_column(Text)
-    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), nullable=False)
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("products.id", ondelete="CASCADE"), index=True, nullable=False
+    )
 
-    product: Mapped["Product"] = relationship("Product", back_populates="images")
+    product: Mapped["Product"] = relationship(
+        "Product", back_populates="images", lazy="raise"
+    )
 
     def __repr__(self) -> str:
         return f"<ProductImage(id={self.id}, url='{self.url[:30]}...')>"
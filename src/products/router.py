@@ -1,14 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException
+import csv
+import io
+from collections.abc import AsyncIterator
+from datetime import timedelta
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from selenium.webdriver import Chrome
 
-from ..dependencies import get_async_session, get_driver
+from .. import conditional, database, pagination
+from ..dependencies import bypass_fetch_cache, get_async_session, get_engine
+from ..parsing.engines import Engine
 from . import schemas, service
 
 _router = APIRouter(prefix="/products")
 instance = _router
 
 
+def products_json_response(
+    products: list[schemas.Product], response: Response
+) -> Response:
+    """
+    JSON-ответ со списком продуктов в обход ``response_model``.
+
+    Схемы уже провалидированы в ``service.load_products``, поэтому повторная
+    валидация FastAPI не нужна; сериализация идет сразу в байты в
+    pydantic-core. Заголовки переносятся из ``response``.
+    """
+    return Response(
+        service.PRODUCT_LIST_ADAPTER.dump_json(products, by_alias=True),
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
+
+
 @_router.post("/", response_model=schemas.Product, status_code=201)
 async def create_product(
     product_in: schemas.ProductCreate,
@@ -21,23 +46,95 @@ async def create_product(
 
 @_router.get("/", response_model=list[schemas.Product])
 async def read_products(
+    request: Request,
+    response: Response,
     skip: int = 0,
+    limit: int = Query(100, ge=1),
+    cursor: str | None = None,
+    order_by: str = "id",
+    async_session: AsyncSession = Depends(get_async_session),
+):
+    products, next_cursor = await service.get_all_products(
+        async_session, skip=skip, limit=limit, cursor=cursor, order_by=order_by
+    )
+    if next_cursor is not None:
+        response.headers[pagination.NEXT_CURSOR_HEADER] = next_cursor
+    not_modified = conditional.check_not_modified(
+        request,
+        response,
+        etag=conditional.make_etag(
+            [service.product_etag(product) for product in products], next_cursor
+        ),
+    )
+    return not_modified or products_json_response(products, response)
+
+
+EXPORT_CSV_FIELDS = ["id", "code", "name", "description", "price", "catalog_id"]
+
+
+async def export_products_ndjson() -> AsyncIterator[str]:
+    # Сессия открывается внутри генератора: зависимость get_async_session
+    # закрывается раньше, чем StreamingResponse дочитает данные.
+    async with database.AsyncSession() as async_session:
+        async for product in service.stream_all_products(async_session):
+            yield schemas.Product.model_validate(product).model_dump_json() + "\n"
+
+
+async def export_products_csv() -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_CSV_FIELDS)
+    async with database.AsyncSession() as async_session:
+        async for product in service.stream_all_products(
+            async_session, with_images=False
+        ):
+            writer.writerow([getattr(product, field) for field in EXPORT_CSV_FIELDS])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+
+@_router.get("/export")
+async def export_products(format: Literal["ndjson", "csv"] = "ndjson"):
+    if format == "csv":
+        return StreamingResponse(
+            export_products_csv(),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="products.csv"'},
+        )
+    return StreamingResponse(
+        export_products_ndjson(), media_type="application/x-ndjson"
+    )
+
+
+@_router.get("/stale", response_model=list[schemas.Product])
+async def read_stale_products(
+    older_than_hours: float = 24,
     limit: int = 100,
     async_session: AsyncSession = Depends(get_async_session),
 ):
-    products = await service.get_all_products(async_session, skip=skip, limit=limit)
-    return products
+    return await service.get_stale_products(
+        async_session, older_than=timedelta(hours=older_than_hours), limit=limit
+    )
 
 
 @_router.get("/{product_id}", response_model=schemas.Product)
 async def read_product(
     product_id: int,
+    request: Request,
+    response: Response,
     async_session: AsyncSession = Depends(get_async_session),
 ):
-    db_product = await service.get_product_by_id(async_session, code=product_id)
+    db_product = await service.get_cached_product_by_id(async_session, id=product_id)
     if db_product is None:
         raise HTTPException(status_code=404, detail="Product not found")
-    return db_product
+    not_modified = conditional.check_not_modified(
+        request,
+        response,
+        etag=service.product_etag(db_product),
+        last_modified=service.product_last_modified(db_product),
+    )
+    return not_modified or db_product
 
 
 @_router.patch("/{product_id}", response_model=schemas.Product)
@@ -65,34 +162,34 @@ async def delete_product(
     return {"ok": True}
 
 
-@_router.post("/{product_id}/parse")
+@_router.post("/{product_id}/parse", dependencies=[Depends(bypass_fetch_cache)])
 async def parse_product_by_id(
     product_id: int,
     async_session: AsyncSession = Depends(get_async_session),
-    driver: Chrome = Depends(get_driver),
+    engine: Engine = Depends(get_engine),
 ):
     return await service.upsert_parsed_product_by_id(
-        async_session=async_session, id=product_id, driver=driver
+        async_session=async_session, id=product_id, engine=engine
     )
 
 
-@_router.post("/parse/by-url")
+@_router.post("/parse/by-url", dependencies=[Depends(bypass_fetch_cache)])
 async def parse_product_by_url(
     url: str,
     async_session: AsyncSession = Depends(get_async_session),
-    driver: Chrome = Depends(get_driver),
+    engine: Engine = Depends(get_engine),
 ):
     return await service.upsert_parsed_product_by_url(
-        async_session=async_session, url=url, driver=driver
+        async_session=async_session, url=url, engine=engine
     )
 
 
-@_router.post("/parse/by-code/{code}")
+@_router.post("/parse/by-code/{code}", dependencies=[Depends(bypass_fetch_cache)])
 async def parse_product_by_code(
     code: int,
     async_session: AsyncSession = Depends(get_async_session),
-    driver: Chrome = Depends(get_driver),
+    engine: Engine = Depends(get_engine),
 ):
     return await service.upsert_parsed_product_by_code(
-        async_session=async_session, code=code, driver=driver
+        async_session=async_session, code=code, engine=engine
     )
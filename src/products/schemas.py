@@ -1,3 +1,4 @@
+from datetime import datetime
 from decimal import Decimal
 
 from pydantic import ConfigDict
@@ -45,3 +46,6 @@ class Product(ProductBase):
 
     id: int
     images: list[ProductImage] = []
+    content_hash: str | None = None
+    last_seen_at: datetime | None = None
+    last_changed_at: datetime | None = None
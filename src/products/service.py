@@ -1,22 +1,45 @@
+import asyncio
+import hashlib
+import json
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Sequence
+from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import TYPE_CHECKING, NamedTuple
+from typing import TYPE_CHECKING, NamedTuple, TypeVar
 from urllib.parse import parse_qs, urlparse
 
-from selenium.webdriver import Chrome
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.expected_conditions import visibility_of_element_located
-from selenium.webdriver.support.ui import WebDriverWait
-from sqlalchemy import select
+from pydantic import TypeAdapter
+from sqlalchemy import (
+    Select,
+    bindparam,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src import conditional, pagination
+from src.cache import service as cache_service
+from src.cache.service import cache
 from src.exceptions import NotFoundError
+from src.metrics import service as metrics
 from src.products.exceptions import ProductParserError
 
 from . import models, schemas
 
 if TYPE_CHECKING:
     from ..catalogs import service as catalog_service
+    from ..parsing.engines import Engine
+
+
+T = TypeVar("T")
+
+# Предел параметров одного запроса в протоколе PostgreSQL (asyncpg).
+MAX_BIND_PARAMETERS = 32767
 
 
 class ParsedProduct(NamedTuple):
@@ -25,71 +48,113 @@ class ParsedProduct(NamedTuple):
 
 
 async def parse_product_by_code(
-    *, driver: Chrome, async_session: AsyncSession, code: int
+    *, engine: "Engine", async_session: AsyncSession, code: int
 ) -> ParsedProduct:
-    from ..catalogs import service as catalog_service
+    return await engine.parse_product(code)
 
-    try:
-        driver.get(f"https://www.flip.kz/catalog?prod={code}")
-        wait = WebDriverWait(driver, 5)
-        info_container = wait.until(visibility_of_element_located((By.ID, "prod")))
-        images_container = info_container.find_element(By.CLASS_NAME, "prod_img")
-        data_container = images_container.find_element(
-            By.XPATH, "following-sibling::*[1]"
-        )
-        name = data_container.find_element(By.TAG_NAME, "h1").text
-        description = data_container.find_element(By.TAG_NAME, "p").text or None
-        price = Decimal(
-            "".join(
-                filter(
-                    str.isdigit,
-                    "".join(
-                        data_container.find_element(
-                            By.CLASS_NAME, "text_att"
-                        ).text.split()
-                    ),
+
+async def parse_products_by_codes(
+    *,
+    engine: "Engine",
+    async_session: AsyncSession,
+    codes: list[int],
+    concurrency: int = 1,
+    on_error: Callable[[int, Exception], None] | None = None,
+) -> list[ParsedProduct]:
+    """
+    Парсит несколько продуктов, выполняя не больше ``concurrency`` загрузок
+    одновременно. Результаты возвращаются в порядке ``codes``.
+
+    Если передан ``on_error``, ошибка отдельного продукта не прерывает
+    остальные: она передается в ``on_error``, а продукт пропускается.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def parse(code: int) -> ParsedProduct | None:
+        async with semaphore:
+            try:
+                return await parse_product_by_code(
+                    engine=engine, async_session=async_session, code=code
                 )
-            )
-        )
-        product = schemas.ProductCreate(
-            code=code, name=name, description=description, price=price, catalog_id=0
-        )
-        parsed_breadcrumb_catalogs = await catalog_service.parse_breadcrumb_catalogs(
-            driver
-        )
-        for image_element in images_container.find_elements(By.TAG_NAME, "img"):
-            url = image_element.get_attribute("src")
-            description = image_element.get_attribute("alt")
-            product.images.append(
-                schemas.ProductImageCreate(url=url, description=description)
-            )
-        return ParsedProduct(parsed_breadcrumb_catalogs, product)
-    except Exception as exception:
-        raise ProductParserError(f"Unexpected error: {exception}")
+            except Exception as exception:
+                if on_error is None:
+                    raise
+                on_error(code, exception)
+                return None
+
+    parsed_products = await asyncio.gather(*(parse(code) for code in codes))
+    return [parsed for parsed in parsed_products if parsed is not None]
 
 
 async def parse_product_by_id(
-    *, driver: Chrome, async_session: AsyncSession, id: int
+    *, engine: "Engine", async_session: AsyncSession, id: int
 ) -> ParsedProduct:
     product = await get_product_by_id(async_session, id)
     if product is None:
         raise NotFoundError(f"Product with id {id} - not found")
     return await parse_product_by_code(
-        driver=driver, async_session=async_session, code=product.code
+        engine=engine, async_session=async_session, code=product.code
     )
 
 
 async def parse_product_by_url(
-    *, driver: Chrome, async_session: AsyncSession, url: str
+    *, engine: "Engine", async_session: AsyncSession, url: str
 ) -> ParsedProduct:
     code = parse_qs(urlparse(url).query).get("prod")
     if code is None:
         raise ProductParserError("There is no 'prod' in query parameters")
     return await parse_product_by_code(
-        driver=driver, async_session=async_session, code=int(code[0])
+        engine=engine, async_session=async_session, code=int(code[0])
+    )
+
+
+def compute_content_hash(
+    product: "schemas.ProductCreate | models.Product",
+) -> str:
+    """
+    Отпечаток содержимого продукта: название, описание, цена и изображения.
+
+    Принимает и схему, и модель, чтобы разобранную страницу можно было
+    сравнить с сохраненной строкой без загрузки изображений.
+    """
+    content = [
+        product.name,
+        product.description,
+        f"{Decimal(product.price):.2f}",
+        [[image.url, image.description] for image in product.images],
+    ]
+    return hashlib.sha256(
+        json.dumps(content, ensure_ascii=False).encode()
+    ).hexdigest()
+
+
+def product_etag(product: "schemas.Product | models.Product") -> str:
+    """
+    ETag продукта по отпечатку содержимого, коду, каталогу и отметкам
+    времени: ``last_seen_at`` тоже есть в теле ответа, а каждый обход его
+    обновляет.
+    """
+    return conditional.make_etag(
+        product.code,
+        product.catalog_id,
+        product.content_hash or compute_content_hash(product),
+        product.last_seen_at,
+        product.last_changed_at,
     )
 
 
+def product_last_modified(
+    product: "schemas.Product | models.Product",
+) -> datetime | None:
+    """Последнее изменение ответа: позднейшая из отметок продукта."""
+    timestamps = [
+        timestamp
+        for timestamp in (product.last_changed_at, product.last_seen_at)
+        if timestamp is not None
+    ]
+    return max(timestamps, default=None)
+
+
 async def get_product_by_id(async_session: AsyncSession, id: int):
     result = await async_session.execute(
         select(models.Product)
@@ -102,6 +167,19 @@ async def get_product_by_id(async_session: AsyncSession, id: int):
     return product
 
 
+async def get_cached_product_by_id(
+    async_session: AsyncSession, id: int
+) -> schemas.Product:
+    """``get_product_by_id`` через кэш чтения; возвращает схему ответа."""
+
+    async def load() -> schemas.Product:
+        return schemas.Product.model_validate(
+            await get_product_by_id(async_session, id)
+        )
+
+    return await cache.get_or_load(cache_service.product_key(id), schemas.Product, load)
+
+
 async def get_product_by_code(async_session: AsyncSession, code: int):
     result = await async_session.execute(
         select(models.Product)
@@ -114,16 +192,101 @@ async def get_product_by_code(async_session: AsyncSession, code: int):
     return product
 
 
+ORDER_COLUMNS = {
+    "id": models.Product.id,
+    "code": models.Product.code,
+    "price": models.Product.price,
+}
+
+
+PRODUCT_LIST_ADAPTER = TypeAdapter(list[schemas.Product])
+
+
+async def load_products(
+    async_session: AsyncSession, statement: Select
+) -> list[schemas.Product]:
+    """
+    Схемы продуктов для запроса по колонкам ``products``.
+
+    Строки читаются как mapping без создания ORM-объектов, изображения -
+    одним запросом на всю страницу; результат валидируется один раз
+    через ``PRODUCT_LIST_ADAPTER``.
+    """
+    product_rows = (await async_session.execute(statement)).mappings().all()
+    if not product_rows:
+        return []
+    image_rows = (
+        await async_session.execute(
+            select(*models.ProductImage.__table__.columns)
+            .where(
+                models.ProductImage.product_id.in_(
+                    [product_row["id"] for product_row in product_rows]
+                )
+            )
+            .order_by(models.ProductImage.id)
+        )
+    ).mappings()
+    images: dict[int, list] = {}
+    for image_row in image_rows:
+        images.setdefault(image_row["product_id"], []).append(dict(image_row))
+    return PRODUCT_LIST_ADAPTER.validate_python(
+        [
+            {**product_row, "images": images.get(product_row["id"], [])}
+            for product_row in product_rows
+        ]
+    )
+
+
 async def get_all_products(
-    async_session: AsyncSession, skip: int = 0, limit: int = 100
-):
-    result = await async_session.execute(
-        select(models.Product)
-        .options(selectinload(models.Product.images))
-        .offset(skip)
-        .limit(limit)
+    async_session: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    *,
+    cursor: str | None = None,
+    order_by: str = "id",
+) -> tuple[list[schemas.Product], str | None]:
+    """
+    Страница продуктов и курсор следующей страницы.
+
+    ``skip`` оставлен для совместимости; для глубокого листания нужно
+    передавать ``cursor`` из предыдущего ответа.
+    """
+    columns, descending = pagination.order_columns(
+        ORDER_COLUMNS, models.Product.id, order_by
     )
-    return result.scalars().all()
+    statement = pagination.paginate(
+        select(*models.Product.__table__.columns),
+        columns,
+        descending=descending,
+        order_by=order_by,
+        cursor=cursor,
+        limit=limit,
+    )
+    if skip:
+        statement = statement.offset(skip)
+    products = await load_products(async_session, statement)
+    return products, pagination.next_cursor(
+        products, columns, order_by=order_by, limit=limit
+    )
+
+
+async def stream_all_products(
+    async_session: AsyncSession, *, with_images: bool = True, batch_size: int = 1000
+) -> AsyncIterator[models.Product]:
+    """
+    Все продукты по порядку ``id`` через серверный курсор.
+
+    Строки читаются пачками по ``batch_size``, поэтому выгрузка всего
+    каталога занимает постоянную память.
+    """
+    statement = select(models.Product).order_by(models.Product.id)
+    if with_images:
+        statement = statement.options(selectinload(models.Product.images))
+    products = await async_session.stream_scalars(
+        statement.execution_options(yield_per=batch_size)
+    )
+    async for product in products:
+        yield product
 
 
 async def create_product(
@@ -136,11 +299,11 @@ async def create_product(
         for image_in in product_in.images:
             db_image = models.ProductImage(**image_in.model_dump())
             db_product.images.append(db_image)
+    db_product.content_hash = compute_content_hash(product_in)
 
     async_session.add(db_product)
     await async_session.commit()
-    await async_session.refresh(db_product)
-    return db_product
+    return await get_product_by_id(async_session, db_product.id)
 
 
 async def update_product_by_id(
@@ -151,11 +314,20 @@ async def update_product_by_id(
     db_product = await get_product_by_id(async_session, id)
     if not db_product:
         return None
+    catalog_id = db_product.catalog_id
     update_data = product_in.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_product, key, value)
+    content_hash = compute_content_hash(db_product)
+    if (
+        content_hash != db_product.content_hash
+        or catalog_id != db_product.catalog_id
+    ):
+        db_product.content_hash = content_hash
+        db_product.last_changed_at = func.now()
     async_session.add(db_product)
     await async_session.commit()
+    await cache.invalidate(cache_service.product_key(id))
     return await get_product_by_id(async_session, id)
 
 
@@ -164,6 +336,8 @@ async def delete_product_by_id(async_session: AsyncSession, id: int):
     if not db_product:
         return None
     await async_session.delete(db_product)
+    await async_session.commit()
+    await cache.invalidate(cache_service.product_key(id))
     return db_product
 
 
@@ -173,79 +347,333 @@ async def upsert_product_by_code(
     *,
     commit: bool = True,
 ):
+    content_hash = compute_content_hash(product_in)
     try:
 
         db_product = await get_product_by_code(async_session, product_in.code)
     except NotFoundError:
         product_data = product_in.model_dump(exclude={"images"})
-        db_product = models.Product(**product_data)
+        db_product = models.Product(**product_data, content_hash=content_hash)
+        changed = True
         if product_in.images:
             for image_in in product_in.images:
                 db_product.images.append(models.ProductImage(**image_in.model_dump()))
     else:
-        update_data = product_in.model_dump(exclude={"images"})
-        for key, value in update_data.items():
-            setattr(db_product, key, value)
-
-        db_product.images.clear()
-        if product_in.images:
-            for image_in in product_in.images:
-                db_product.images.append(models.ProductImage(**image_in.model_dump()))
+        db_product.last_seen_at = func.now()
+        # Неизменившийся продукт не переписываем: ни строку, ни изображения.
+        changed = (
+            db_product.content_hash != content_hash
+            or db_product.catalog_id != product_in.catalog_id
+        )
+        if changed:
+            update_data = product_in.model_dump(exclude={"images"})
+            for key, value in update_data.items():
+                setattr(db_product, key, value)
+            db_product.content_hash = content_hash
+            db_product.last_changed_at = func.now()
+
+            db_product.images.clear()
+            if product_in.images:
+                for image_in in product_in.images:
+                    db_product.images.append(
+                        models.ProductImage(**image_in.model_dump())
+                    )
 
     async_session.add(db_product)
+    await async_session.flush([db_product])
+    cache.invalidate_on_commit(async_session, cache_service.product_key(db_product.id))
     if commit:
-        await async_session.commit()
+        await cache.commit(async_session)
         await async_session.refresh(db_product)
-    else:
-        await async_session.flush([db_product])
+    metrics.PRODUCTS.labels("written" if changed else "unchanged").inc()
     return db_product
 
 
+def chunked(items: Sequence[T], columns: int) -> Iterator[Sequence[T]]:
+    """
+    Делит ``items`` на части, которые умещаются в один запрос, если у
+    каждого элемента ``columns`` параметров.
+    """
+    size = max(MAX_BIND_PARAMETERS // max(columns, 1), 1)
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+async def upsert_products_by_code(
+    async_session: AsyncSession,
+    products_in: list[schemas.ProductCreate],
+    *,
+    commit: bool = True,
+) -> dict[int, int]:
+    """
+    Пакетный upsert продуктов по коду.
+
+    Выполняет ``INSERT ... ON CONFLICT (code) DO UPDATE ... WHERE ...
+    RETURNING``, отметку ``last_seen_at`` у неизменившихся продуктов,
+    удаление старых изображений и многострочную вставку новых. Каждый из
+    запросов делится на части, умещающиеся в ``MAX_BIND_PARAMETERS``, так что
+    на обычный пакет приходится не больше четырех запросов.
+
+    Строки идут в порядке кодов: параллельные пакеты с общими продуктами
+    блокируют строки в одном порядке и не попадают во взаимную блокировку.
+
+    Продукты с тем же отпечатком содержимого и каталогом не переписываются.
+    Возвращает словарь ``{code: id}`` только для новых и изменившихся продуктов.
+    """
+    # ON CONFLICT не может обновить одну строку дважды за запрос,
+    # поэтому повторяющиеся коды схлопываем (побеждает последний).
+    unique_products = {product_in.code: product_in for product_in in products_in}
+    if not unique_products:
+        return {}
+    rows = [
+        {
+            **unique_products[code].model_dump(exclude={"images"}),
+            "content_hash": compute_content_hash(unique_products[code]),
+        }
+        for code in sorted(unique_products)
+    ]
+
+    product_ids: dict[int, int] = {}
+    for chunk in chunked(rows, len(rows[0])):
+        statement = postgresql_insert(models.Product).values(chunk)
+        statement = statement.on_conflict_do_update(
+            index_elements=[models.Product.code],
+            set_={
+                "name": statement.excluded.name,
+                "description": statement.excluded.description,
+                "price": statement.excluded.price,
+                "catalog_id": statement.excluded.catalog_id,
+                "content_hash": statement.excluded.content_hash,
+                "last_seen_at": func.now(),
+                "last_changed_at": func.now(),
+            },
+            where=or_(
+                models.Product.content_hash.is_distinct_from(
+                    statement.excluded.content_hash
+                ),
+                models.Product.catalog_id.is_distinct_from(
+                    statement.excluded.catalog_id
+                ),
+            ),
+        ).returning(models.Product.code, models.Product.id)
+        product_ids.update((await async_session.execute(statement)).all())
+
+    unchanged_codes = sorted(unique_products.keys() - product_ids.keys())
+    metrics.PRODUCTS.labels("written").inc(len(product_ids))
+    metrics.PRODUCTS.labels("unchanged").inc(len(unchanged_codes))
+    for chunk in chunked(unchanged_codes, 1):
+        await async_session.execute(
+            update(models.Product)
+            .where(models.Product.code.in_(chunk))
+            .values(last_seen_at=func.now())
+        )
+    if not product_ids:
+        if commit:
+            await cache.commit(async_session)
+        return product_ids
+
+    for chunk in chunked(sorted(product_ids.values()), 1):
+        await async_session.execute(
+            delete(models.ProductImage).where(models.ProductImage.product_id.in_(chunk))
+        )
+    images = [
+        {**image_in.model_dump(), "product_id": product_ids[code]}
+        for code in sorted(product_ids)
+        for image_in in unique_products[code].images
+    ]
+    if images:
+        for chunk in chunked(images, len(images[0])):
+            await async_session.execute(insert(models.ProductImage).values(chunk))
+
+    cache.invalidate_on_commit(
+        async_session, *map(cache_service.product_key, product_ids.values())
+    )
+    if commit:
+        await cache.commit(async_session)
+    return product_ids
+
+
+async def upsert_product_cards(
+    async_session: AsyncSession,
+    cards: "Iterable[catalog_service.ProductCard]",
+    *,
+    catalog_id: int,
+    commit: bool = True,
+) -> list[int]:
+    """
+    Обновляет продукты по карточкам списка каталога, не открывая их страниц.
+
+    Новый продукт сохраняется с названием, ценой и миниатюрой из карточки в
+    каталоге ``catalog_id``; у существующего с той же ценой отмечается только
+    ``last_seen_at``, с другой - обновляется цена. Название существующего
+    продукта не трогаем: в карточке оно бывает сокращено. Описание и
+    изображения со страницы продукта карточка не содержит, поэтому у новых и
+    изменившихся продуктов ``content_hash`` сбрасывается.
+
+    Возвращает коды продуктов, которым нужна загрузка страницы: новые,
+    изменившиеся, еще не загружавшиеся целиком и с неполной карточкой.
+    """
+    unique_cards = {card.code: card for card in cards}
+    if not unique_cards:
+        return []
+
+    result = await async_session.execute(
+        select(
+            models.Product.code,
+            models.Product.id,
+            models.Product.price,
+            models.Product.content_hash,
+        ).where(models.Product.code.in_(unique_cards))
+    )
+    stored = {row.code: row for row in result.all()}
+
+    new_cards = []
+    changed_cards = []
+    unchanged_codes = []
+    stale_codes = []
+    for code, card in unique_cards.items():
+        if code not in stored:
+            if card.name is not None and card.price is not None:
+                new_cards.append(card)
+            stale_codes.append(code)
+            continue
+        if card.price is not None and card.price != stored[code].price:
+            changed_cards.append(card)
+            stale_codes.append(code)
+            continue
+        unchanged_codes.append(code)
+        if card.price is None or stored[code].content_hash is None:
+            stale_codes.append(code)
+
+    if new_cards:
+        product_ids = dict(
+            (
+                await async_session.execute(
+                    postgresql_insert(models.Product)
+                    .values(
+                        [
+                            {
+                                "code": card.code,
+                                "name": card.name,
+                                "price": card.price,
+                                "catalog_id": catalog_id,
+                            }
+                            for card in new_cards
+                        ]
+                    )
+                    .on_conflict_do_nothing(index_elements=[models.Product.code])
+                    .returning(models.Product.code, models.Product.id)
+                )
+            ).all()
+        )
+        images = [
+            {"url": card.thumbnail_url, "description": "", "product_id": product_id}
+            for card in new_cards
+            if card.thumbnail_url is not None
+            and (product_id := product_ids.get(card.code)) is not None
+        ]
+        if images:
+            await async_session.execute(insert(models.ProductImage).values(images))
+    if changed_cards:
+        table = models.Product.__table__
+        await async_session.execute(
+            update(table)
+            .where(table.c.code == bindparam("card_code"))
+            .values(
+                price=bindparam("card_price"),
+                content_hash=None,
+                last_seen_at=func.now(),
+                last_changed_at=func.now(),
+            ),
+            [
+                {"card_code": card.code, "card_price": card.price}
+                for card in changed_cards
+            ],
+        )
+    if unchanged_codes:
+        await async_session.execute(
+            update(models.Product)
+            .where(models.Product.code.in_(unchanged_codes))
+            .values(last_seen_at=func.now())
+        )
+    metrics.PRODUCTS.labels("written").inc(len(new_cards) + len(changed_cards))
+    metrics.PRODUCTS.labels("unchanged").inc(len(unchanged_codes))
+
+    cache.invalidate_on_commit(
+        async_session,
+        *(cache_service.product_key(stored[card.code].id) for card in changed_cards),
+    )
+    if commit:
+        await cache.commit(async_session)
+    return stale_codes
+
+
+async def get_stale_products(
+    async_session: AsyncSession, *, older_than: timedelta, limit: int = 100
+):
+    """Продукты, которые дольше всего не встречались при парсинге."""
+    result = await async_session.execute(
+        select(models.Product)
+        .options(selectinload(models.Product.images))
+        .where(models.Product.last_seen_at < func.now() - older_than)
+        .order_by(models.Product.last_seen_at)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
 async def upsert_parsed_product(
     *, async_session: AsyncSession, parsed_product: ParsedProduct
 ) -> schemas.Product:
     from ..catalogs import service as catalog_service
 
-    catalogs = await catalog_service.upsert_parsed_breadcrumb_catalogs(
-        async_session=async_session,
-        parsed_breadcrumb_catalogs=parsed_product.parsed_breadcrumb_catalogs,
-        commit=False,
-    )
-    product = parsed_product.product
-    product.catalog_id = catalogs[
-        parsed_product.parsed_breadcrumb_catalogs.last_catalog_code
-    ].id
-    return await upsert_product_by_code(async_session, product)
+    with metrics.stage("upsert"):
+        catalog_ids = await catalog_service.upsert_parsed_breadcrumb_catalogs(
+            async_session=async_session,
+            parsed_breadcrumb_catalogs=parsed_product.parsed_breadcrumb_catalogs,
+            commit=False,
+        )
+        product = parsed_product.product
+        product.catalog_id = catalog_ids[
+            parsed_product.parsed_breadcrumb_catalogs.last_catalog_code
+        ]
+        db_product = await upsert_product_by_code(
+            async_session, product, commit=False
+        )
+    with metrics.stage("commit"):
+        await cache.commit(async_session)
+    await async_session.refresh(db_product)
+    return db_product
 
 
 async def upsert_parsed_product_by_code(
-    *, driver: Chrome, async_session: AsyncSession, code: int
+    *, engine: "Engine", async_session: AsyncSession, code: int
 ) -> schemas.Product:
     return await upsert_parsed_product(
         async_session=async_session,
         parsed_product=await parse_product_by_code(
-            driver=driver, async_session=async_session, code=code
+            engine=engine, async_session=async_session, code=code
         ),
     )
 
 
 async def upsert_parsed_product_by_url(
-    *, driver: Chrome, async_session: AsyncSession, url: str
+    *, engine: "Engine", async_session: AsyncSession, url: str
 ) -> schemas.Product:
     return await upsert_parsed_product(
         async_session=async_session,
         parsed_product=await parse_product_by_url(
-            driver=driver, async_session=async_session, url=url
+            engine=engine, async_session=async_session, url=url
         ),
     )
 
 
 async def upsert_parsed_product_by_id(
-    *, driver: Chrome, async_session: AsyncSession, id: int
+    *, engine: "Engine", async_session: AsyncSession, id: int
 ) -> schemas.Product:
     return await upsert_parsed_product(
         async_session=async_session,
         parsed_product=await parse_product_by_id(
-            driver=driver, async_session=async_session, id=id
+            engine=engine, async_session=async_session, id=id
         ),
     )
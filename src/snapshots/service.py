@@ -0,0 +1,192 @@
+"""
+Хранилище снимков загруженных страниц.
+
+Сырой HTML каждой загрузки сохраняется по адресу содержимого (sha256),
+сжатым zstd: одинаковые страницы занимают место один раз. Отдельно для
+каждой загрузки пишется запись индекса с URL и временем загрузки, поэтому
+последний снимок страницы находится по URL без обращения к сайту.
+
+Раскладка ключей подходит и для каталога на диске, и для объектного
+хранилища::
+
+    objects/<hash[:2]>/<hash>.html.zst
+    index/<sha256(url)>/<время загрузки>.json
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import NamedTuple, Protocol
+
+FETCHED_AT_FORMAT = "%Y%m%dT%H%M%S.%fZ"
+
+
+class SnapshotBackend(Protocol):
+    """Хранилище байтов по ключу с перечислением ключей по префиксу."""
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def put(self, key: str, value: bytes) -> None: ...
+
+    async def exists(self, key: str) -> bool: ...
+
+    async def keys(self, prefix: str) -> list[str]: ...
+
+
+class DirectoryBackend:
+    """Файлы в локальном каталоге; запись атомарна через переименование."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def _get(self, key: str) -> bytes | None:
+        try:
+            return (self.root / key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _put(self, key: str, value: bytes) -> None:
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_name(
+            f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        temporary_path.write_bytes(value)
+        temporary_path.replace(path)
+
+    def _keys(self, prefix: str) -> list[str]:
+        directory = self.root / prefix
+        if not directory.is_dir():
+            return []
+        return sorted(
+            path.relative_to(self.root).as_posix()
+            for path in directory.rglob("*")
+            if path.is_file() and not path.name.startswith(".")
+        )
+
+    async def get(self, key: str) -> bytes | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key: str, value: bytes) -> None:
+        await asyncio.to_thread(self._put, key, value)
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread((self.root / key).is_file)
+
+    async def keys(self, prefix: str) -> list[str]:
+        return await asyncio.to_thread(self._keys, prefix)
+
+
+class InMemoryBackend:
+    """Объекты в памяти процесса; заменяет объектное хранилище в тестах."""
+
+    def __init__(self):
+        self.values: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.values.get(key)
+
+    async def put(self, key: str, value: bytes) -> None:
+        self.values[key] = value
+
+    async def exists(self, key: str) -> bool:
+        return key in self.values
+
+    async def keys(self, prefix: str) -> list[str]:
+        return sorted(key for key in self.values if key.startswith(prefix))
+
+
+class Snapshot(NamedTuple):
+    url: str
+    fetched_at: datetime
+    content_hash: str
+    size: int
+
+
+def _url_key(url: str) -> str:
+    return f"index/{hashlib.sha256(url.encode()).hexdigest()}/"
+
+
+def _object_key(content_hash: str) -> str:
+    return f"objects/{content_hash[:2]}/{content_hash}.html.zst"
+
+
+class SnapshotStore:
+    """Снимки страниц поверх ``SnapshotBackend``."""
+
+    def __init__(self, backend: SnapshotBackend, *, compression_level: int = 3):
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError(
+                "Page snapshots are enabled, but the zstandard package is not installed"
+            )
+        self.backend = backend
+        self._compressor = zstandard.ZstdCompressor(level=compression_level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    async def put(
+        self, url: str, html: str, *, fetched_at: datetime | None = None
+    ) -> Snapshot:
+        data = html.encode()
+        content_hash = hashlib.sha256(data).hexdigest()
+        object_key = _object_key(content_hash)
+        if not await self.backend.exists(object_key):
+            await self.backend.put(object_key, self._compressor.compress(data))
+
+        fetched_at = fetched_at or datetime.now(timezone.utc)
+        snapshot = Snapshot(url, fetched_at, content_hash, len(data))
+        await self.backend.put(
+            _url_key(url) + fetched_at.strftime(FETCHED_AT_FORMAT) + ".json",
+            json.dumps(
+                {
+                    "url": url,
+                    "fetched_at": fetched_at.isoformat(),
+                    "content_hash": content_hash,
+                    "size": len(data),
+                }
+            ).encode(),
+        )
+        return snapshot
+
+    async def history(self, url: str) -> list[Snapshot]:
+        """Все снимки страницы, от старых к новым."""
+        return [
+            await self._read_entry(key)
+            for key in await self.backend.keys(_url_key(url))
+        ]
+
+    async def latest(self, url: str) -> Snapshot | None:
+        keys = await self.backend.keys(_url_key(url))
+        if not keys:
+            return None
+        # Имена записей - время загрузки, поэтому последняя по порядку - новейшая.
+        return await self._read_entry(keys[-1])
+
+    async def iter_latest(self) -> AsyncIterator[Snapshot]:
+        """Последний снимок каждой сохраненной страницы."""
+        latest_keys: dict[str, str] = {}
+        for key in await self.backend.keys("index/"):
+            latest_keys[key.rsplit("/", 1)[0]] = key
+        for key in latest_keys.values():
+            yield await self._read_entry(key)
+
+    async def read(self, snapshot: Snapshot) -> str:
+        data = await self.backend.get(_object_key(snapshot.content_hash))
+        if data is None:
+            raise LookupError(f"Snapshot object {snapshot.content_hash} is missing")
+        return self._decompressor.decompress(data).decode()
+
+    async def _read_entry(self, key: str) -> Snapshot:
+        entry = json.loads(await self.backend.get(key))
+        return Snapshot(
+            entry["url"],
+            datetime.fromisoformat(entry["fetched_at"]),
+            entry["content_hash"],
+            entry["size"],
+        )
@@ -0,0 +1,143 @@
+"""
+Необязательная трассировка OpenTelemetry.
+
+Включается настройкой ``TRACING_EXPORTER`` (``otlp``, ``console`` или
+``file``) и требует пакетов ``opentelemetry-sdk`` и инструментаций
+FastAPI и SQLAlchemy. Без нее ``span`` ничего не делает, а пакеты
+OpenTelemetry не импортируются.
+
+Запрос к API становится корневым спаном, SQL-запросы и этапы парсинга
+(``metrics.stage``) - вложенными; параллельные загрузки продуктов в
+``asyncio.gather`` и вызовы в потоке драйвера наследуют текущий контекст.
+"""
+
+import contextlib
+from typing import Any, TextIO
+
+from fastapi import FastAPI
+from sqlalchemy import Engine
+
+EXPORTERS = ("otlp", "console", "file")
+
+_tracer = None
+_provider = None
+_app: FastAPI | None = None
+_file: TextIO | None = None
+
+
+def _create_exporter(exporter: str, *, otlp_endpoint: str | None, file: TextIO | None):
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+    if exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        # Без явного адреса экспортер берет OTEL_EXPORTER_OTLP_ENDPOINT.
+        return OTLPSpanExporter(endpoint=otlp_endpoint)
+    if exporter == "console":
+        return ConsoleSpanExporter()
+    if exporter == "file":
+        # По одному спану в строке, как в JSON Lines.
+        return ConsoleSpanExporter(
+            out=file,
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    raise ValueError(
+        f"Unknown tracing exporter: {exporter}, "
+        f"expected one of: {', '.join(EXPORTERS)}"
+    )
+
+
+def configure(
+    app: FastAPI,
+    engine: Engine,
+    *,
+    exporter: str | None,
+    service_name: str,
+    sample_ratio: float = 1.0,
+    otlp_endpoint: str | None = None,
+    file_path: str | None = None,
+) -> None:
+    """
+    Подключает трассировку к приложению и движку SQLAlchemy (для async -
+    ``engine.sync_engine``). Вызывается при запуске приложения, парно с
+    ``shutdown``: уже собранный стек middleware пересобирается с
+    middleware трассировки.
+    """
+    global _tracer, _provider, _app, _file
+
+    if exporter is None:
+        return
+    try:
+        from opentelemetry import trace
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+        from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError:
+        raise RuntimeError(
+            "TRACING_EXPORTER is set, but opentelemetry-sdk and its FastAPI and "
+            "SQLAlchemy instrumentations are not installed"
+        )
+
+    if exporter == "file":
+        _file = open(file_path, "a", encoding="utf-8")
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+    )
+    provider.add_span_processor(
+        BatchSpanProcessor(
+            _create_exporter(exporter, otlp_endpoint=otlp_endpoint, file=_file)
+        )
+    )
+    FastAPIInstrumentor.instrument_app(
+        app, tracer_provider=provider, excluded_urls="/metrics"
+    )
+    if app.middleware_stack is not None:
+        app.middleware_stack = app.build_middleware_stack()
+    SQLAlchemyInstrumentor().instrument(engine=engine, tracer_provider=provider)
+    _app = app
+    _provider = provider
+    _tracer = trace.get_tracer(__name__, tracer_provider=provider)
+
+
+def shutdown() -> None:
+    """
+    Отправляет накопленные спаны и снимает инструментацию; вызывается при
+    остановке приложения, после чего ``configure`` можно вызвать снова.
+    """
+    global _tracer, _provider, _app, _file
+
+    if _provider is None:
+        return
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+
+    FastAPIInstrumentor.uninstrument_app(_app)
+    SQLAlchemyInstrumentor().uninstrument()
+    _provider.shutdown()
+    if _file is not None:
+        _file.close()
+    _tracer = None
+    _provider = None
+    _app = None
+    _file = None
+
+
+def span(name: str, **attributes: Any):
+    """
+    Контекст дочернего спана текущей трассы; атрибуты со значением ``None``
+    пропускаются. Без настроенной трассировки ничего не делает.
+    """
+    if _tracer is None:
+        return contextlib.nullcontext()
+    return _tracer.start_as_current_span(
+        name,
+        attributes={
+            key: value for key, value in attributes.items() if value is not None
+        },
+    )
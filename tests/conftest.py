@@ -0,0 +1,11 @@
+import pytest
+
+
+@pytest.fixture
+def settings_env(monkeypatch):
+    """
+    Настройки для модулей, которые читают их при импорте (``database`` и все,
+    что его импортирует). Подключение к базе при этом не открывается.
+    """
+    monkeypatch.setenv("MODE", "test")
+    monkeypatch.setenv("POSTGRES_DSN", "postgresql+asyncpg://test@localhost/test")
@@ -0,0 +1,143 @@
+"""Общие подделки для тестов: хлебные крошки, продукты, движок, сессия, часы."""
+
+import asyncio
+import random
+from decimal import Decimal
+
+from src.catalogs import service
+from src.catalogs.exceptions import CatalogParserError
+from src.catalogs.schemas import CatalogCreate
+from src.products.exceptions import ProductParserError
+from src.products.schemas import ProductCreate
+from src.products.service import ParsedProduct
+
+
+def breadcrumbs(*codes: int) -> service.ParsedBreadcrumbCatalogs:
+    """Цепочка хлебных крошек от корня ``codes[0]`` до ``codes[-1]``."""
+    catalog_map = {code: CatalogCreate(code=code, name=f"Catalog {code}") for code in codes}
+    catalog_parent_map = dict(zip(codes, (None, *codes[:-1])))
+    return service.ParsedBreadcrumbCatalogs(catalog_map, catalog_parent_map, codes[-1])
+
+
+def trail(code: int, parents: dict[int, int | None]) -> list[int]:
+    """Коды от корня до ``code`` по карте ``{code: parent_code}``."""
+    codes = [code]
+    while parents.get(codes[0]) is not None:
+        codes.insert(0, parents[codes[0]])
+    return codes
+
+
+BREADCRUMBS = breadcrumbs(10)
+
+
+def parsed_product(code: int) -> ParsedProduct:
+    return ParsedProduct(
+        BREADCRUMBS, ProductCreate(code=code, name=str(code), price=1, catalog_id=0)
+    )
+
+
+def card(code: int, price: Decimal | None = Decimal("100")) -> service.ProductCard:
+    return service.ProductCard(code, str(code), price, None)
+
+
+class FakeEngine:
+    """
+    Движок без сети. ``pages`` - ``{код подраздела: [коды продуктов каждой
+    страницы]}``, ``children`` и ``parents`` - ссылки на подразделы и их
+    родители в хлебных крошках. Продукты из ``broken_codes`` падают с
+    ``ProductParserError``, загрузка продукта длится до ``delay`` секунд.
+    """
+
+    def __init__(
+        self,
+        pages: dict[int, list[list[int]]] | None = None,
+        *,
+        children: dict[int, list[int]] | None = None,
+        parents: dict[int, int | None] | None = None,
+        broken_codes=(),
+        delay: float = 0.0,
+    ):
+        self.pages = pages or {}
+        self.children = children or {}
+        self.parents = parents or {}
+        self.broken_codes = set(broken_codes)
+        self.delay = delay
+        self.catalog_requests: list[tuple[int, int]] = []
+        self.product_requests: list[int] = []
+        self.running = 0
+        self.max_running = 0
+
+    async def parse_catalog_page(self, code, page, limit):
+        self.catalog_requests.append((code, page))
+        pages = self.pages.get(code, [])
+        if page > len(pages):
+            raise CatalogParserError("Could not find product grid")
+        codes = pages[page - 1]
+        return service.ParsedCatalogPage(
+            codes,
+            breadcrumbs(*trail(code, self.parents)),
+            self.children.get(code, []),
+            tuple(card(code) for code in codes),
+        )
+
+    async def parse_product(self, code):
+        self.product_requests.append(code)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(random.uniform(0, self.delay))
+        finally:
+            self.running -= 1
+        if code in self.broken_codes:
+            raise ProductParserError("broken page")
+        return parsed_product(code)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def scalars(self):
+        return self
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+
+class RecordingSession:
+    """
+    Записывает запросы. Ответ на запрос - строки из ``respond(statement)``,
+    а без него - очередной список из ``results`` (когда они кончатся, пустой).
+    """
+
+    def __init__(self, *results, respond=None):
+        self.results = list(results)
+        self.respond = respond
+        self.statements = []
+        self.parameters = []
+        self.commits = 0
+        self.info = {}
+
+    async def execute(self, statement, parameters=None):
+        self.statements.append(statement)
+        self.parameters.append(parameters)
+        if self.respond is not None:
+            return FakeResult(self.respond(statement))
+        return FakeResult(self.results.pop(0) if self.results else [])
+
+    async def commit(self):
+        self.commits += 1
+
+    async def refresh(self, instance):
+        pass
+
+
+class Clock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
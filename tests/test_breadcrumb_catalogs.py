@@ -0,0 +1,46 @@
+import asyncio
+
+from fakes import RecordingSession, breadcrumbs
+from sqlalchemy.dialects import postgresql
+
+from src.catalogs import service
+
+
+def returning_ids(statement):
+    """``RETURNING code, id`` с id = code * 10 для всех кодов запроса."""
+    parameters = statement.compile().params
+    codes = [value for key, value in parameters.items() if key.startswith("code")]
+    return [(code, code * 10) for code in codes]
+
+
+def test_in_levels_groups_catalogs_by_depth():
+    tree = breadcrumbs(1, 44, 2649).union(breadcrumbs(1, 45)).union(breadcrumbs(2, 46))
+
+    levels = [[catalog.code for catalog in level] for level in tree.in_levels()]
+
+    assert levels == [[1, 2], [44, 45, 46], [2649]]
+
+
+def test_upsert_parsed_breadcrumb_catalogs_issues_one_upsert_per_level():
+    tree = breadcrumbs(1, 44, 2649).union(breadcrumbs(1, 45))
+    session = RecordingSession(respond=returning_ids)
+
+    catalog_ids = asyncio.run(service.upsert_parsed_breadcrumb_catalogs(session, tree))
+
+    assert catalog_ids == {1: 10, 44: 440, 45: 450, 2649: 26490}
+    upserts = [
+        statement for statement in session.statements if statement.is_insert
+    ]
+    assert len(upserts) == 3
+    # На каждый уровень - еще одна проверка таблицы замыкания; дерево
+    # в ней уже актуально, поэтому вставок в нее нет.
+    assert len(session.statements) == 6
+
+
+def test_trail_root_keeps_the_stored_parent():
+    session = RecordingSession(respond=returning_ids)
+    # Неполная цепочка: 44 пришел корнем, хотя в базе у него есть родитель 1.
+    asyncio.run(service.upsert_parsed_breadcrumb_catalogs(session, breadcrumbs(44)))
+
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "parent_id = coalesce(excluded.parent_id, catalogs.parent_id)" in sql
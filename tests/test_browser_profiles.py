@@ -0,0 +1,69 @@
+import pytest
+
+from src.drivers import pool
+from src.drivers.profiles import PROFILES, get_profile
+
+
+class FakeChrome:
+    def __init__(self, options, headless=False):
+        self.options = options
+        self.headless = headless
+        self.cdp_commands = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp_commands.append((command, params))
+
+
+def test_lean_profile_blocks_resources_and_trackers():
+    blocked_urls = PROFILES["lean"].blocked_urls()
+
+    assert "*.jpg*" in blocked_urls
+    assert "*.woff*" in blocked_urls
+    assert "*.css*" in blocked_urls
+    assert "*mc.yandex.ru*" in blocked_urls
+
+
+def test_full_profile_blocks_nothing():
+    assert PROFILES["full"].blocked_urls() == []
+
+
+def test_get_profile_overrides_block_lists():
+    profile = get_profile(
+        "lean", blocked_resource_types=["image"], blocked_domains=["ads.example"]
+    )
+
+    assert profile.page_load_strategy == "eager"
+    assert "*.css*" not in profile.blocked_urls()
+    assert profile.blocked_urls()[-1] == "*ads.example*"
+
+
+def test_get_profile_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        get_profile("turbo")
+    with pytest.raises(ValueError):
+        get_profile("lean", blocked_resource_types=["video"])
+
+
+def test_create_driver_applies_lean_profile(monkeypatch):
+    monkeypatch.setattr(pool, "PooledChrome", FakeChrome)
+
+    driver = pool.create_driver(PROFILES["lean"])
+
+    assert driver.headless
+    assert driver.options.page_load_strategy == "eager"
+    assert "--disable-gpu" in driver.options.arguments
+    assert "--disable-extensions" in driver.options.arguments
+    assert driver.cdp_commands == [
+        ("Network.enable", {}),
+        ("Network.setBlockedURLs", {"urls": PROFILES["lean"].blocked_urls()}),
+    ]
+
+
+def test_create_driver_full_profile_skips_cdp(monkeypatch):
+    monkeypatch.setattr(pool, "PooledChrome", FakeChrome)
+
+    driver = pool.create_driver(PROFILES["full"])
+
+    assert not driver.headless
+    assert driver.options.page_load_strategy == "normal"
+    assert driver.cdp_commands == []
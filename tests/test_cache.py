@@ -0,0 +1,98 @@
+import asyncio
+
+from fakes import Clock, RecordingSession
+
+from src.cache.service import InMemoryBackend, LocalCache, ReadThroughCache
+from src.catalogs.schemas import Catalog
+
+
+def test_local_cache_expires_and_evicts_least_recently_used():
+    clock = Clock()
+    local = LocalCache(max_size=2, ttl=10, clock=clock)
+    local.set("a", 1)
+    local.set("b", 2)
+    assert local.get("a") == 1
+    local.set("c", 3)
+
+    assert local.get("b") is None
+    assert local.evictions == 1
+    clock.now = 10
+    assert local.get("a") is None
+
+
+def test_read_through_cache_uses_both_tiers_and_invalidates():
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return Catalog(id=1, code=10, name="Книги")
+
+    async def scenario():
+        shared = InMemoryBackend()
+        cache = ReadThroughCache(shared=shared)
+        # Другая реплика: свой локальный уровень, общий Redis.
+        replica = ReadThroughCache(shared=shared)
+
+        assert (await cache.get_or_load("catalog:1", Catalog, load)).name == "Книги"
+        await cache.get_or_load("catalog:1", Catalog, load)
+        assert await replica.get_or_load("catalog:1", Catalog, load) == Catalog(
+            id=1, code=10, name="Книги"
+        )
+        await cache.invalidate("catalog:1")
+        await cache.get_or_load("catalog:1", Catalog, load)
+        return cache.stats(), replica.stats()
+
+    stats, replica_stats = asyncio.run(scenario())
+
+    assert len(loads) == 2
+    assert (stats.local.hits, stats.local.misses) == (1, 2)
+    assert (stats.shared.hits, stats.shared.misses) == (0, 2)
+    assert (replica_stats.shared.hits, replica_stats.loads) == (1, 0)
+    assert stats.invalidations == 1
+
+
+def test_shared_tier_errors_fall_back_to_load():
+    class BrokenBackend(InMemoryBackend):
+        async def get(self, key):
+            raise ConnectionError
+
+        async def set(self, key, value, ttl):
+            raise ConnectionError
+
+    async def load():
+        return Catalog(id=1, code=10, name="Книги")
+
+    cache = ReadThroughCache(shared=BrokenBackend())
+    catalog = asyncio.run(cache.get_or_load("catalog:1", Catalog, load))
+
+    assert catalog.code == 10
+    assert cache.stats().loads == 1
+
+
+def test_invalidation_waits_for_commit():
+    session = RecordingSession()
+    commits_at_delete = []
+
+    class Backend(InMemoryBackend):
+        async def delete(self, *keys):
+            commits_at_delete.append(session.commits)
+            await super().delete(*keys)
+
+    async def load():
+        return Catalog(id=1, code=10, name="Книги")
+
+    async def scenario():
+        cache = ReadThroughCache(shared=Backend())
+        await cache.get_or_load("catalog:1", Catalog, load)
+
+        cache.invalidate_on_commit(session, "catalog:1")
+        cached_before_commit = cache.local.get("catalog:1") is not None
+        await cache.commit(session)
+        return cached_before_commit, cache.local.get("catalog:1")
+
+    cached_before_commit, cached_after_commit = asyncio.run(scenario())
+
+    assert cached_before_commit
+    assert cached_after_commit is None
+    assert commits_at_delete == [1]
+    assert session.info == {}
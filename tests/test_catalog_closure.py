@@ -0,0 +1,47 @@
+import asyncio
+
+from fakes import RecordingSession
+from sqlalchemy.dialects import postgresql
+
+from src.catalogs import closure
+
+
+def compiled(session) -> list[str]:
+    return [
+        str(
+            statement.compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        )
+        for statement in session.statements
+    ]
+
+
+def test_unchanged_tree_costs_one_query():
+    session = RecordingSession([])
+    asyncio.run(closure.sync_catalog_closure(session, [1, 2, 3]))
+
+    assert len(session.statements) == 1
+
+
+def test_new_catalogs_are_inserted_parents_first():
+    # (id, parent_id, depth строки на себя): 1 - корень, 2 - его ребенок,
+    # 3 - ребенок уже существующего каталога 10.
+    session = RecordingSession([(2, 1, None), (1, None, None), (3, 10, None)])
+    asyncio.run(closure.sync_catalog_closure(session, [1, 2, 3]))
+
+    inserts = compiled(session)[1:]
+    assert len(inserts) == 2
+    assert "catalogs.id IN (1, 3)" in inserts[0]
+    assert "catalogs.id IN (2)" in inserts[1]
+    assert all("ON CONFLICT DO NOTHING" in insert for insert in inserts)
+
+
+def test_moved_catalog_is_detached_and_reattached():
+    session = RecordingSession([(5, 7, 0)])
+    asyncio.run(closure.sync_catalog_closure(session, [5]))
+
+    detach, attach = compiled(session)[1:]
+    assert detach.startswith("DELETE FROM catalog_closure")
+    assert "catalog_closure_1.descendant_id = 7" in attach
+    assert "catalog_closure_2.ancestor_id = 5" in attach
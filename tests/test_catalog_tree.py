@@ -0,0 +1,96 @@
+import pytest
+from fakes import breadcrumbs
+
+from src.catalogs.schemas import CatalogCreate
+from src.catalogs.tree import CatalogConflict, CatalogTree
+
+
+def codes(catalogs):
+    return [catalog.code for catalog in catalogs]
+
+
+def test_merge_matches_union():
+    trails = [breadcrumbs(1, 44, 2649), breadcrumbs(1, 45), breadcrumbs(2, 46)]
+    union = trails[0].union(trails[1]).union(trails[2])
+
+    tree = CatalogTree.from_breadcrumbs(*trails)
+
+    assert len(tree) == 6
+    order = codes(tree.in_order())
+    assert sorted(order) == sorted(codes(union.in_order()))
+    assert all(
+        union.catalog_parent_map[code] is None
+        or order.index(union.catalog_parent_map[code]) < order.index(code)
+        for code in order
+    )
+    assert [codes(level) for level in tree.in_levels()] == [[1, 2], [44, 45, 46], [2649]]
+    assert tree.parent_code(2649) == 44
+
+
+def test_repeated_catalogs_share_one_instance():
+    first = breadcrumbs(1, 44)
+    tree = CatalogTree.from_breadcrumbs(first, breadcrumbs(1, 44, 2649))
+
+    assert tree.catalog(44) is first.catalog_map[44]
+    assert tree.conflicts == []
+
+
+def test_order_is_extended_without_resorting():
+    tree = CatalogTree.from_breadcrumbs(breadcrumbs(1, 44))
+    order = tree._order
+
+    tree.merge(breadcrumbs(1, 44, 2649))
+
+    assert tree._order is order
+    assert codes(tree.in_order()) == [1, 44, 2649]
+
+
+def test_child_before_parent():
+    tree = CatalogTree()
+    tree.add(CatalogCreate(code=44, name="Catalog 44"), 1)
+    tree.add(CatalogCreate(code=1, name="Catalog 1"), None)
+
+    assert codes(tree.in_order()) == [1, 44]
+    assert [codes(level) for level in tree.in_levels()] == [[1], [44]]
+
+
+def test_conflicting_parent_is_detected_and_last_wins():
+    tree = CatalogTree.from_breadcrumbs(breadcrumbs(1, 44), breadcrumbs(2, 44))
+
+    assert tree.conflicts == [CatalogConflict(44, 1, 2)]
+    assert tree.parent_code(44) == 2
+    assert [codes(level) for level in tree.in_levels()] == [[1, 2], [44]]
+
+
+def test_renamed_catalog_replaces_cached_order():
+    tree = CatalogTree.from_breadcrumbs(breadcrumbs(1, 44))
+    tree.in_order()
+
+    tree.add(CatalogCreate(code=44, name="Renamed"), 1)
+
+    assert tree.in_order()[1].name == "Renamed"
+
+
+def test_cycle_is_rejected():
+    tree = CatalogTree()
+    tree.add(CatalogCreate(code=1, name="Catalog 1"), 2)
+    tree.add(CatalogCreate(code=2, name="Catalog 2"), 1)
+
+    with pytest.raises(ValueError):
+        tree.in_order()
+
+
+def test_missing_parent_keeps_known_parent():
+    tree = CatalogTree.from_breadcrumbs(breadcrumbs(1, 44), breadcrumbs(44, 2649))
+
+    assert tree.conflicts == []
+    assert tree.parent_code(44) == 1
+    assert [codes(level) for level in tree.in_levels()] == [[1], [44], [2649]]
+
+
+def test_parent_found_later_is_not_a_conflict():
+    tree = CatalogTree.from_breadcrumbs(breadcrumbs(44, 2649), breadcrumbs(1, 44))
+
+    assert tree.conflicts == []
+    assert tree.parent_code(44) == 1
+    assert [codes(level) for level in tree.in_levels()] == [[1], [44], [2649]]
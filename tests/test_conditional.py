@@ -0,0 +1,93 @@
+from datetime import datetime, timezone
+
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from src import conditional
+from src.products import service
+from src.products.schemas import Product
+
+LAST_MODIFIED = datetime(2026, 10, 18, 12, 30, 15, 500000, tzinfo=timezone.utc)
+ETAG = conditional.make_etag("product", 1)
+
+app = FastAPI()
+serialized = []
+
+
+@app.get("/resource")
+async def read_resource(request: Request, response: Response):
+    not_modified = conditional.check_not_modified(
+        request, response, etag=ETAG, last_modified=LAST_MODIFIED
+    )
+    if not_modified:
+        return not_modified
+    serialized.append(1)
+    return {"name": "product"}
+
+
+client = TestClient(app)
+
+
+def test_response_carries_validators():
+    response = client.get("/resource")
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == ETAG
+    assert response.headers["last-modified"] == "Sun, 18 Oct 2026 12:30:15 GMT"
+
+
+def test_matching_etag_returns_304_without_body():
+    serialized.clear()
+    response = client.get(
+        "/resource", headers={"If-None-Match": f'"other", {ETAG.removeprefix("W/")}'}
+    )
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == ETAG
+    assert serialized == []
+
+
+def test_if_modified_since_is_ignored_when_etag_is_sent():
+    response = client.get(
+        "/resource",
+        headers={
+            "If-None-Match": '"stale"',
+            "If-Modified-Since": "Sun, 18 Oct 2026 12:30:15 GMT",
+        },
+    )
+
+    assert response.status_code == 200
+
+
+def test_if_modified_since():
+    assert (
+        client.get(
+            "/resource", headers={"If-Modified-Since": "Sun, 18 Oct 2026 12:30:15 GMT"}
+        ).status_code
+        == 304
+    )
+    assert (
+        client.get(
+            "/resource", headers={"If-Modified-Since": "Sun, 18 Oct 2026 12:30:14 GMT"}
+        ).status_code
+        == 200
+    )
+
+
+def test_product_validators_follow_last_seen_at():
+    product = Product(
+        id=1,
+        code=1234567,
+        name="Ведьмак",
+        price=7500,
+        catalog_id=1,
+        content_hash="hash",
+        last_seen_at=LAST_MODIFIED,
+        last_changed_at=LAST_MODIFIED,
+    )
+    seen_again = product.model_copy(update={"last_seen_at": LAST_MODIFIED.replace(hour=13)})
+
+    assert service.product_etag(seen_again) != service.product_etag(product)
+    assert service.product_last_modified(seen_again) == seen_again.last_seen_at
+    assert service.product_last_modified(product.model_copy(update={"last_seen_at": None})) == LAST_MODIFIED
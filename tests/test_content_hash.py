@@ -0,0 +1,39 @@
+from decimal import Decimal
+
+from src.products import models, schemas, service
+
+
+def make_product(**changes):
+    data = dict(
+        code=1,
+        name="Книга",
+        description="Описание",
+        price=Decimal("1500"),
+        catalog_id=0,
+        images=[schemas.ProductImageCreate(url="https://example.com/1.jpg", description="")],
+    )
+    return schemas.ProductCreate(**(data | changes))
+
+
+def test_content_hash_ignores_catalog_and_price_formatting():
+    assert service.compute_content_hash(make_product()) == service.compute_content_hash(
+        make_product(catalog_id=5, price=Decimal("1500.00"))
+    )
+
+
+def test_content_hash_changes_with_content():
+    content_hash = service.compute_content_hash(make_product())
+
+    assert content_hash != service.compute_content_hash(make_product(price=1600))
+    assert content_hash != service.compute_content_hash(make_product(images=[]))
+
+
+def test_content_hash_matches_stored_product():
+    product_in = make_product()
+    db_product = models.Product(**product_in.model_dump(exclude={"images"}))
+    for image_in in product_in.images:
+        db_product.images.append(models.ProductImage(**image_in.model_dump()))
+
+    assert service.compute_content_hash(db_product) == service.compute_content_hash(
+        product_in
+    )
@@ -0,0 +1,102 @@
+import asyncio
+
+from fakes import FakeEngine
+
+from src.catalogs import crawler, service
+from src.jobs.service import JobProgress
+
+# Подраздел -> страницы -> коды продуктов; 10 -> 11 -> 12 образуют дерево.
+PAGES = {
+    10: [[1, 2], [3], [3]],
+    11: [[2, 4]],
+    12: [[5]],
+}
+CHILDREN = {10: [11], 11: [12, 10], 12: []}
+PARENTS = {10: None, 11: 10, 12: 11}
+
+
+def tree_engine():
+    return FakeEngine(PAGES, children=CHILDREN, parents=PARENTS, broken_codes={4})
+
+
+def crawl(engine, max_depth, monkeypatch):
+    saved = []
+
+    async def fake_upsert(*, async_session, parsed_catalog_products):
+        saved.extend(product.code for product in parsed_catalog_products.products)
+
+    monkeypatch.setattr(service, "upsert_parsed_catalog_products", fake_upsert)
+    progress = JobProgress()
+    asyncio.run(
+        crawler.crawl_catalog(
+            engine=engine,
+            async_session=None,
+            code=10,
+            max_depth=max_depth,
+            max_pages=10,
+            concurrency=2,
+            progress=progress,
+        )
+    )
+    return saved, progress
+
+
+def test_crawl_follows_pages_and_subsections_without_duplicates(monkeypatch):
+    engine = tree_engine()
+
+    saved, progress = crawl(engine, max_depth=2, monkeypatch=monkeypatch)
+
+    assert saved == [1, 2, 3, 5]
+    assert sorted(engine.product_requests) == [1, 2, 3, 4, 5]
+    assert engine.catalog_requests == [(10, 1), (10, 2), (10, 3), (11, 1), (11, 2), (12, 1), (12, 2)]
+    assert (progress.total, progress.succeeded, progress.failed) == (5, 4, 1)
+
+
+def test_crawl_stops_at_max_depth(monkeypatch):
+    engine = tree_engine()
+
+    saved, _ = crawl(engine, max_depth=0, monkeypatch=monkeypatch)
+
+    assert saved == [1, 2, 3]
+    assert {code for code, _ in engine.catalog_requests} == {10}
+
+
+def test_child_repeating_its_parent_is_paginated(monkeypatch):
+    engine = FakeEngine(
+        {10: [[1, 2]], 11: [[1, 2], [6]]}, children={10: [11]}, parents={11: 10}
+    )
+
+    saved, _ = crawl(engine, max_depth=1, monkeypatch=monkeypatch)
+
+    assert saved == [1, 2, 6]
+    assert (11, 2) in engine.catalog_requests
+
+
+def test_foreign_menu_link_is_not_followed(monkeypatch):
+    # 99 - ссылка из меню на чужой раздел 50, а 13 - ребенок 99.
+    engine = FakeEngine(
+        {10: [[1]], 99: [[7]], 13: [[8]]},
+        children={10: [99], 99: [13]},
+        parents={99: 50, 13: 99},
+    )
+
+    saved, progress = crawl(engine, max_depth=2, monkeypatch=monkeypatch)
+
+    assert saved == [1]
+    assert engine.catalog_requests == [(10, 1), (10, 2), (99, 1)]
+    assert progress.failed == 0
+
+
+def test_section_without_grid_leads_to_subsections(monkeypatch):
+    # У раздела 10 нет сетки товаров, только ссылки на подразделы.
+    engine = FakeEngine(
+        {10: [[]], 11: [[1, 2]], 12: [[3]]},
+        children={10: [11, 12]},
+        parents={11: 10, 12: 10},
+    )
+
+    saved, progress = crawl(engine, max_depth=1, monkeypatch=monkeypatch)
+
+    assert saved == [1, 2, 3]
+    assert engine.catalog_requests == [(10, 1), (11, 1), (11, 2), (12, 1), (12, 2)]
+    assert progress.failed == 0
@@ -0,0 +1,132 @@
+import asyncio
+import threading
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from src.drivers.exceptions import DriverPoolExhaustedError
+from src.drivers.pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.pages = 0
+        self.alive = True
+        self.quit_called = False
+
+    def get(self, url):
+        self.pages += 1
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise WebDriverException("browser crashed")
+
+    def quit(self):
+        self.quit_called = True
+
+
+def make_pool(**kwargs) -> tuple[DriverPool, list[FakeDriver]]:
+    created = []
+
+    def factory():
+        driver = FakeDriver()
+        created.append(driver)
+        return driver
+
+    options = dict(size=2, max_pages=3, lease_timeout=1.0, health_check_interval=60.0)
+    options.update(kwargs)
+    return DriverPool(factory, **options), created
+
+
+def test_driver_is_reused_between_leases():
+    async def scenario():
+        pool, created = make_pool()
+        await pool.warm_up()
+        async with pool.lease() as first:
+            await first.get("page")
+        async with pool.lease() as second:
+            pass
+        await pool.close()
+        return created, first, second
+
+    created, first, second = asyncio.run(scenario())
+    assert len(created) == 2
+    assert first is second
+
+
+def test_driver_is_recycled_after_max_pages():
+    async def scenario():
+        pool, created = make_pool(size=1)
+        async with pool.lease() as driver:
+            for _ in range(3):
+                await driver.get("page")
+        async with pool.lease() as replacement:
+            pass
+        stats = pool.stats()
+        await pool.close()
+        return driver, replacement, stats
+
+    driver, replacement, stats = asyncio.run(scenario())
+    assert driver.driver.quit_called
+    assert replacement is not driver
+    assert stats.recycled == 1
+
+
+def test_crashed_driver_is_replaced():
+    async def scenario():
+        pool, created = make_pool(size=1)
+        with pytest.raises(WebDriverException):
+            async with pool.lease() as driver:
+                driver.driver.alive = False
+                raise WebDriverException("tab crashed")
+        async with pool.lease() as replacement:
+            pass
+        stats = pool.stats()
+        await pool.close()
+        return driver, replacement, stats
+
+    driver, replacement, stats = asyncio.run(scenario())
+    assert replacement is not driver
+    assert stats.crashed == 1
+
+
+def test_lease_times_out_when_pool_is_busy():
+    async def scenario():
+        pool, _ = make_pool(size=1, lease_timeout=0.05)
+        async with pool.lease():
+            with pytest.raises(DriverPoolExhaustedError):
+                async with pool.lease():
+                    pass
+        stats = pool.stats()
+        await pool.close()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats.leases == 1
+    assert stats.in_use == 0
+
+
+def test_driver_calls_run_off_the_event_loop():
+    async def scenario():
+        pool, _ = make_pool(size=1)
+        async with pool.lease() as driver:
+            thread_name = await driver.run(lambda _: threading.current_thread().name)
+        await pool.close()
+        return thread_name
+
+    assert asyncio.run(scenario()) != threading.main_thread().name
+
+
+def test_close_quits_leased_drivers():
+    async def scenario():
+        pool, created = make_pool(size=2)
+        await pool.warm_up()
+        async with pool.lease() as leased:
+            await pool.close()
+            quit_during_lease = leased.driver.quit_called
+        return created, quit_during_lease, pool.stats()
+
+    created, quit_during_lease, stats = asyncio.run(scenario())
+    assert quit_during_lease
+    assert all(driver.quit_called for driver in created)
+    assert stats.idle == 0
@@ -0,0 +1,144 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+from fakes import Clock
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from src.parsing import fetch_cache
+from src.parsing.engines import HttpEngine
+from src.parsing.fetch_cache import FetchCache
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PRODUCT_URL = "https://www.flip.kz/catalog?prod=1234567"
+CATALOG_URL = "https://www.flip.kz/catalog?subsection=2649&page=1"
+
+
+class FlipServer:
+    """Отдает страницу продукта с ETag и отвечает 304 на совпадающий If-None-Match."""
+
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+        self.etag = '"v1"'
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304, headers={"ETag": self.etag})
+        return httpx.Response(
+            200,
+            text=(FIXTURES / "product.html").read_text(encoding="utf-8"),
+            headers={"ETag": self.etag},
+        )
+
+
+def make_cache(tmp_path, clock, **kwargs) -> FetchCache:
+    options = dict(max_bytes=10_000_000, product_ttl=60, catalog_ttl=10, clock=clock)
+    options.update(kwargs)
+    return FetchCache(tmp_path, **options)
+
+
+def test_fresh_pages_are_served_without_requests(tmp_path):
+    server = FlipServer()
+    clock = Clock(1_000_000.0)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as client:
+            engine = HttpEngine(client, cache=make_cache(tmp_path, clock))
+            first = await engine.parse_product(1234567)
+            clock.now += 30
+            second = await engine.parse_product(1234567)
+            return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert second == first
+    assert len(server.requests) == 1
+
+
+def test_stale_pages_are_revalidated(tmp_path):
+    server = FlipServer()
+    clock = Clock(1_000_000.0)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as client:
+            engine = HttpEngine(client, cache=make_cache(tmp_path, clock))
+            await engine.parse_product(1234567)
+            clock.now += 120
+            parsed = await engine.parse_product(1234567)
+            clock.now += 30
+            await engine.parse_product(1234567)
+            return parsed
+
+    parsed = asyncio.run(scenario())
+
+    assert parsed.product.code == 1234567
+    assert [request.headers.get("if-none-match") for request in server.requests] == [
+        None,
+        '"v1"',
+    ]
+
+
+def test_bypass_skips_lookup_but_refreshes_the_entry(tmp_path):
+    server = FlipServer()
+    clock = Clock(1_000_000.0)
+    cache = make_cache(tmp_path, clock)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as client:
+            engine = HttpEngine(client, cache=cache)
+            await engine.parse_product(1234567)
+            server.etag = '"v2"'
+            with fetch_cache.bypass():
+                await engine.parse_product(1234567)
+            return await cache.get(PRODUCT_URL)
+
+    cached = asyncio.run(scenario())
+
+    assert len(server.requests) == 2
+    assert "if-none-match" not in server.requests[1].headers
+    assert cached.etag == '"v2"'
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    clock = Clock(1_000_000.0)
+    page = "x" * 1000
+    urls = [f"https://www.flip.kz/catalog?prod={code}" for code in range(3)]
+
+    async def scenario():
+        cache = make_cache(tmp_path, clock, max_bytes=2500)
+        await cache.put(urls[0], page)
+        await cache.put(urls[1], page)
+        await cache.get(urls[0])
+        await cache.put(urls[2], page)
+        return cache, [await cache.get(url) is not None for url in urls]
+
+    cache, present = asyncio.run(scenario())
+
+    assert present == [True, False, True]
+    assert cache.evictions == 1
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    assert make_cache(tmp_path, clock).size == cache.size
+
+
+def test_ttl_depends_on_url_class(tmp_path):
+    cache = make_cache(tmp_path, Clock(1_000_000.0))
+
+    assert cache.ttl(PRODUCT_URL) == 60
+    assert cache.ttl(CATALOG_URL) == 10
+    assert cache.ttl("https://www.flip.kz/") == 0
+
+
+def test_bypass_flag_reaches_the_endpoint(settings_env):
+    from src.dependencies import bypass_fetch_cache
+
+    app = FastAPI()
+
+    @app.post("/parse", dependencies=[Depends(bypass_fetch_cache)])
+    async def parse():
+        return {"bypassed": fetch_cache.bypassed()}
+
+    client = TestClient(app)
+    assert client.post("/parse").json() == {"bypassed": False}
+    assert client.post("/parse?bypass_cache=true").json() == {"bypassed": True}
@@ -0,0 +1,130 @@
+import asyncio
+from decimal import Decimal
+from pathlib import Path
+
+import httpx
+import lxml.html
+import pytest
+
+from src.catalogs.exceptions import CatalogParserError
+from src.catalogs.service import ParsedCatalogPage
+from src.parsing import html
+from src.parsing.engines import FallbackEngine, HttpEngine
+from src.products.exceptions import ProductParserError
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PRODUCT_URL = "https://www.flip.kz/catalog?prod=1234567"
+CATALOG_URL = "https://www.flip.kz/catalog?subsection=2649&page=1"
+
+
+def read_fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def test_parse_product():
+    parsed = html.parse_product(read_fixture("product.html"), url=PRODUCT_URL, code=1234567)
+
+    product = parsed.product
+    assert product.code == 1234567
+    assert product.name == "Гарри Поттер и философский камень"
+    assert product.description == "Первая книга серии о юном волшебнике."
+    assert product.price == Decimal("12345")
+    assert [image.url for image in product.images] == [
+        "https://s.f.kz/prod/1234/1234567_550.jpg",
+        "https://www.flip.kz/prod/1234/1234567_2_550.jpg",
+    ]
+    assert product.images[0].description == "Гарри Поттер и философский камень, обложка"
+
+    breadcrumbs = parsed.parsed_breadcrumb_catalogs
+    assert [catalog.code for catalog in breadcrumbs.in_order()] == [1, 44, 2649]
+    assert breadcrumbs.catalog_parent_map == {1: None, 44: 1, 2649: 44}
+    assert breadcrumbs.catalog_map[2649].name == "Фэнтези"
+    assert breadcrumbs.last_catalog_code == 2649
+
+
+def test_parse_catalog_page():
+    parsed = html.parse_catalog_page(read_fixture("catalog.html"), url=CATALOG_URL, limit=10)
+
+    assert parsed.product_codes == [1234567, 2345678, 3456789]
+    assert parsed.parsed_breadcrumb_catalogs.last_catalog_code == 2649
+    assert parsed.subsection_codes == [2650, 2651]
+
+
+def test_parse_catalog_page_product_cards():
+    parsed = html.parse_catalog_page(read_fixture("catalog.html"), url=CATALOG_URL, limit=10)
+
+    card = parsed.product_cards[0]
+    assert card.code == 1234567
+    assert card.name == "Гарри Поттер и философский камень"
+    assert card.price == Decimal("12345")
+    assert card.thumbnail_url == "https://www.flip.kz/prod/1234/1234567_150.jpg"
+    assert [card.code for card in parsed.product_cards] == parsed.product_codes
+
+
+def test_parse_catalog_page_respects_limit():
+    parsed = html.parse_catalog_page(read_fixture("catalog.html"), url=CATALOG_URL, limit=2)
+
+    assert parsed.product_codes == [1234567, 2345678]
+
+
+def test_parse_product_without_product_block():
+    with pytest.raises(ProductParserError):
+        html.parse_product(read_fixture("catalog.html"), url=PRODUCT_URL, code=1234567)
+
+
+def test_parse_catalog_page_without_grid():
+    with pytest.raises(CatalogParserError):
+        html.parse_catalog_page(
+            "<html><body>Checking your browser...</body></html>", url=CATALOG_URL, limit=10
+        )
+
+
+def test_parse_catalog_page_of_section_without_grid():
+    document = lxml.html.document_fromstring(read_fixture("catalog.html"))
+    for grid in document.find_class("good-grid"):
+        grid.drop_tree()
+
+    parsed = html.parse_catalog_page(lxml.html.tostring(document, encoding="unicode"), url=CATALOG_URL, limit=10)
+
+    assert parsed.product_codes == []
+    assert parsed.subsection_codes == [2650, 2651]
+    assert parsed.parsed_breadcrumb_catalogs.last_catalog_code == 2649
+
+
+def serve_fixtures(request: httpx.Request) -> httpx.Response:
+    if "prod" in request.url.params:
+        return httpx.Response(200, text=read_fixture("product.html"))
+    if "subsection" in request.url.params:
+        return httpx.Response(200, text=read_fixture("catalog.html"))
+    return httpx.Response(404)
+
+
+def test_http_engine_parses_served_pages():
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(serve_fixtures)) as client:
+            engine = HttpEngine(client)
+            return (
+                await engine.parse_product(1234567),
+                await engine.parse_catalog_page(2649, 1, 10),
+            )
+
+    parsed_product, parsed_page = asyncio.run(scenario())
+    assert parsed_product.product.name == "Гарри Поттер и философский камень"
+    assert parsed_page.product_codes == [1234567, 2345678, 3456789]
+
+
+def test_fallback_engine_retries_with_fallback():
+    class ChallengeEngine(HttpEngine):
+        async def fetch(self, url: str) -> str:
+            return "<html><body>Checking your browser...</body></html>"
+
+    class StaticEngine:
+        async def parse_catalog_page(self, code, page, limit):
+            return ParsedCatalogPage([1], None, [])
+
+    async def scenario():
+        async with httpx.AsyncClient() as client:
+            engine = FallbackEngine(ChallengeEngine(client), StaticEngine())
+            return await engine.parse_catalog_page(2649, 1, 10)
+
+    assert asyncio.run(scenario()).product_codes == [1]
@@ -0,0 +1,172 @@
+import asyncio
+import contextlib
+from types import SimpleNamespace
+
+import pytest
+from fakes import RecordingSession
+from sqlalchemy.dialects import postgresql
+
+from src.jobs import models, schemas, service
+
+
+def compile(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def job(status=schemas.JobStatus.QUEUED, attempts=0, max_attempts=3):
+    return models.Job(
+        id=1,
+        kind="product",
+        params={},
+        status=status,
+        attempts=attempts,
+        max_attempts=max_attempts,
+    )
+
+
+def test_claim_skips_locked_and_delayed_jobs():
+    session = RecordingSession([job()])
+
+    claimed = asyncio.run(service.claim_job(session, stale_after=60))
+
+    assert claimed.status == schemas.JobStatus.RUNNING
+    assert claimed.attempts == 1
+    sql = compile(session.statements[0])
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "jobs.run_after IS NULL OR jobs.run_after <= now()" in sql
+    assert "jobs.heartbeat_at < now() - " in sql
+
+
+def test_stale_running_job_is_reclaimed_as_a_new_attempt():
+    stale = job(status=schemas.JobStatus.RUNNING, attempts=1)
+
+    claimed = asyncio.run(service.claim_job(RecordingSession([stale]), stale_after=60))
+
+    assert claimed is stale
+    assert (claimed.status, claimed.attempts) == (schemas.JobStatus.RUNNING, 2)
+
+
+def test_exhausted_job_is_failed_and_the_next_one_claimed():
+    exhausted = job(status=schemas.JobStatus.RUNNING, attempts=3)
+    queued = job()
+    session = RecordingSession([exhausted], [queued])
+
+    claimed = asyncio.run(service.claim_job(session, stale_after=60))
+
+    assert exhausted.status == schemas.JobStatus.FAILED
+    assert claimed is queued
+    assert session.commits == 2
+
+
+def test_empty_queue():
+    session = RecordingSession()
+
+    assert asyncio.run(service.claim_job(session, stale_after=60)) is None
+    assert session.commits == 1
+
+
+def test_save_progress_delays_retry_and_refunds_attempt():
+    session = RecordingSession()
+
+    asyncio.run(
+        service.save_job_progress(
+            session,
+            1,
+            service.JobProgress(),
+            status=schemas.JobStatus.QUEUED,
+            retry_after=30,
+            count_attempt=False,
+        )
+    )
+
+    sql = compile(session.statements[0])
+    assert "run_after=(now() + " in sql
+    assert "attempts=(jobs.attempts - " in sql
+
+
+@pytest.fixture
+def worker(settings_env):
+    from src.jobs import worker
+
+    return worker
+
+
+def make_workers(worker, monkeypatch, handler):
+    workers = worker.JobWorkers(
+        None,
+        size=1,
+        poll_interval=0,
+        heartbeat_interval=0.01,
+        stale_after=60,
+        retry_backoff=10,
+    )
+    saves = []
+
+    async def fake_save(id, progress, status=None, *, retry_after=None, count_attempt=True):
+        saves.append((status, retry_after, count_attempt))
+
+    monkeypatch.setattr(workers, "_save", fake_save)
+    monkeypatch.setitem(worker.HANDLERS, "test", handler)
+    return workers, saves
+
+
+def running_job(attempts):
+    return SimpleNamespace(id=1, kind="test", params={}, attempts=attempts, max_attempts=3)
+
+
+async def broken(context, params):
+    raise RuntimeError("broken")
+
+
+def test_failed_job_is_retried_with_backoff(worker, monkeypatch):
+    workers, saves = make_workers(worker, monkeypatch, broken)
+
+    asyncio.run(workers._run_job(running_job(attempts=2)))
+
+    assert saves[-1] == (schemas.JobStatus.QUEUED, 20, True)
+
+
+def test_last_attempt_fails_the_job(worker, monkeypatch):
+    workers, saves = make_workers(worker, monkeypatch, broken)
+
+    asyncio.run(workers._run_job(running_job(attempts=3)))
+
+    assert saves[-1] == (schemas.JobStatus.FAILED, None, True)
+
+
+def test_heartbeat_saves_progress_while_running(worker, monkeypatch):
+    async def slow(context, params):
+        await asyncio.sleep(0.05)
+
+    workers, saves = make_workers(worker, monkeypatch, slow)
+
+    asyncio.run(workers._run_job(running_job(attempts=1)))
+
+    assert (None, None, True) in saves
+    assert saves[-1] == (schemas.JobStatus.SUCCEEDED, None, True)
+
+
+def test_stop_requeues_job_without_counting_the_attempt(worker, monkeypatch):
+    started = asyncio.Event()
+
+    async def endless(context, params):
+        started.set()
+        await asyncio.Event().wait()
+
+    workers, saves = make_workers(worker, monkeypatch, endless)
+    jobs = [running_job(attempts=1)]
+
+    async def fake_claim(async_session, *, stale_after):
+        return jobs.pop() if jobs else None
+
+    monkeypatch.setattr(worker.service, "claim_job", fake_claim)
+    monkeypatch.setattr(worker.database, "AsyncSession", contextlib.nullcontext)
+
+    async def scenario():
+        workers.start()
+        await started.wait()
+        await workers.stop()
+
+    asyncio.run(scenario())
+
+    assert saves[-1] == (schemas.JobStatus.QUEUED, None, False)
@@ -0,0 +1,98 @@
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+
+from fakes import FakeEngine, RecordingSession, card
+
+from src.catalogs import crawler, service
+from src.jobs.service import JobProgress
+from src.products import service as product_service
+
+
+def stored(code, price, content_hash="hash"):
+    return SimpleNamespace(code=code, id=code * 10, price=price, content_hash=content_hash)
+
+
+def test_upsert_product_cards_returns_products_that_need_a_page():
+    session = RecordingSession(
+        [
+            stored(1, Decimal("100")),
+            stored(2, Decimal("90")),
+            stored(3, Decimal("100"), content_hash=None),
+        ]
+    )
+    cards = [card(1), card(2), card(3), card(4), card(5, price=None)]
+
+    stale_codes = asyncio.run(
+        product_service.upsert_product_cards(session, cards, catalog_id=7, commit=False)
+    )
+
+    # 1 не изменился; 2 подешевел; 3 еще не загружался целиком; 4 и 5 новые.
+    assert stale_codes == [2, 3, 4, 5]
+    assert session.commits == 0
+    # Выборка, вставка 4 (у 5 нет цены), обновление цены 2, last_seen_at у 1 и 3.
+    assert len(session.statements) == 4
+    price_updates = session.parameters[2]
+    assert price_updates == [{"card_code": 2, "card_price": Decimal("100")}]
+
+
+def patch_listing_storage(monkeypatch, stale_codes):
+    saved = []
+
+    async def fake_upsert_catalogs(*, async_session, parsed_breadcrumb_catalogs, commit):
+        return {10: 1}
+
+    async def fake_upsert_cards(async_session, cards, *, catalog_id, commit):
+        saved.extend(card.code for card in cards)
+        return [card.code for card in cards if card.code in stale_codes]
+
+    async def fake_upsert_products(*, async_session, parsed_catalog_products):
+        pass
+
+    monkeypatch.setattr(service, "upsert_parsed_breadcrumb_catalogs", fake_upsert_catalogs)
+    monkeypatch.setattr(product_service, "upsert_product_cards", fake_upsert_cards)
+    monkeypatch.setattr(service, "upsert_parsed_catalog_products", fake_upsert_products)
+    return saved
+
+
+def test_listing_visits_only_stale_products(monkeypatch):
+    saved = patch_listing_storage(monkeypatch, stale_codes={2, 4})
+    engine = FakeEngine({10: [[1, 2, 3, 4]]}, broken_codes={4})
+    errors = []
+
+    saved_count = asyncio.run(
+        service.upsert_catalog_listing(
+            engine=engine,
+            async_session=RecordingSession(),
+            parsed_catalog_page=asyncio.run(engine.parse_catalog_page(10, 1, None)),
+            on_error=lambda code, exception: errors.append(code),
+        )
+    )
+
+    assert saved == [1, 2, 3, 4]
+    assert sorted(engine.product_requests) == [2, 4]
+    assert errors == [4]
+    assert saved_count == 3
+
+
+def test_crawl_in_listing_mode(monkeypatch):
+    saved = patch_listing_storage(monkeypatch, stale_codes={3})
+    engine = FakeEngine({10: [[1, 2], [2, 3], [3]]})
+    progress = JobProgress()
+
+    asyncio.run(
+        crawler.crawl_catalog(
+            engine=engine,
+            async_session=RecordingSession(),
+            code=10,
+            max_depth=0,
+            max_pages=10,
+            concurrency=1,
+            progress=progress,
+            mode="listing",
+        )
+    )
+
+    assert saved == [1, 2, 3]
+    assert engine.product_requests == [3]
+    assert (progress.total, progress.succeeded, progress.failed) == (3, 3, 0)
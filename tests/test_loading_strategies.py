@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session, selectinload
+
+from src.catalogs import models as catalog_models
+from src.products import models as product_models
+
+TABLES = [
+    catalog_models.Catalog.__table__,
+    product_models.Product.__table__,
+    product_models.ProductImage.__table__,
+]
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    catalog_models.Catalog.metadata.create_all(engine, tables=TABLES)
+    with Session(engine) as session:
+        root = catalog_models.Catalog(id=1, code=10, name="Книги")
+        child = catalog_models.Catalog(id=2, code=20, name="Детективы", parent_id=1)
+        session.add_all([root, child])
+        session.flush()
+        session.add(
+            product_models.Product(code=100, name="Книга", price=1, catalog_id=2)
+        )
+        session.commit()
+        session.expunge_all()
+        yield session
+
+
+def test_catalog_relationships_are_not_loaded_implicitly(session):
+    catalog = session.scalars(
+        select(catalog_models.Catalog).where(catalog_models.Catalog.id == 1)
+    ).one()
+
+    assert catalog.name == "Книги"
+    for relationship in ("parent", "children", "products"):
+        with pytest.raises(InvalidRequestError):
+            getattr(catalog, relationship)
+
+
+def test_explicit_loading_loads_only_requested_level(session):
+    catalog = session.scalars(
+        select(catalog_models.Catalog)
+        .options(selectinload(catalog_models.Catalog.children))
+        .where(catalog_models.Catalog.id == 1)
+    ).one()
+
+    [child] = catalog.children
+    assert child.code == 20
+    with pytest.raises(InvalidRequestError):
+        child.products
@@ -0,0 +1,133 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+
+from src.drivers.pool import DriverPool
+from src.metrics import router
+from src.metrics import service as metrics
+from src.parsing.engines import FallbackEngine, HttpEngine
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def serve_fixtures(request: httpx.Request) -> httpx.Response:
+    if "prod" in request.url.params:
+        return httpx.Response(
+            200, text=(FIXTURES / "product.html").read_text(encoding="utf-8")
+        )
+    return httpx.Response(404)
+
+
+def test_http_engine_records_stages_and_pages():
+    stages = ("fetch", "extract", "breadcrumb")
+    before = {
+        stage: sample("flip_stage_duration_seconds_count", stage=stage, engine="http")
+        for stage in stages
+    }
+    pages = sample("flip_pages_total", kind="product", engine="http")
+    errors = sample("flip_errors_total", kind="catalog", engine="http")
+    retries = sample("flip_retries_total", reason="fallback")
+
+    class StaticEngine:
+        async def parse_catalog_page(self, code, page, limit):
+            return None
+
+    async def scenario():
+        transport = httpx.MockTransport(serve_fixtures)
+        async with httpx.AsyncClient(transport=transport) as client:
+            engine = HttpEngine(client)
+            await engine.parse_product(1234567)
+            await FallbackEngine(engine, StaticEngine()).parse_catalog_page(1, 1, 10)
+
+    asyncio.run(scenario())
+
+    for stage in stages:
+        assert (
+            sample("flip_stage_duration_seconds_count", stage=stage, engine="http")
+            == before[stage] + (2 if stage == "fetch" else 1)
+        )
+    assert sample("flip_pages_total", kind="product", engine="http") == pages + 1
+    assert sample("flip_errors_total", kind="catalog", engine="http") == errors + 1
+    assert sample("flip_retries_total", reason="fallback") == retries + 1
+
+
+def test_middleware_counts_queries_per_route():
+    engine = create_engine("sqlite://")
+    metrics.instrument_engine(engine)
+    metrics.instrument_engine(engine)
+
+    app = FastAPI()
+    app.add_middleware(metrics.MetricsMiddleware)
+    app.include_router(router.instance)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        with engine.connect() as connection:
+            for _ in range(3):
+                connection.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    client = TestClient(app)
+    assert client.get("/items/1").status_code == 200
+
+    route = "/items/{item_id}"
+    assert sample("flip_db_queries_per_request_count", route=route) == 1
+    assert sample("flip_db_queries_per_request_sum", route=route) == 3
+    assert sample("flip_db_query_seconds_per_request_sum", route=route) > 0
+    assert (
+        sample(
+            "flip_http_request_duration_seconds_count",
+            method="GET",
+            route=route,
+            status="200",
+        )
+        == 1
+    )
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert 'flip_db_queries_per_request_sum{route="/items/{item_id}"} 3.0' in (
+        response.text
+    )
+
+
+def test_driver_pool_is_exposed_while_registered():
+    pool = DriverPool(
+        lambda: None, size=3, max_pages=10, lease_timeout=1, health_check_interval=1
+    )
+
+    with metrics.registered_driver_pool(pool):
+        assert sample("flip_driver_pool_size") == 3
+        assert sample("flip_driver_pool_in_use") == 0
+        assert sample("flip_driver_pool_leases_total") == 0
+
+    assert REGISTRY.get_sample_value("flip_driver_pool_size") is None
+
+
+def test_failed_query_leaves_no_timing_on_the_connection(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    metrics.instrument_engine(engine)
+    now = iter([0.0, 10.0, 10.5])
+    monkeypatch.setattr(metrics.time, "perf_counter", lambda: next(now))
+    before = sample("flip_db_query_duration_seconds_sum", operation="PRAGMA")
+
+    with engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM missing"))
+    with engine.connect() as connection:
+        connection.execute(text("PRAGMA user_version"))
+        assert "query_started_at" not in connection.info
+
+    assert sample("flip_db_query_duration_seconds_sum", operation="PRAGMA") == before + 0.5
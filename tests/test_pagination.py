@@ -0,0 +1,87 @@
+import base64
+import json
+from decimal import Decimal
+
+import pytest
+from fakes import RecordingSession
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src import pagination
+from src.exceptions import AppBaseException, BadRequestError
+from src.products import models, service
+
+
+def encode_json(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def compile(statement):
+    return str(
+        statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+def test_cursor_round_trip():
+    cursor = pagination.encode_cursor("-price", [Decimal("10.50"), 7])
+
+    assert pagination.decode_cursor(cursor, "-price") == ["10.50", 7]
+    with pytest.raises(BadRequestError):
+        pagination.decode_cursor(cursor, "price")
+    with pytest.raises(BadRequestError):
+        pagination.decode_cursor("not a cursor", "price")
+    with pytest.raises(BadRequestError):
+        pagination.decode_cursor(encode_json(["id", 5]), "id")
+
+
+def test_paginate_continues_after_cursor():
+    columns, descending = pagination.order_columns(
+        service.ORDER_COLUMNS, models.Product.id, "-price"
+    )
+    cursor = pagination.encode_cursor("-price", [Decimal("10.50"), 7])
+    statement = pagination.paginate(
+        select(models.Product),
+        columns,
+        descending=descending,
+        order_by="-price",
+        cursor=cursor,
+        limit=20,
+    )
+
+    sql = compile(statement)
+    assert "(products.price, products.id) < (10.50, 7)" in sql
+    assert "ORDER BY products.price DESC, products.id DESC" in sql
+    assert "OFFSET" not in sql
+
+
+def test_next_cursor_only_for_full_page():
+    columns = [models.Product.id]
+    products = [models.Product(id=1), models.Product(id=2)]
+
+    assert pagination.next_cursor(products, columns, order_by="id", limit=3) is None
+    assert pagination.next_cursor([], columns, order_by="id", limit=0) is None
+    cursor = pagination.next_cursor(products, columns, order_by="id", limit=2)
+    assert pagination.decode_cursor(cursor, "id") == [2]
+
+
+def test_products_endpoint_rejects_bad_cursor_and_limit(settings_env):
+    from src.dependencies import get_async_session
+    from src.products import router
+
+    app = FastAPI()
+    app.include_router(router.instance)
+    app.dependency_overrides[get_async_session] = lambda: RecordingSession()
+
+    @app.exception_handler(AppBaseException)
+    async def app_exception_handler(request, exception):
+        return JSONResponse(status_code=exception.status_code, content={"detail": exception.detail})
+
+    client = TestClient(app)
+    assert client.get("/products/", params={"cursor": encode_json(["id", 5])}).status_code == 400
+    assert client.get("/products/", params={"limit": 0}).status_code == 422
+    assert client.get("/products/", params={"limit": -1}).status_code == 422
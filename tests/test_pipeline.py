@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+from fakes import FakeEngine
+
+from src.catalogs import pipeline, service
+from src.catalogs.exceptions import CatalogParserError
+from src.products.exceptions import ProductParserError
+
+
+def record_batches(monkeypatch):
+    saved = []
+
+    async def fake_upsert(*, async_session, parsed_catalog_products):
+        saved.append([product.code for product in parsed_catalog_products.products])
+
+    monkeypatch.setattr(service, "upsert_parsed_catalog_products", fake_upsert)
+    return saved
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+def test_batches_are_saved_as_results_arrive(monkeypatch):
+    saved = record_batches(monkeypatch)
+
+    counts = asyncio.run(
+        collect(
+            pipeline.stream_products(
+                engine=FakeEngine(delay=0.01),
+                async_session=None,
+                codes=pipeline.iterate(list(range(1, 8))),
+                concurrency=3,
+                batch_size=3,
+            )
+        )
+    )
+
+    assert counts == [3, 3, 1]
+    assert saved == [[1, 2, 3], [4, 5, 6], [7]]
+
+
+def test_products_keep_the_order_of_codes():
+    async def scenario():
+        products = pipeline.parse_products(
+            FakeEngine(delay=0.01), pipeline.iterate(list(range(1, 31))), concurrency=4
+        )
+        return [parsed_product.product.code async for parsed_product in products]
+
+    assert asyncio.run(scenario()) == list(range(1, 31))
+
+
+def test_failure_keeps_saved_batches(monkeypatch):
+    saved = record_batches(monkeypatch)
+
+    async def scenario():
+        stream = pipeline.stream_products(
+            engine=FakeEngine(broken_codes={9}, delay=0.01),
+            async_session=None,
+            codes=pipeline.iterate(list(range(1, 11))),
+            concurrency=3,
+            batch_size=4,
+        )
+        with pytest.raises(ProductParserError):
+            await collect(stream)
+        # Загрузчики остановлены, а не брошены в фоне.
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(scenario()) == []
+    assert saved == [[1, 2, 3, 4], [5, 6, 7, 8]]
+
+
+def test_errors_are_reported_and_skipped(monkeypatch):
+    saved = record_batches(monkeypatch)
+    errors = []
+
+    counts = asyncio.run(
+        collect(
+            pipeline.stream_products(
+                engine=FakeEngine(broken_codes={2}),
+                async_session=None,
+                codes=pipeline.iterate([1, 2, 3]),
+                on_error=lambda code, exception: errors.append(code),
+            )
+        )
+    )
+
+    assert counts == [2]
+    assert errors == [2]
+    assert saved == [[1, 3]]
+
+
+def test_discovery_waits_for_slow_consumer():
+    engine = FakeEngine()
+    discovered = []
+
+    async def codes():
+        for code in range(1, 101):
+            discovered.append(code)
+            yield code
+
+    async def scenario():
+        products = pipeline.parse_products(engine, codes(), concurrency=2, queue_size=2)
+        first = await anext(products)
+        for _ in range(10):
+            await asyncio.sleep(0)
+        in_flight = len(discovered)
+        await products.aclose()
+        return first, in_flight
+
+    first, in_flight = asyncio.run(scenario())
+
+    assert first.product.code == 1
+    # Две очереди по два места и по коду в руках у каждого из двух загрузчиков.
+    assert in_flight <= 8
+    assert len(engine.product_requests) < 100
+
+
+def test_discovery_error_stops_pipeline():
+    async def codes():
+        yield 1
+        raise CatalogParserError("Could not find product grid")
+
+    with pytest.raises(CatalogParserError):
+        asyncio.run(collect(pipeline.parse_products(FakeEngine(), codes())))
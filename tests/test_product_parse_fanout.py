@@ -0,0 +1,33 @@
+import asyncio
+
+from fakes import FakeEngine
+
+from src.products import service
+
+
+def codes(parsed_products):
+    return [parsed_product.product.code for parsed_product in parsed_products]
+
+
+def test_parse_products_by_codes_keeps_order_and_limits_concurrency():
+    engine = FakeEngine(delay=0.01)
+    parsed = asyncio.run(
+        service.parse_products_by_codes(
+            engine=engine, async_session=None, codes=list(range(20)), concurrency=3
+        )
+    )
+
+    assert codes(parsed) == list(range(20))
+    assert 1 < engine.max_running <= 3
+
+
+def test_parse_products_by_codes_is_sequential_by_default():
+    engine = FakeEngine(delay=0.01)
+    parsed = asyncio.run(
+        service.parse_products_by_codes(
+            engine=engine, async_session=None, codes=[3, 1, 2]
+        )
+    )
+
+    assert codes(parsed) == [3, 1, 2]
+    assert engine.max_running == 1
@@ -0,0 +1,115 @@
+import asyncio
+
+from fakes import RecordingSession
+from sqlalchemy.dialects import postgresql
+
+from src.cache.service import PENDING_INVALIDATIONS
+from src.products import service
+from src.products.schemas import ProductCreate, ProductImageCreate
+
+
+def product(code, name=None, images=0):
+    return ProductCreate(
+        code=code,
+        name=name or str(code),
+        price=1,
+        catalog_id=1,
+        images=[
+            ProductImageCreate(url=f"https://example.com/{code}/{number}.jpg", description="")
+            for number in range(images)
+        ],
+    )
+
+
+def compiled(statement):
+    return statement.compile(dialect=postgresql.dialect())
+
+
+def inserted_ids(statement):
+    """Все продукты новые: ``RETURNING`` отдает id = code * 10."""
+    if statement.is_insert and statement.table.name == "products":
+        params = compiled(statement).params
+        codes = [value for key, value in params.items() if key.startswith("code_m")]
+        return [(code, code * 10) for code in codes]
+    return []
+
+
+def statements_for(session, table, kind):
+    return [
+        statement
+        for statement in session.statements
+        if getattr(statement, f"is_{kind}") and statement.table.name == table
+    ]
+
+
+def test_rows_are_deduplicated_and_sorted_by_code():
+    session = RecordingSession(respond=inserted_ids)
+    products = [product(3, "old"), product(1), product(3, "new"), product(2)]
+
+    product_ids = asyncio.run(service.upsert_products_by_code(session, products))
+
+    assert product_ids == {1: 10, 2: 20, 3: 30}
+    [statement] = statements_for(session, "products", "insert")
+    params = compiled(statement).params
+    assert [params[f"code_m{row}"] for row in range(3)] == [1, 2, 3]
+    assert params["name_m2"] == "new"
+    sql = str(compiled(statement))
+    assert "ON CONFLICT (code) DO UPDATE" in sql
+    assert "products.content_hash IS DISTINCT FROM excluded.content_hash" in sql
+    assert sql.endswith("RETURNING products.code, products.id")
+    assert session.commits == 1
+
+
+def test_statements_stay_under_the_bind_parameter_limit(monkeypatch):
+    monkeypatch.setattr(service, "MAX_BIND_PARAMETERS", 14)
+    session = RecordingSession(respond=inserted_ids)
+
+    product_ids = asyncio.run(
+        service.upsert_products_by_code(
+            session, [product(code, images=2) for code in range(5, 0, -1)]
+        )
+    )
+
+    assert sorted(product_ids) == [1, 2, 3, 4, 5]
+    product_inserts = statements_for(session, "products", "insert")
+    image_inserts = statements_for(session, "product_images", "insert")
+    # Шесть колонок продукта: по две строки на запрос.
+    assert len(product_inserts) == 3
+    assert len(image_inserts) > 1
+    for statement in session.statements:
+        assert len(compiled(statement).params) <= 14
+    codes = [
+        value
+        for statement in product_inserts
+        for key, value in compiled(statement).params.items()
+        if key.startswith("code_m")
+    ]
+    assert codes == [1, 2, 3, 4, 5]
+
+
+def test_chunked():
+    assert list(service.chunked([1, 2, 3, 4, 5], service.MAX_BIND_PARAMETERS // 2)) == [
+        [1, 2],
+        [3, 4],
+        [5],
+    ]
+
+
+def test_cache_keys_wait_for_the_callers_commit():
+    session = RecordingSession(respond=inserted_ids)
+
+    asyncio.run(service.upsert_products_by_code(session, [product(1)], commit=False))
+
+    assert session.commits == 0
+    assert session.info[PENDING_INVALIDATIONS] == {"product:10"}
+
+
+def test_unchanged_batch_flushes_earlier_invalidations():
+    # RETURNING пуст: все продукты не изменились.
+    session = RecordingSession()
+    session.info[PENDING_INVALIDATIONS] = {"product:99"}
+
+    asyncio.run(service.upsert_products_by_code(session, [product(1)]))
+
+    assert session.commits == 1
+    assert PENDING_INVALIDATIONS not in session.info
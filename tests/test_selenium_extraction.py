@@ -0,0 +1,148 @@
+from decimal import Decimal
+
+import pytest
+
+from src.catalogs.exceptions import CatalogParserError
+from src.parsing import selenium
+from src.products.exceptions import ProductParserError
+
+PRODUCT_URL = "https://www.flip.kz/catalog?prod=1234567"
+CATALOG_URL = "https://www.flip.kz/catalog?subsection=2649&page=1"
+BREADCRUMBS = [
+    ["https://www.flip.kz/catalog?subsection=1", "Книги"],
+    ["https://www.flip.kz/catalog?subsection=44", "Художественная литература"],
+    ["https://www.flip.kz/catalog?subsection=2649", "Фэнтези"],
+]
+
+
+class FakeElement:
+    def is_displayed(self):
+        return True
+
+
+class FakeDriver:
+    """Записывает запросы к браузеру; скрипт возвращает заранее заданный ответ."""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.commands = []
+
+    def get(self, url):
+        self.commands.append("get")
+
+    def find_element(self, by, value):
+        self.commands.append("find_element")
+        return FakeElement()
+
+    def execute_script(self, script, *arguments):
+        self.commands.append("execute_script")
+        return self.payload
+
+
+def product_payload(**changes):
+    payload = {
+        "breadcrumbs": BREADCRUMBS,
+        "name": "Гарри Поттер и философский камень",
+        "description": "Первая книга серии о юном волшебнике.",
+        "price": "12 345 ₸",
+        "images": [
+            ["https://s.f.kz/prod/1234/1234567_550.jpg", "обложка"],
+            ["https://www.flip.kz/prod/1234/1234567_2_550.jpg", ""],
+        ],
+    }
+    payload.update(changes)
+    return payload
+
+
+def test_extract_product_in_one_script_call():
+    driver = FakeDriver(product_payload())
+
+    parsed = selenium.extract_product(driver, PRODUCT_URL, 1234567)
+
+    assert driver.commands == ["get", "find_element", "execute_script"]
+    product = parsed.product
+    assert product.code == 1234567
+    assert product.name == "Гарри Поттер и философский камень"
+    assert product.price == Decimal("12345")
+    assert [image.description for image in product.images] == ["обложка", ""]
+    breadcrumbs = parsed.parsed_breadcrumb_catalogs
+    assert breadcrumbs.catalog_parent_map == {1: None, 44: 1, 2649: 44}
+    assert breadcrumbs.catalog_map[2649].name == "Фэнтези"
+
+
+def test_extract_product_empty_description():
+    parsed = selenium.extract_product(
+        FakeDriver(product_payload(description="")), PRODUCT_URL, 1234567
+    )
+
+    assert parsed.product.description is None
+
+
+@pytest.mark.parametrize(
+    "changes", [{"images": None}, {"name": None}, {"breadcrumbs": None}]
+)
+def test_extract_product_missing_data(changes):
+    with pytest.raises(ProductParserError):
+        selenium.extract_product(
+            FakeDriver(product_payload(**changes)), PRODUCT_URL, 1234567
+        )
+
+
+def test_extract_catalog_page_in_one_script_call():
+    driver = FakeDriver(
+        {
+            "breadcrumbs": BREADCRUMBS,
+            "products": [
+                [
+                    "https://www.flip.kz/catalog?prod=1234567",
+                    "Гарри Поттер и философский камень",
+                    "12 345 ₸",
+                    "https://www.flip.kz/prod/1234/1234567_150.jpg",
+                ],
+                ["https://www.flip.kz/catalog?prod=2345678", "", None, None],
+                ["https://www.flip.kz/catalog?prod=3456789", "Ведьмак", "7 500 ₸", None],
+            ],
+            "subsections": [
+                "https://www.flip.kz/catalog?subsection=2650",
+                "https://www.flip.kz/catalog?subsection=2649",
+                "https://www.flip.kz/catalog?subsection=2651",
+            ],
+        }
+    )
+
+    parsed = selenium.extract_catalog_page(driver, CATALOG_URL, 2)
+
+    assert driver.commands == ["get", "find_element", "execute_script"]
+    assert parsed.product_codes == [1234567, 2345678]
+    assert parsed.product_cards[0].price == Decimal("12345")
+    assert parsed.product_cards[0].thumbnail_url.endswith("1234567_150.jpg")
+    assert parsed.product_cards[1] == (2345678, None, None, None)
+    assert parsed.parsed_breadcrumb_catalogs.last_catalog_code == 2649
+    assert parsed.subsection_codes == [2650, 2651]
+
+
+def test_extract_catalog_page_card_without_link():
+    driver = FakeDriver({"breadcrumbs": BREADCRUMBS, "products": [None], "subsections": []})
+
+    with pytest.raises(CatalogParserError):
+        selenium.extract_catalog_page(driver, CATALOG_URL, None)
+
+
+def test_scrape_catalog_page_card_without_product_code():
+    class Link(FakeElement):
+        def get_attribute(self, name):
+            return "https://www.flip.kz/catalog?subsection=2650"
+
+    class Card(FakeElement):
+        def find_element(self, by, value):
+            return Link()
+
+    class Grid(FakeElement):
+        def find_elements(self, by, value):
+            return [Card()]
+
+    driver = FakeDriver([])
+    driver.find_element = lambda by, value: Grid()
+
+    with pytest.raises(CatalogParserError):
+        selenium.scrape_catalog_page(driver, CATALOG_URL, None)
@@ -0,0 +1,90 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.parsing.engines import HttpEngine, SnapshotEngine
+from src.products.exceptions import ProductParserError
+from src.snapshots.service import DirectoryBackend, InMemoryBackend, SnapshotStore
+
+pytest.importorskip("zstandard")
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PRODUCT_URL = "https://www.flip.kz/catalog?prod=1234567"
+FETCHED_AT = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+def read_fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+@pytest.fixture(params=["memory", "directory"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return SnapshotStore(InMemoryBackend())
+    return SnapshotStore(DirectoryBackend(tmp_path))
+
+
+def test_identical_pages_are_stored_once(store):
+    page = read_fixture("product.html")
+
+    async def scenario():
+        await store.put(PRODUCT_URL, page, fetched_at=FETCHED_AT)
+        await store.put(
+            PRODUCT_URL, page, fetched_at=FETCHED_AT + timedelta(hours=1)
+        )
+        return (
+            await store.history(PRODUCT_URL),
+            await store.backend.keys("objects/"),
+        )
+
+    history, object_keys = asyncio.run(scenario())
+
+    assert [snapshot.fetched_at for snapshot in history] == [
+        FETCHED_AT,
+        FETCHED_AT + timedelta(hours=1),
+    ]
+    assert len({snapshot.content_hash for snapshot in history}) == 1
+    assert len(object_keys) == 1
+
+
+def test_latest_snapshot_is_returned_and_decompressed(store):
+    async def scenario():
+        await store.put(PRODUCT_URL, "<html>old</html>", fetched_at=FETCHED_AT)
+        await store.put(
+            PRODUCT_URL,
+            "<html>new</html>",
+            fetched_at=FETCHED_AT + timedelta(minutes=1),
+        )
+        await store.put("https://www.flip.kz/catalog?prod=1", "<html>other</html>")
+        latest = await store.latest(PRODUCT_URL)
+        return (
+            await store.read(latest),
+            await store.latest("https://www.flip.kz/catalog?prod=2"),
+            sorted([snapshot.url async for snapshot in store.iter_latest()]),
+        )
+
+    html, missing, urls = asyncio.run(scenario())
+
+    assert html == "<html>new</html>"
+    assert missing is None
+    assert urls == ["https://www.flip.kz/catalog?prod=1", PRODUCT_URL]
+
+
+def test_snapshot_engine_reparses_fetched_pages_offline(store):
+    def serve(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, text=read_fixture("product.html"))
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(serve)) as client:
+            fetched = await HttpEngine(client, snapshots=store).parse_product(1234567)
+        reparsed = await SnapshotEngine(store).parse_product(1234567)
+        with pytest.raises(ProductParserError):
+            await SnapshotEngine(store).parse_product(7654321)
+        return fetched, reparsed
+
+    fetched, reparsed = asyncio.run(scenario())
+
+    assert reparsed == fetched
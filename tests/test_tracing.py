@@ -0,0 +1,122 @@
+import json
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from src import tracing
+from src.drivers.async_driver import AsyncDriver
+from src.parsing.engines import HttpEngine
+
+pytest.importorskip("opentelemetry.sdk")
+pytest.importorskip("opentelemetry.instrumentation.fastapi")
+pytest.importorskip("opentelemetry.instrumentation.sqlalchemy")
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class StubDriver:
+    def quit(self):
+        pass
+
+
+def serve_product(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200, text=(FIXTURES / "product.html").read_text(encoding="utf-8")
+    )
+
+
+def test_span_is_noop_without_configuration():
+    with tracing.span("stage fetch", engine="http") as span:
+        assert span is None
+
+
+def test_request_trace_covers_pages_stages_sql_and_driver_calls(tmp_path):
+    app = FastAPI()
+    engine = create_engine("sqlite://")
+
+    def scrape(driver):
+        with tracing.span("driver call"):
+            return driver
+
+    @app.post("/parse")
+    async def parse():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(serve_product)
+        ) as client:
+            parsed = await HttpEngine(client).parse_product(1234567)
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        driver = await AsyncDriver.start(StubDriver)
+        try:
+            await driver.run(scrape)
+        finally:
+            await driver.quit()
+        return {"name": parsed.product.name}
+
+    traces = tmp_path / "traces.jsonl"
+    tracing.configure(
+        app, engine, exporter="file", service_name="test", file_path=str(traces)
+    )
+    try:
+        assert TestClient(app).post("/parse").status_code == 200
+    finally:
+        tracing.shutdown()
+
+    spans = {
+        span["name"]: span
+        for span in map(json.loads, traces.read_text().splitlines())
+    }
+
+    def parent_name(name: str) -> str:
+        parent_id = spans[name]["parent_id"]
+        return next(
+            other
+            for other, span in spans.items()
+            if span["context"]["span_id"] == parent_id
+        )
+
+    assert parent_name("page product") == "POST /parse"
+    assert spans["page product"]["attributes"]["engine"] == "http"
+    for stage in ("stage fetch", "stage extract", "stage breadcrumb"):
+        assert parent_name(stage) == "page product"
+    assert parent_name("SELECT") == "POST /parse"
+    assert parent_name("driver call") == "POST /parse"
+
+
+def test_tracing_follows_each_lifespan(tmp_path):
+    traces = tmp_path / "traces.jsonl"
+    engine = create_engine("sqlite://")
+    files = []
+
+    @asynccontextmanager
+    async def lifespan(app):
+        tracing.configure(
+            app, engine, exporter="file", service_name="test", file_path=str(traces)
+        )
+        files.append(tracing._file)
+        try:
+            yield
+        finally:
+            tracing.shutdown()
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.get("/ping")
+    async def ping():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return {}
+
+    for _ in range(2):
+        with TestClient(app) as client:
+            assert client.get("/ping").status_code == 200
+
+    names = [json.loads(line)["name"] for line in traces.read_text().splitlines()]
+    assert names.count("GET /ping") == 2
+    assert names.count("SELECT") == 2
+    assert all(file.closed for file in files)